@@ -85,7 +85,7 @@ def login_screen():
                 email = st.text_input("E-mail", key="log_email")
                 password = st.text_input("Senha", type="password", key="log_pass")
                 if st.button("Acessar", type="primary", use_container_width=True):
-                    token_recebido = None
+                    sessao = None
                     erro_msg = None
                     try:
                         res = requests.post(
@@ -93,14 +93,14 @@ def login_screen():
                             json={"email": email, "password": password},
                         )
                         if res.status_code == 200:
-                            token_recebido = res.json()["access_token"]
+                            sessao = res.json()
                         else:
                             erro_msg = "E-mail ou senha incorretos."
                     except:
                         erro_msg = f"Erro de conexão com {API_URL}"
 
-                    if token_recebido:
-                        st.session_state["token"] = token_recebido
+                    if sessao:
+                        save_session(sessao)
                         st.rerun()
                     elif erro_msg:
                         st.error(erro_msg)
@@ -147,12 +147,59 @@ def delete_task_callback(task_id, auth_headers):
         st.toast(f"Erro de conexão: {e}")
 
 
+def save_session(data):
+    st.session_state["token"] = data["access_token"]
+    st.session_state["refresh_token"] = data.get("refresh_token")
+    st.session_state["token_expires_at"] = time.time() + data.get("expires_in", 1800)
+
+
+def clear_session():
+    st.session_state["token"] = None
+    st.session_state.pop("refresh_token", None)
+    st.session_state.pop("token_expires_at", None)
+    st.session_state.pop("tasks_cache", None)
+
+
+def refresh_session_if_needed():
+    # Renova o access token pelo refresh token um pouco antes de ele expirar,
+    # sem pedir a senha de novo. Se a renovação for recusada, volta ao login.
+    refresh_token = st.session_state.get("refresh_token")
+    expires_at = st.session_state.get("token_expires_at", 0)
+    if not refresh_token or time.time() < expires_at - 60:
+        return
+    try:
+        res = requests.post(
+            f"{API_URL}/auth/refresh",
+            json={"refresh_token": refresh_token},
+            timeout=5,
+        )
+    except requests.RequestException:
+        return
+    if res.status_code == 200:
+        save_session(res.json())
+    elif res.status_code == 401:
+        clear_session()
+        st.rerun()
+
+
 def dashboard_screen():
+    refresh_session_if_needed()
+
     with st.sidebar:
         st.image("https://cdn-icons-png.flaticon.com/512/4296/4296463.png", width=50)
         st.markdown("### Menu")
         if st.button("Sair", use_container_width=True):
-            st.session_state["token"] = None
+            refresh_token = st.session_state.get("refresh_token")
+            try:
+                requests.post(
+                    f"{API_URL}/auth/logout",
+                    json={"refresh_token": refresh_token} if refresh_token else None,
+                    headers={"Authorization": f"Bearer {st.session_state['token']}"},
+                    timeout=5,
+                )
+            except requests.RequestException:
+                pass
+            clear_session()
             st.rerun()
 
     headers = {"Authorization": f"Bearer {st.session_state['token']}"}
@@ -166,9 +213,32 @@ def dashboard_screen():
 
     tasks = []
     try:
-        r = requests.get(f"{API_URL}/tasks", headers=headers)
-        if r.status_code == 200:
-            tasks = r.json()
+        # A API devolve uma página por vez; segue o cursor até o fim. Se a
+        # primeira página responder 304, a lista guardada continua válida.
+        params = {"limit": 500}
+        cached = st.session_state.get("tasks_cache")
+        conditional = {"If-None-Match": cached[0]} if cached else {}
+        etag = None
+        while True:
+            r = requests.get(
+                f"{API_URL}/tasks",
+                headers={**headers, **conditional},
+                params=params,
+            )
+            if r.status_code == 304:
+                tasks = list(cached[1])
+                break
+            if r.status_code != 200:
+                break
+            if "cursor" not in params and r.headers.get("ETag"):
+                etag = r.headers["ETag"]
+            tasks.extend(r.json())
+            conditional = {}
+            next_cursor = r.headers.get("X-Next-Cursor")
+            if not next_cursor:
+                st.session_state["tasks_cache"] = (etag, list(tasks))
+                break
+            params["cursor"] = next_cursor
     except:
         st.error("Backend offline.")
 
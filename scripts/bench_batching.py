@@ -0,0 +1,94 @@
+"""
+Teste de carga do micro-batching de predições.
+Simula várias requisições de /optimize-schedule em paralelo e compara a
+vazão com e sem o InferenceBatcher.
+Execute: python scripts/bench_batching.py --threads 32 --tasks 20
+"""
+import argparse
+import sys
+import threading
+import time
+import warnings
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir))
+
+from src.core import config
+from src.models.schemas import TaskCategory, TaskPublic
+from src.services import ia_service
+from src.services.model_registry import registry
+
+
+def _build_tasks(count: int) -> list:
+    now = datetime.now(timezone.utc)
+    categories = list(TaskCategory)
+    return [
+        TaskPublic(
+            title=f"Tarefa {index}",
+            due_date=now + timedelta(days=index % 30),
+            category=categories[index % len(categories)],
+            difficulty=index % 5 + 1,
+            estimated_minutes=15 + (index * 37) % 465,
+        )
+        for index in range(count)
+    ]
+
+
+def _run(threads: int, tasks: list, seconds: float) -> tuple:
+    stop = time.monotonic() + seconds
+    done = [0] * threads
+    latencies: list = []
+    lock = threading.Lock()
+
+    def worker(index: int) -> None:
+        local = []
+        while time.monotonic() < stop:
+            start = time.perf_counter()
+            ia_service.predict_priority_scores(tasks)
+            local.append(time.perf_counter() - start)
+            done[index] += 1
+        with lock:
+            latencies.extend(local)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0
+    return sum(done) / seconds, p99
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--tasks", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--compiled-max-batch", type=int, default=None)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    if args.compiled_max_batch is not None:
+        config.COMPILED_FOREST_MAX_BATCH = args.compiled_max_batch
+    registry.reload()
+    tasks = _build_tasks(args.tasks)
+
+    print(
+        f"{args.threads} threads, {args.tasks} tarefas por requisição, "
+        f"{args.seconds:.0f}s por cenário"
+    )
+    for enabled in (False, True):
+        config.INFERENCE_BATCHING = enabled
+        throughput, p99 = _run(args.threads, tasks, args.seconds)
+        label = "com batching" if enabled else "sem batching"
+        print(f"{label:>14}: {throughput:8.1f} req/s   p99 {p99:7.2f} ms")
+
+    metrics = ia_service.batcher.metrics()
+    print(
+        f"lotes: {metrics['batches']}, média de {metrics['avg_requests_per_batch']:.1f} "
+        f"requisições e {metrics['avg_batch_rows']:.0f} linhas por lote"
+    )
@@ -0,0 +1,69 @@
+"""
+Benchmark de latência da predição: sklearn, avaliador compilado e tabela.
+Execute: python scripts/bench_inference.py
+"""
+import sys
+import time
+import warnings
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir))
+
+import numpy as np
+import pandas as pd
+
+from src.services.compiled_forest import CompiledForest
+from src.services.model_registry import registry
+from src.services.priority_lookup import PriorityLookupTable
+
+BATCH_SIZES = [1, 10, 100, 1_000, 10_000]
+
+
+def _random_features(size: int, rng: np.random.Generator) -> np.ndarray:
+    return np.column_stack(
+        [
+            rng.integers(0, 31, size),
+            rng.integers(15, 481, size),
+            rng.integers(1, 6, size),
+            rng.integers(0, 7, size),
+        ]
+    ).astype(np.float64)
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return float(np.median(samples))
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    bundle = registry.reload()
+    model = bundle.model
+    forest = CompiledForest.from_sklearn(model)
+    lookup = PriorityLookupTable.build(
+        forest, forest.predict, n_features=model.n_features_in_
+    )
+    rng = np.random.default_rng(0)
+
+    print(f"Modelo: versão {bundle.version}, {forest.n_trees} árvores")
+    print(f"Tabela: {lookup.shape}, {lookup.table.nbytes / 1024:.0f} KiB")
+    print(
+        f"{'lote':>8} {'sklearn (ms)':>14} {'compilado (ms)':>16} "
+        f"{'tabela (ms)':>13}"
+    )
+    for size in BATCH_SIZES:
+        features = _random_features(size, rng)
+        frame = pd.DataFrame(features, columns=model.feature_names_in_)
+        repeat = 50 if size <= 1_000 else 10
+        sklearn_ms = _median_ms(lambda: model.predict(frame), repeat)
+        compiled_ms = _median_ms(lambda: forest.predict(features), repeat)
+        lookup_ms = _median_ms(lambda: lookup.predict(features), repeat)
+        print(
+            f"{size:>8} {sklearn_ms:>14.3f} {compiled_ms:>16.3f} "
+            f"{lookup_ms:>13.3f}"
+        )
@@ -0,0 +1,118 @@
+"""
+Teste de carga: latência do GET /tasks durante uma enxurrada de logins.
+Compara o bcrypt rodando no loop de eventos (como era) com o pool limitado
+do PasswordHasher, tudo num único loop, como um worker do uvicorn.
+Execute: python scripts/bench_login_storm.py --logins 16 --seconds 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir))
+
+DATABASE_DIR = tempfile.mkdtemp(prefix="kairos-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DATABASE_DIR}/bench.db")
+warnings.filterwarnings("ignore")
+
+import httpx
+
+from src.core import security
+from src.core.database import async_engine
+from src.main import app
+from src.services import auth_service
+
+PASSWORD = "senhaforte123"
+
+
+class _InlineHasher:
+    """O comportamento antigo: bcrypt direto no loop de eventos."""
+
+    async def hash(self, password: str) -> str:
+        return security.get_password_hash(password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return security.verify_password(plain_password, hashed_password)
+
+
+async def _setup(client: httpx.AsyncClient) -> dict:
+    await client.post(
+        "/auth/register", json={"email": "bench@kairos.dev", "password": PASSWORD}
+    )
+    token = (
+        await client.post(
+            "/auth/login", json={"email": "bench@kairos.dev", "password": PASSWORD}
+        )
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    tasks = [{"title": f"Tarefa {i}", "category": "Trabalho"} for i in range(50)]
+    await client.post("/tasks/bulk", json={"tasks": tasks}, headers=headers)
+    return headers
+
+
+async def _run(client: httpx.AsyncClient, headers: dict, logins: int, seconds: float):
+    stop = time.monotonic() + seconds
+    latencies, statuses = [], []
+
+    async def probe() -> None:
+        while time.monotonic() < stop:
+            started = time.perf_counter()
+            await client.get("/tasks", headers=headers)
+            latencies.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(0.005)
+
+    async def login() -> None:
+        while time.monotonic() < stop:
+            response = await client.post(
+                "/auth/login", json={"email": "bench@kairos.dev", "password": PASSWORD}
+            )
+            statuses.append(response.status_code)
+            if response.status_code == 503:
+                await asyncio.sleep(0.05)
+
+    await asyncio.gather(probe(), *(login() for _ in range(logins)))
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p99": latencies[int(len(latencies) * 0.99) - 1],
+        "logins": statuses.count(200) / seconds,
+        "rejected": statuses.count(503),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        headers = await _setup(client)
+        pooled = auth_service.password_hasher
+        print(
+            f"{'cenário':<22} {'/tasks p50':>10} {'/tasks p99':>10} "
+            f"{'logins/s':>9} {'503':>5}"
+        )
+        scenarios = [
+            ("sem logins", pooled, 0),
+            ("bcrypt no loop", _InlineHasher(), args.logins),
+            (f"pool ({pooled.max_workers} threads)", pooled, args.logins),
+        ]
+        for name, hasher, logins in scenarios:
+            auth_service.password_hasher = hasher
+            result = await _run(client, headers, logins, args.seconds)
+            print(
+                f"{name:<22} {result['p50']:>8.1f}ms {result['p99']:>8.1f}ms "
+                f"{result['logins']:>9.1f} {result['rejected']:>5}"
+            )
+        auth_service.password_hasher = pooled
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,77 @@
+"""
+Teste de carga do pool de conexões: várias threads disputando um pool
+pequeno, cada uma segurando a conexão como uma requisição faria. Mostra a
+vazão, as esperas e os timeouts conforme o pool satura.
+Execute: python scripts/bench_pool.py --pool-size 5 --max-overflow 5 --hold-ms 20
+"""
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir))
+
+from sqlalchemy import create_engine, exc, text
+
+from src.core.database import InstrumentedQueuePool, pool_metrics
+
+
+def _run(engine, threads: int, hold_ms: float, seconds: float) -> dict:
+    stop = time.monotonic() + seconds
+    peak = {"checked_out": 0, "overflow": 0}
+
+    def worker() -> None:
+        while time.monotonic() < stop:
+            try:
+                with engine.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+                    time.sleep(hold_ms / 1000)
+            except exc.TimeoutError:
+                pass
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    while any(thread.is_alive() for thread in pool):
+        metrics = pool_metrics(engine)
+        for key in peak:
+            peak[key] = max(peak[key], metrics[key])
+        time.sleep(0.01)
+    return {**pool_metrics(engine), **{f"peak_{k}": v for k, v in peak.items()}}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pool-size", type=int, default=5)
+    parser.add_argument("--max-overflow", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=0.5)
+    parser.add_argument("--hold-ms", type=float, default=20.0)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--threads", type=int, nargs="+", default=[4, 10, 20, 40])
+    args = parser.parse_args()
+
+    print(
+        f"{'threads':>7} {'checkouts/s':>11} {'timeouts':>8} {'espera média':>12} "
+        f"{'espera máx':>10} {'pico em uso':>11} {'pico overflow':>13}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for threads in args.threads:
+            engine = create_engine(
+                f"sqlite:///{tmp}/pool.db",
+                connect_args={"check_same_thread": False},
+                poolclass=InstrumentedQueuePool,
+                pool_size=args.pool_size,
+                max_overflow=args.max_overflow,
+                pool_timeout=args.timeout,
+            )
+            result = _run(engine, threads, args.hold_ms, args.seconds)
+            engine.dispose()
+            print(
+                f"{threads:>7} {result['checkouts'] / args.seconds:>11.0f} "
+                f"{result['timeouts']:>8} {result['avg_wait_ms']:>10.1f}ms "
+                f"{result['max_wait_ms']:>8.1f}ms {result['peak_checked_out']:>11} "
+                f"{result['peak_overflow']:>13}"
+            )
@@ -0,0 +1,52 @@
+"""
+Benchmark do encaixe de tarefas em horários (modo slots de /optimize-schedule).
+Execute: python scripts/bench_scheduler.py
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir))
+
+from src.models.schemas import TaskPriority, TaskPublic
+from src.services.scheduler_service import schedule_tasks
+
+SIZES = [100, 1_000, 10_000]
+
+
+def _build_tasks(count: int, start: datetime) -> list:
+    rng = random.Random(count)
+    priorities = list(TaskPriority)
+    return [
+        TaskPublic(
+            title=f"Tarefa {index}",
+            estimated_minutes=rng.randint(15, 240),
+            due_date=start + timedelta(hours=rng.randint(1, 24 * 60))
+            if rng.random() < 0.8
+            else None,
+            priority=rng.choice(priorities),
+        )
+        for index in range(count)
+    ]
+
+
+if __name__ == "__main__":
+    start = datetime.now(timezone.utc)
+    print(
+        f"{'tarefas':>8} {'horizonte':>10} {'tempo (ms)':>11} "
+        f"{'encaixadas':>11} {'no prazo':>9}"
+    )
+    for size in SIZES:
+        tasks = _build_tasks(size, start)
+        # Semanas de 5 dias de 9h suficientes para a soma das durações.
+        total_minutes = sum(task.estimated_minutes for task in tasks)
+        horizon = (total_minutes // (60 * 9 * 5) + 2) * 7
+        began = time.perf_counter()
+        slots = schedule_tasks(tasks, start=start, horizon_days=horizon)
+        elapsed = (time.perf_counter() - began) * 1000
+        placed = sum(1 for slot in slots.values() if slot.start is not None)
+        on_time = sum(1 for slot in slots.values() if slot.deadline_met)
+        print(f"{size:>8} {horizon:>9}d {elapsed:>11.2f} {placed:>11} {on_time:>9}")
@@ -0,0 +1,104 @@
+"""
+Benchmark da serialização de listagens de tarefas: caminho antigo (ORM ->
+TaskPublic validado -> revalidação do response_model -> json) contra o
+caminho enxuto (tuplas de colunas -> dicts -> orjson).
+Execute: python scripts/bench_serialization.py
+"""
+import json
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir))
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from src.core.database import Base
+from src.models.database import Task, User
+from src.models.schemas import TaskCategory, TaskPublic
+from src.services import task_service
+
+SIZES = [1_000, 10_000]
+REPEAT = 5
+RESPONSE_MODEL = TypeAdapter(List[TaskPublic])
+
+
+def _seed(session: Session, owner_id: str, count: int) -> None:
+    now = datetime.utcnow()
+    categories = list(TaskCategory)
+    session.execute(
+        insert(Task),
+        [
+            {
+                "id": str(uuid.uuid4()),
+                "title": f"Tarefa {index}",
+                "description": "Gerada pelo benchmark",
+                "due_date": now + timedelta(hours=index % 500),
+                "category": categories[index % len(categories)],
+                "owner_id": owner_id,
+            }
+            for index in range(count)
+        ],
+    )
+    session.commit()
+
+
+def _legacy(session: Session, owner_id: str) -> bytes:
+    tasks = [
+        task_service._task_db_to_schema(task)
+        for task in session.scalars(select(Task).where(Task.owner_id == owner_id))
+    ]
+    # O que o FastAPI faz com um response_model: dump, validação e encode.
+    validated = RESPONSE_MODEL.validate_python([task.model_dump() for task in tasks])
+    return json.dumps(RESPONSE_MODEL.dump_python(validated, mode="json")).encode()
+
+
+def _lean(session: Session, owner_id: str) -> bytes:
+    rows = session.execute(
+        select(*task_service._public_columns()).where(Task.owner_id == owner_id)
+    )
+    return orjson.dumps(
+        [task_service._task_row_to_dict(row) for row in rows],
+        option=orjson.OPT_UTC_Z,
+    )
+
+
+def _best_ms(fn, *args) -> float:
+    samples = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - started) * 1000)
+    return min(samples)
+
+
+if __name__ == "__main__":
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    print(
+        f"{'tarefas':>8} {'antigo (ms)':>12} {'us/tarefa':>10} "
+        f"{'enxuto (ms)':>12} {'us/tarefa':>10} {'ganho':>7}"
+    )
+    for size in SIZES:
+        with Session(engine) as session:
+            owner_id = str(uuid.uuid4())
+            session.add(User(id=owner_id, email=f"{owner_id}@bench", hashed_password="-"))
+            _seed(session, owner_id, size)
+
+            assert json.loads(_legacy(session, owner_id)) == json.loads(
+                _lean(session, owner_id)
+            )
+            legacy = _best_ms(_legacy, session, owner_id)
+            lean = _best_ms(_lean, session, owner_id)
+        print(
+            f"{size:>8} {legacy:>12.1f} {legacy * 1000 / size:>10.2f} "
+            f"{lean:>12.1f} {lean * 1000 / size:>10.2f} {legacy / lean:>6.1f}x"
+        )
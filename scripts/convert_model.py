@@ -0,0 +1,69 @@
+"""
+Converte versões do modelo em pickle para o formato .npy + manifest.json,
+aberto com mmap e compartilhado entre os workers do uvicorn.
+Execute: python scripts/convert_model.py [versão ...]
+"""
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir))
+
+import joblib
+
+from src.services.compiled_forest import CompiledForest
+from src.services.model_registry import (
+    ARRAYS_DIRNAME,
+    MODEL_FILENAME,
+    ModelLoadError,
+    registry,
+)
+
+
+def _size_mb(path: Path) -> float:
+    files = path.rglob("*") if path.is_dir() else [path]
+    return sum(item.stat().st_size for item in files if item.is_file()) / 1e6
+
+
+def _elapsed_ms(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "versions",
+        nargs="*",
+        help="Versões a converter (padrão: todas do registro, inclusive legacy)",
+    )
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    # legacy são os pickles soltos em src/ia: num checkout novo, os únicos.
+    versions = args.versions or registry.list_versions()
+    if not versions:
+        print("Nenhuma versão com pickles para converter.")
+        sys.exit(1)
+    failed = False
+    for version in versions:
+        try:
+            manifest = registry.convert(version)
+        except (ModelLoadError, ValueError) as exc:
+            print(f"{version}: não convertida ({exc})")
+            failed = True
+            continue
+
+        directory = manifest.parent
+        pickle_ms = _elapsed_ms(lambda: joblib.load(directory / MODEL_FILENAME))
+        mmap_ms = _elapsed_ms(lambda: CompiledForest.load(directory / ARRAYS_DIRNAME))
+        print(
+            f"{version}: pickle {_size_mb(directory / MODEL_FILENAME):.1f} MB "
+            f"carregado em {pickle_ms:.1f} ms -> arrays "
+            f"{_size_mb(directory / ARRAYS_DIRNAME):.1f} MB abertos em {mmap_ms:.2f} ms"
+        )
+    sys.exit(1 if failed else 0)
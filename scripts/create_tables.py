@@ -1,5 +1,6 @@
 """
-Script para criar as tabelas no banco de dados.
+Script para criar as tabelas no banco de dados, ou atualizar as de um banco
+criado por uma versão anterior (colunas e índices novos).
 Execute: python scripts/create_tables.py
 """
 import sys
@@ -8,17 +9,23 @@ from pathlib import Path
 root_dir = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(root_dir))
 
-from src.core.database import init_db
+from src.core.database import Base, engine, upgrade_db
 from src.models import database  
 
 if __name__ == "__main__":
     print("Criando tabelas no banco de dados...")
     try:
-        init_db()
+        Base.metadata.create_all(bind=engine)
+        # Bancos criados por versões anteriores: colunas e índices novos.
+        applied = upgrade_db(engine)
         print("✅ Tabelas criadas com sucesso!")
-        print("Tabelas criadas:")
-        print("  - users")
-        print("  - tasks")
+        print("Tabelas:")
+        for table in Base.metadata.sorted_tables:
+            print(f"  - {table.name}")
+        if applied:
+            print("Atualizações aplicadas:")
+            for change in applied:
+                print(f"  - {change}")
     except Exception as e:
         print(f"❌ Erro ao criar tabelas: {e}")
         sys.exit(1)
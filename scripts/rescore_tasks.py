@@ -0,0 +1,53 @@
+"""
+Job noturno: reavalia a prioridade de todas as tarefas pendentes.
+Execute: python scripts/rescore_tasks.py --checkpoint rescore.checkpoint.json
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir))
+
+from src.core.database import engine
+from src.models import database  
+from src.services.rescoring_service import DEFAULT_CHUNK_SIZE, rescore_pending_tasks
+
+
+def _report(stats) -> None:
+    print(
+        f"  bloco {stats.chunks}: {stats.rows} linhas, "
+        f"{stats.rescored} reavaliadas, {stats.rows_per_second:,.0f} linhas/s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="Arquivo de checkpoint para retomar uma execução interrompida",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    print("Reavaliando tarefas pendentes...")
+    try:
+        stats = rescore_pending_tasks(
+            engine,
+            chunk_size=args.chunk_size,
+            checkpoint_path=args.checkpoint,
+            on_chunk=_report,
+        )
+    except Exception as e:
+        print(f"❌ Erro ao reavaliar tarefas: {e}")
+        sys.exit(1)
+
+    print(
+        f"✅ {stats.rows} tarefas lidas, {stats.rescored} reavaliadas, "
+        f"{stats.priority_changes} prioridades alteradas em {stats.seconds:.1f}s "
+        f"({stats.rows_per_second:,.0f} linhas/s)"
+    )
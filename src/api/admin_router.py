@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.deps import require_admin
+from src.core.database import async_engine, get_async_db, pool_metrics
+from src.services import auth_service, ia_service
+from src.services.model_registry import ModelLoadError, registry
+from src.services.task_cache import cache
+from src.services.token_store import revocations, token_cache
+
+router = APIRouter(
+    prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)]
+)
+
+
+class ModelStatus(BaseModel):
+    active_version: Optional[str] = None
+    loaded_at: Optional[datetime] = None
+    available_versions: List[str]
+
+
+class ModelReloadRequest(BaseModel):
+    version: Optional[str] = None
+
+
+def _model_status() -> ModelStatus:
+    bundle = registry.active
+    return ModelStatus(
+        active_version=bundle.version if bundle else None,
+        loaded_at=bundle.loaded_at if bundle else None,
+        available_versions=registry.list_versions(),
+    )
+
+
+@router.get("/model", response_model=ModelStatus, summary="Active AI model")
+def model_status_endpoint() -> ModelStatus:
+    return _model_status()
+
+
+@router.post(
+    "/model/reload",
+    response_model=ModelStatus,
+    summary="Load a model version and swap it in",
+)
+def reload_model_endpoint(request: ModelReloadRequest | None = None) -> ModelStatus:
+    try:
+        registry.reload(request.version if request else None)
+    except ModelLoadError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=str(exc)
+        ) from exc
+    return _model_status()
+
+
+@router.post(
+    "/users/{user_id}/revoke-tokens",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Revoke every access and refresh token issued so far to a user",
+)
+async def revoke_user_tokens_endpoint(
+    user_id: UUID, db: AsyncSession = Depends(get_async_db)
+):
+    revoked_at = await auth_service.revoke_user_tokens_async(db, str(user_id))
+    revocations.revoke_user(str(user_id), revoked_at)
+
+
+@router.get("/metrics", summary="Runtime metrics")
+def metrics_endpoint() -> Dict[str, Any]:
+    return {
+        "inference": ia_service.batcher.metrics(),
+        "task_cache": cache.metrics(),
+        "db_pool": pool_metrics(),
+        "db_async_pool": pool_metrics(async_engine),
+        "password_hasher": auth_service.password_hasher.metrics(),
+        "auth": {"token_cache": token_cache.metrics(), **revocations.metrics()},
+    }
+
+
+__all__ = ["router"]
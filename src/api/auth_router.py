@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..models import schemas
 from ..services import auth_service
-from ..core.database import get_db
-
+from ..core.database import get_async_db
+from ..services.token_store import revocations
+from .deps import get_current_token
 
 router = APIRouter(prefix="/auth", tags=["Autenticação"])
 
@@ -11,18 +12,52 @@ router = APIRouter(prefix="/auth", tags=["Autenticação"])
 @router.post(
     "/register", response_model=schemas.UserPublic, status_code=status.HTTP_201_CREATED
 )
-async def register(user_data: schemas.UserCreate, db: Session = Depends(get_db)):
+async def register(
+    user_data: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)
+):
     """
     Endpoint para registrar um novo usuário.
     Os dados (user_data) são validados pelo schema UserCreate.
     """
-    return auth_service.register_user(user=user_data, db=db)
+    return await auth_service.register_user_async(user=user_data, db=db)
 
 
 @router.post("/login", response_model=schemas.Token)
-async def login(login_data: schemas.UserCreate, db: Session = Depends(get_db)):
+async def login(
+    login_data: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)
+):
     """
     Endpoint para logar um usuário.
     Reutilizamos o schema UserCreate por simplicidade do MVP.
     """
-    return auth_service.login_user(form_data=login_data, db=db)
+    return await auth_service.login_user_async(form_data=login_data, db=db)
+
+
+@router.post("/refresh", response_model=schemas.Token)
+async def refresh(
+    refresh_data: schemas.RefreshRequest, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Endpoint para renovar o access token sem refazer o login.
+    O refresh token usado é trocado por um novo (rotação) e não vale mais.
+    """
+    return await auth_service.refresh_tokens_async(refresh_data.refresh_token, db=db)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    logout_data: schemas.RefreshRequest | None = None,
+    token_data: schemas.TokenData = Depends(get_current_token),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Endpoint para encerrar a sessão.
+    O token usado na requisição é revogado até expirar; se o refresh token
+    da sessão for enviado, ele e os que vieram dele também são revogados.
+    """
+    revocations.revoke_token(token_data)
+    await auth_service.revoke_access_token_async(db, token_data)
+    if logout_data is not None:
+        await auth_service.revoke_refresh_tokens_async(
+            db, refresh_token=logout_data.refresh_token, user_id=token_data.user_id
+        )
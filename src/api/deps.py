@@ -1,22 +1,22 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
-from src.core import security
-from src.core.database import get_db
+from src.core import config, security
 from src.models import schemas
-from src.services import auth_service
+from src.services.token_store import revocations, token_cache
 
 security_scheme = HTTPBearer()
 
 
-def get_current_user_id(
-    token_auth=Depends(security_scheme), db: Session = Depends(get_db)
-) -> str:
+async def get_current_token(token_auth=Depends(security_scheme)) -> schemas.TokenData:
     """
     Dependência de porteiro (Atualizada para HTTPBearer).
     1. Pega o token do objeto de autorização.
-    2. Verifica validade.
-    3. Retorna o ID.
+    2. Verifica validade (ou reaproveita a verificação recente do cache).
+    3. Confere a lista de revogações.
+    Não consulta o banco: o ID do usuário vem no próprio token. É async sem
+    await de propósito, para rodar no loop e não no threadpool.
     """
     token = token_auth.credentials
 
@@ -26,11 +26,38 @@ def get_current_user_id(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    token_data = security.verify_token(token, credentials_exception)
-
-    user_in_db = auth_service.get_user_by_email(db, token_data.email)
+    token_data = token_cache.get(token)
+    if token_data is None:
+        token_data = security.verify_token(token, credentials_exception)
+        # Tokens emitidos antes do claim uid pedem um novo login.
+        if token_data.user_id is None or token_data.jti is None:
+            raise credentials_exception
+        token_cache.set(token, token_data)
 
-    if user_in_db is None:
+    if revocations.is_revoked(token_data):
         raise credentials_exception
 
-    return user_in_db.id
+    return token_data
+
+
+async def get_current_user_id(
+    token_data: schemas.TokenData = Depends(get_current_token),
+) -> str:
+    """Retorna o ID do usuário autenticado."""
+    return token_data.user_id
+
+
+def require_admin(x_admin_token: str | None = Header(default=None)) -> None:
+    """
+    Dependência para rotas administrativas.
+    Exige o header X-Admin-Token igual a KAIROS_ADMIN_TOKEN; sem a variável
+    configurada as rotas ficam desabilitadas.
+    """
+    if config.ADMIN_TOKEN is None or x_admin_token is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Acesso negado"
+        )
+    if not hmac.compare_digest(x_admin_token, config.ADMIN_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Acesso negado"
+        )
@@ -1,22 +1,130 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Any, List, Literal, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, Query, Request, Response, status, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson
+from pydantic import BaseModel, Field, TypeAdapter, model_validator
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.models.schemas import TaskCreate, TaskPublic
-from src.services import ia_service, task_service
+from src.models.schemas import (
+    ScheduledTask,
+    TaskBulkDeleteResult,
+    TaskBulkResult,
+    TaskCategory,
+    TaskCreate,
+    TaskFilter,
+    TaskImportResult,
+    TaskPriority,
+    TaskPublic,
+    TaskStatus,
+    TaskUpdate,
+    WorkingHoursConfig,
+)
+from src.services import ia_service, import_service, scheduler_service, task_service
 from src.api.deps import get_current_user_id
-from src.core.database import get_db
+from src.core.database import get_async_db, get_db
 
 router = APIRouter(tags=["tasks"])
 
 
+class TaskListResponse(ORJSONResponse):
+    """ORJSONResponse com datas UTC em "Z", como o pydantic as serializa."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z,
+        )
+
+
 class OptimizeScheduleRequest(BaseModel):
     tasks: Optional[List[TaskPublic]] = None
+    mode: Literal["rank", "slots"] = Field(
+        default="rank",
+        description="'slots' also assigns start/end times within working hours",
+    )
+    working_hours: WorkingHoursConfig = Field(default_factory=WorkingHoursConfig)
+    start: Optional[datetime] = Field(
+        default=None, description="Start of the schedule (defaults to now, UTC)"
+    )
+    horizon_days: int = Field(default=14, ge=1, le=90)
+
+
+class BulkTaskCreateRequest(BaseModel):
+    tasks: List[Any] = Field(
+        ...,
+        min_length=1,
+        max_length=task_service.MAX_BULK_TASKS,
+        description="Tasks to create; each one is validated independently",
+    )
+
+
+class TaskSelection(BaseModel):
+    ids: Optional[List[UUID]] = Field(
+        default=None, min_length=1, max_length=task_service.MAX_BULK_TASKS
+    )
+    filter: Optional[TaskFilter] = None
+
+    @model_validator(mode="after")
+    def validate_selection(self) -> "TaskSelection":
+        if self.ids is None and self.filter is None:
+            raise ValueError("provide ids, filter or both")
+        return self
+
+
+class BulkTaskUpdateRequest(TaskSelection):
+    changes: TaskUpdate
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": "private, no-cache"},
+    )
+
+
+def _schedule_slots(
+    tasks: List[TaskPublic], request: OptimizeScheduleRequest
+) -> List[ScheduledTask]:
+    hours = request.working_hours
+    slots = scheduler_service.schedule_tasks(
+        tasks,
+        start=request.start or datetime.now(timezone.utc),
+        working_hours=scheduler_service.WorkingHours(
+            start=hours.start,
+            end=hours.end,
+            weekdays=frozenset(hours.weekdays),
+            tz=hours.tzinfo(),
+        ),
+        horizon_days=request.horizon_days,
+    )
+    scheduled = []
+    for task in tasks:
+        slot = slots.get(task.id)
+        scheduled.append(
+            ScheduledTask.model_construct(
+                **dict(task),
+                scheduled_start=slot.start if slot else None,
+                scheduled_end=slot.end if slot else None,
+                deadline_met=slot.deadline_met if slot else None,
+            )
+        )
+    unscheduled_at = datetime.max.replace(tzinfo=timezone.utc)
+    return sorted(scheduled, key=lambda t: t.scheduled_start or unscheduled_at)
 
 
 @router.post(
@@ -25,23 +133,183 @@ class OptimizeScheduleRequest(BaseModel):
     status_code=status.HTTP_201_CREATED,
     summary="Create a task",
 )
-def create_task_endpoint(
+async def create_task_endpoint(
     payload: TaskCreate,
     user_id=Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> TaskPublic:
-    return task_service.create_task(payload, db, owner_id=user_id)
+    return await task_service.create_task_async(payload, db, owner_id=user_id)
+
+
+@router.post(
+    "/tasks/bulk",
+    response_model=TaskBulkResult,
+    summary="Create many tasks at once",
+    description=(
+        "Valid items are inserted in a single statement; invalid ones are "
+        "reported by their index in `errors` and do not block the rest."
+    ),
+)
+async def bulk_create_tasks_endpoint(
+    request: BulkTaskCreateRequest,
+    user_id=Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
+) -> TaskBulkResult:
+    payloads, errors = await run_in_threadpool(
+        task_service.validate_task_items, request.tasks
+    )
+    created = await task_service.create_tasks_async(payloads, db, owner_id=user_id)
+    return TaskBulkResult(created=created, errors=errors)
 
 
 @router.get(
     "/tasks",
     response_model=List[TaskPublic],
     summary="List tasks for the authenticated user",
+    description=(
+        "Returns one page ordered by due date (tasks without one last). "
+        "When more tasks exist, the X-Next-Cursor response header holds the "
+        "cursor for the next page. Send the returned ETag in If-None-Match "
+        "to get 304 Not Modified while nothing changed."
+    ),
 )
-def list_tasks_endpoint(
-    user_id=Depends(get_current_user_id), db: Session = Depends(get_db)
+async def list_tasks_endpoint(
+    request: Request,
+    status_in: Optional[List[TaskStatus]] = Query(None, alias="status"),
+    category_in: Optional[List[TaskCategory]] = Query(None, alias="category"),
+    priority_in: Optional[List[TaskPriority]] = Query(None, alias="priority"),
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None,
+    limit: int = Query(
+        task_service.DEFAULT_PAGE_SIZE, ge=1, le=task_service.MAX_PAGE_SIZE
+    ),
+    cursor: Optional[str] = None,
+    user_id=Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
 ) -> List[TaskPublic]:
-    return task_service.list_tasks(db, owner_id=user_id)
+    etag = await task_service.tasks_etag_async(
+        db, owner_id=user_id, extra=[request.url.query]
+    )
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+
+    tasks, next_cursor = await task_service.list_tasks_page_async(
+        db,
+        owner_id=user_id,
+        status_in=status_in,
+        category_in=category_in,
+        priority_in=priority_in,
+        due_from=due_from,
+        due_to=due_to,
+        limit=limit,
+        cursor=cursor,
+        state=etag,
+    )
+    # Linhas confiáveis do banco: serializadas direto com orjson, sem a
+    # revalidação do response_model (que fica só para a documentação).
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return TaskListResponse(tasks, headers=headers)
+
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@router.get(
+    "/tasks/export",
+    summary="Stream the user's tasks as NDJSON or CSV",
+    response_class=StreamingResponse,
+)
+async def export_tasks_endpoint(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    status_in: Optional[List[TaskStatus]] = Query(None, alias="status"),
+    category_in: Optional[List[TaskCategory]] = Query(None, alias="category"),
+    priority_in: Optional[List[TaskPriority]] = Query(None, alias="priority"),
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None,
+    user_id=Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
+) -> StreamingResponse:
+    rows = task_service.export_tasks_async(
+        db.bind,
+        owner_id=user_id,
+        export_format=export_format,
+        status_in=status_in,
+        category_in=category_in,
+        priority_in=priority_in,
+        due_from=due_from,
+        due_to=due_to,
+    )
+    return StreamingResponse(
+        rows,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks.{export_format}"'
+        },
+    )
+
+
+@router.post(
+    "/tasks/import",
+    response_model=TaskImportResult,
+    summary="Import tasks from an NDJSON or CSV body",
+    description=(
+        "Send the file as the raw request body. The format comes from "
+        "`format` or, when omitted, from the Content-Type (text/csv for CSV, "
+        "NDJSON otherwise). Rows are validated and inserted in chunks while "
+        "the body is read; invalid rows are reported by line number."
+    ),
+)
+async def import_tasks_endpoint(
+    request: Request,
+    import_format: Optional[Literal["ndjson", "csv"]] = Query(None, alias="format"),
+    user_id=Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
+) -> TaskImportResult:
+    if import_format is None:
+        content_type = request.headers.get("content-type", "")
+        import_format = "csv" if content_type.startswith("text/csv") else "ndjson"
+    return await import_service.import_tasks(
+        request.stream(), db, owner_id=user_id, import_format=import_format
+    )
+
+
+@router.patch(
+    "/tasks",
+    response_model=List[TaskPublic],
+    summary="Update many tasks at once",
+    description="Applies `changes` to the user's tasks matching `ids` and/or `filter`.",
+)
+async def bulk_update_tasks_endpoint(
+    request: BulkTaskUpdateRequest,
+    user_id=Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
+) -> List[TaskPublic]:
+    return await task_service.update_tasks_async(
+        db,
+        request.changes,
+        owner_id=user_id,
+        task_ids=request.ids,
+        filters=request.filter,
+    )
+
+
+@router.delete(
+    "/tasks",
+    response_model=TaskBulkDeleteResult,
+    summary="Delete many tasks at once",
+    description="Deletes the user's tasks matching `ids` and/or `filter`.",
+)
+async def bulk_delete_tasks_endpoint(
+    request: TaskSelection,
+    user_id=Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
+) -> TaskBulkDeleteResult:
+    deleted = await task_service.delete_tasks_async(
+        db, owner_id=user_id, task_ids=request.ids, filters=request.filter
+    )
+    return TaskBulkDeleteResult(deleted=len(deleted), ids=deleted)
 
 
 @router.delete(
@@ -49,30 +317,78 @@ def list_tasks_endpoint(
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Delete a task",
 )
-def delete_task_endpoint(
+async def delete_task_endpoint(
     task_id: UUID,
     user_id=Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    success = task_service.delete_task(db, task_id)
+    success = await task_service.delete_task_async(db, task_id, owner_id=user_id)
     if not success:
         raise HTTPException(status_code=404, detail="Task not found")
     return None
 
 
-@router.post("/optimize-schedule", response_model=List[TaskPublic])
+# As tarefas do /optimize-schedule já foram montadas pelo serviço, então são
+# serializadas sem a revalidação do response_model.
+_SCHEDULED_LIST = TypeAdapter(List[ScheduledTask])
+
+
+def _optimize_etag_parts(request: OptimizeScheduleRequest | None) -> List[str]:
+    """
+    O resultado depende, além das tarefas, da versão do modelo, do dia
+    (``days_until_due``) e dos parâmetros do pedido.
+    """
+    bundle = ia_service.registry.active
+    return [
+        bundle.version if bundle else "",
+        datetime.now(timezone.utc).date().isoformat(),
+        request.model_dump_json() if request else "",
+    ]
+
+
+# Síncrona de propósito: a predição e o agendamento são de CPU e rodam no
+# threadpool, com a sessão síncrona.
+@router.post("/optimize-schedule", response_model=List[ScheduledTask])
 def optimize_schedule_endpoint(
+    http_request: Request,
     request: OptimizeScheduleRequest | None = None,
     user_id=Depends(get_current_user_id),
     db: Session = Depends(get_db),
-) -> List[TaskPublic]:
-    tasks = (
-        request.tasks
-        if request and request.tasks
-        else task_service.list_tasks(db, owner_id=user_id)
+) -> List[ScheduledTask]:
+    client_tasks = bool(request and request.tasks)
+    # Sem tarefas do cliente e sem horário relativo a "agora", o resultado
+    # só muda junto com o estado salvo: dá para responder 304.
+    cacheable = not client_tasks and not (
+        request and request.mode == "slots" and request.start is None
     )
+    if cacheable:
+        etag = task_service.tasks_etag(
+            db, owner_id=user_id, extra=_optimize_etag_parts(request)
+        )
+        if _etag_matches(http_request, etag):
+            return _not_modified(etag)
 
-    return ia_service.optimize_schedule(tasks, db)
+    tasks = (
+        request.tasks if client_tasks else task_service.list_tasks(db, owner_id=user_id)
+    )
+    ordered = ia_service.optimize_schedule(
+        tasks, db, owner_id=user_id, reuse_scores=not client_tasks
+    )
+    headers = {}
+    if cacheable:
+        # A reotimização pode ter gravado prioridades: o ETag é o do estado final.
+        headers["ETag"] = task_service.tasks_etag(
+            db, owner_id=user_id, extra=_optimize_etag_parts(request)
+        )
+    if request and request.mode == "slots":
+        scheduled = _schedule_slots(ordered, request)
+    else:
+        scheduled = [ScheduledTask.model_construct(**dict(task)) for task in ordered]
+    return Response(
+        _SCHEDULED_LIST.dump_json(scheduled),
+        media_type="application/json",
+        headers=headers,
+    )
 
 
 __all__ = ["router"]
@@ -0,0 +1,69 @@
+import os
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+IA_DIR = SRC_DIR / "ia"
+
+MODEL_REGISTRY_DIR = Path(os.getenv("KAIROS_MODEL_REGISTRY_DIR", str(IA_DIR / "models")))
+MODEL_VERSION = os.getenv("KAIROS_MODEL_VERSION") or None
+# Prefere a floresta exportada em .npy (aberta com mmap) aos pickles.
+MODEL_MMAP = os.getenv("KAIROS_MODEL_MMAP", "1") == "1"
+# Lotes de até N linhas usam o avaliador compilado da floresta; lotes maiores
+# voltam para o sklearn. 0 desliga o avaliador compilado.
+COMPILED_FOREST_MAX_BATCH = int(os.getenv("KAIROS_COMPILED_FOREST_MAX_BATCH", "500"))
+# Pré-calcula as predições numa tabela densa ao carregar o modelo.
+PRIORITY_LOOKUP = os.getenv("KAIROS_PRIORITY_LOOKUP", "0") == "1"
+
+# Micro-batching das predições entre requisições concorrentes.
+INFERENCE_BATCHING = os.getenv("KAIROS_INFERENCE_BATCHING", "1") == "1"
+INFERENCE_BATCH_MAX_ROWS = int(os.getenv("KAIROS_INFERENCE_BATCH_MAX_ROWS", "512"))
+INFERENCE_BATCH_MAX_WAIT_MS = float(os.getenv("KAIROS_INFERENCE_BATCH_MAX_WAIT_MS", "2"))
+
+ADMIN_TOKEN = os.getenv("KAIROS_ADMIN_TOKEN") or None
+
+# Cache das listagens de tarefas: memory (padrão), redis ou off.
+TASK_CACHE = os.getenv("KAIROS_TASK_CACHE", "memory")
+TASK_CACHE_TTL_SECONDS = float(os.getenv("KAIROS_TASK_CACHE_TTL_SECONDS", "30"))
+TASK_CACHE_MAX_ENTRIES = int(os.getenv("KAIROS_TASK_CACHE_MAX_ENTRIES", "1024"))
+REDIS_URL = os.getenv("KAIROS_REDIS_URL", "redis://localhost:6379/0")
+
+# Pool de conexões do banco. Cada worker do uvicorn (WEB_CONCURRENCY) tem dois
+# pools, o do engine síncrono e o do assíncrono, com os mesmos limites; o
+# padrão divide KAIROS_DB_MAX_CONNECTIONS entre eles: metade fixa
+# (pool_size) e metade sob demanda (max_overflow).
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+DB_MAX_CONNECTIONS = int(os.getenv("KAIROS_DB_MAX_CONNECTIONS", "80"))
+_DB_CONNECTIONS_PER_POOL = max(2, DB_MAX_CONNECTIONS // (WEB_CONCURRENCY * 2))
+DB_POOL_SIZE = int(
+    os.getenv("KAIROS_DB_POOL_SIZE", str(_DB_CONNECTIONS_PER_POOL // 2))
+)
+DB_MAX_OVERFLOW = int(
+    os.getenv("KAIROS_DB_MAX_OVERFLOW", str(_DB_CONNECTIONS_PER_POOL - DB_POOL_SIZE))
+)
+# Segundos esperando uma conexão livre antes de falhar com TimeoutError.
+DB_POOL_TIMEOUT = float(os.getenv("KAIROS_DB_POOL_TIMEOUT", "10"))
+# Recicla conexões mais velhas que isso (segundos), antes que o Postgres ou
+# um proxy as derrube por inatividade. -1 desliga.
+DB_POOL_RECYCLE = int(os.getenv("KAIROS_DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("KAIROS_DB_POOL_PRE_PING", "1") == "1"
+# URL do engine assíncrono; por padrão, a DATABASE_URL com o driver trocado
+# (aiosqlite para SQLite, asyncpg para Postgres).
+ASYNC_DATABASE_URL = os.getenv("KAIROS_ASYNC_DATABASE_URL") or None
+
+# Pool de threads do bcrypt: threads calculando hashes ao mesmo tempo e
+# quantas chamadas podem esperar na fila antes de o login responder 503.
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("KAIROS_PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("KAIROS_PASSWORD_HASH_MAX_QUEUE", "32"))
+
+# Cache dos tokens JWT já validados, para não decodificá-los a cada requisição.
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("KAIROS_TOKEN_CACHE_TTL_SECONDS", "60"))
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("KAIROS_TOKEN_CACHE_MAX_ENTRIES", "10000"))
+
+# Intervalo com que cada worker relê do banco as revogações de tokens feitas
+# pelos outros (logout e revogação de todos os tokens de um usuário).
+REVOCATION_SYNC_SECONDS = float(os.getenv("KAIROS_REVOCATION_SYNC_SECONDS", "5"))
+
+# Validade dos refresh tokens; cada uso em /auth/refresh emite um novo.
+REFRESH_TOKEN_EXPIRE_DAYS = float(os.getenv("KAIROS_REFRESH_TOKEN_EXPIRE_DAYS", "30"))
@@ -1,7 +1,15 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, exc, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from typing import Any, Dict
 import os
+import threading
+import time
+
+from src.core import config
 
 DATABASE_URL = os.getenv(
     "DATABASE_URL",
@@ -12,15 +20,132 @@ DATABASE_URL = os.getenv(
 if DATABASE_URL.startswith("postgresql://"):
     DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+psycopg2://", 1)
 
+
+def async_url(url: str) -> str:
+    """A mesma URL com o driver assíncrono do banco."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        return str(parsed.set(drivername="sqlite+aiosqlite"))
+    if parsed.get_backend_name() == "postgresql":
+        return parsed.set(drivername="postgresql+asyncpg").render_as_string(
+            hide_password=False
+        )
+    return url
+
+
+ASYNC_DATABASE_URL = config.ASYNC_DATABASE_URL or async_url(DATABASE_URL)
+
+# Limites (ms) do histograma de espera por uma conexão do pool.
+POOL_WAIT_BUCKETS_MS = (1, 5, 25, 100, 500, 2500)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool que mede quanto cada checkout esperou por uma conexão (incluindo
+    abrir uma nova, no overflow) e conta os checkouts que estouraram o
+    ``pool_timeout``.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total_ms = 0.0
+        self._wait_max_ms = 0.0
+        self._wait_histogram = {bucket: 0 for bucket in (*POOL_WAIT_BUCKETS_MS, "inf")}
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self._record((time.perf_counter() - started) * 1000, timed_out=True)
+            raise
+        self._record((time.perf_counter() - started) * 1000, timed_out=False)
+        return connection
+
+    def _record(self, wait_ms: float, *, timed_out: bool) -> None:
+        bucket = next(
+            (limit for limit in POOL_WAIT_BUCKETS_MS if wait_ms <= limit), "inf"
+        )
+        with self._stats_lock:
+            if timed_out:
+                self._timeouts += 1
+            else:
+                self._checkouts += 1
+            self._wait_total_ms += wait_ms
+            self._wait_max_ms = max(self._wait_max_ms, wait_ms)
+            self._wait_histogram[bucket] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            waits = self._checkouts + self._timeouts
+            return {
+                "size": self.size(),
+                "max_overflow": self._max_overflow,
+                "timeout_seconds": self._timeout,
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(0, self.overflow()),
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": self._wait_total_ms / waits if waits else 0.0,
+                "max_wait_ms": self._wait_max_ms,
+                "wait_ms_histogram": {
+                    f"le_{bucket}": self._wait_histogram[bucket]
+                    for bucket in (*POOL_WAIT_BUCKETS_MS, "inf")
+                },
+            }
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """InstrumentedQueuePool para o engine assíncrono."""
+
+
+def pool_options(
+    url: str = DATABASE_URL, poolclass: type = InstrumentedQueuePool
+) -> Dict[str, Any]:
+    """
+    Opções de pool vindas de KAIROS_DB_*. O SQLite em memória fica com o pool
+    padrão do SQLAlchemy: cada conexão seria um banco novo.
+    """
+    if url.startswith("sqlite") and make_url(url).database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+    }
+
+
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
     echo=False,  
+    **pool_options(DATABASE_URL),
 )
 
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine assíncrono para as rotas async: a requisição espera o banco sem
+# ocupar uma thread do threadpool.
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=False,
+    **pool_options(ASYNC_DATABASE_URL, InstrumentedAsyncQueuePool),
+)
+
+# expire_on_commit=False: depois do commit, ler um atributo não pode disparar
+# um SELECT implícito, que não funciona fora de um await.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
@@ -36,10 +161,73 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """
+    Dependency para obter uma sessão assíncrona do banco de dados.
+    Usado com FastAPI Depends() nas rotas async.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
     """
-    Cria todas as tabelas no banco de dados.
+    Cria todas as tabelas no banco de dados e atualiza as já existentes.
     Deve ser chamado na inicialização da aplicação.
     """
     Base.metadata.create_all(bind=engine)
+    upgrade_db(engine)
+
+
+def upgrade_db(bind=None) -> list:
+    """
+    Traz tabelas criadas por versões anteriores para o esquema atual.
+
+    ``create_all`` só cria o que não existe: tabelas novas (e seus índices)
+    entram, mas colunas e índices novos de tabelas existentes (os ``ai_*`` e
+    os índices de listagem de ``tasks``, por exemplo) não. Aqui cada coluna
+    que falta é adicionada com ALTER TABLE (só colunas anuláveis, que não
+    precisam de valor para as linhas existentes) e cada índice que falta é
+    criado. É idempotente: rodar de novo não muda nada. Devolve o que foi
+    feito, para o script de criação mostrar.
+    """
+    bind = bind or engine
+    applied = []
+    with bind.begin() as conn:
+        inspector = inspect(conn)
+        existing_tables = set(inspector.get_table_names())
+        quote = conn.dialect.identifier_preparer.quote
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in columns:
+                    continue
+                if not column.nullable:
+                    raise RuntimeError(
+                        f"Coluna obrigatória {table.name}.{column.name} não existe; "
+                        "adicione-a manualmente com um valor para as linhas atuais."
+                    )
+                column_type = column.type.compile(dialect=conn.dialect)
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {quote(table.name)} "
+                        f"ADD COLUMN {quote(column.name)} {column_type}"
+                    )
+                )
+                applied.append(f"{table.name}.{column.name}")
+            indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(conn)
+                    applied.append(index.name)
+    return applied
+
 
+def pool_metrics(bind=None) -> Dict[str, Any]:
+    """Estado do pool de conexões (``engine`` por padrão) para /admin/metrics."""
+    pool = (bind or engine).pool
+    if isinstance(pool, InstrumentedQueuePool):
+        return {"pool": type(pool).__name__, **pool.metrics()}
+    return {"pool": type(pool).__name__, "status": pool.status()}
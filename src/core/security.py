@@ -1,6 +1,7 @@
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta, timezone
+import uuid
 from ..models import schemas
 
 
@@ -26,8 +27,12 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
 
-    expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    now = datetime.now(timezone.utc)
+    expire = now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    # iat com fração de segundo: a revogação por usuário compara instantes.
+    to_encode.update(
+        {"exp": expire, "iat": now.timestamp(), "jti": uuid.uuid4().hex}
+    )
 
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
@@ -43,7 +48,13 @@ def verify_token(token: str, credentials_exception) -> schemas.TokenData:
 
             raise credentials_exception
 
-        return schemas.TokenData(email=email)
+        return schemas.TokenData(
+            email=email,
+            user_id=payload.get("uid"),
+            jti=payload.get("jti"),
+            issued_at=payload.get("iat"),
+            expires_at=payload.get("exp"),
+        )
     except JWTError:
 
         raise credentials_exception
@@ -1,15 +1,21 @@
+"""
+Gera o dataset sintético de tarefas usado no treino do modelo.
+Execute: python src/ia/dataset_generator.py --rows 1000 --seed 42
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
 import pandas as pd
-import random
-from faker import Faker
-
-fake = Faker("pt_BR")
 
 NUM_SAMPLES = 1000
+DEFAULT_OUTPUT = "src/ia/tasks_dataset.csv"
+DEFAULT_CHUNK_SIZE = 1_000_000
 
-
-def generate_task_data():
-    data = []
-    categories = [
+CATEGORIES = np.array(
+    [
         "Trabalho",
         "Estudo",
         "Saúde",
@@ -18,59 +24,144 @@ def generate_task_data():
         "Projetos",
         "Finanças",
     ]
-
-    priorities_list = ["Alta", "Alta", "Média", "Baixa"]
-
-    print("Gerando dados MODO APRESENTAÇÃO (Mais Vermelho/Alta)...")
-
-    for _ in range(NUM_SAMPLES):
-        days_until_due = random.randint(0, 30)
-        estimated_minutes = random.randint(15, 480)
-        category = random.choice(categories)
-        difficulty = random.randint(1, 5)
-
-        priority = "Baixa"
-
-        if days_until_due <= 4:
-            priority = "Alta"
-
-        elif category in ["Saúde", "Finanças"] and days_until_due <= 10:
-            priority = "Alta"
-
-        elif (
-            category in ["Trabalho", "Projetos", "Estudo"]
-            and difficulty >= 4
-            and days_until_due <= 15
-        ):
-            priority = "Alta"
-
-        elif category in ["Trabalho", "Estudo", "Projetos"] and days_until_due <= 20:
-            priority = "Média"
-
-        elif estimated_minutes <= 60:
-            priority = "Média"
-
-        if random.random() < 0.20:
-            priority = random.choice(priorities_list)
-
-        data.append(
-            {
-                "days_until_due": days_until_due,
-                "estimated_minutes": estimated_minutes,
-                "category": category,
-                "difficulty": difficulty,
-                "priority_label": priority,
-            }
-        )
-
-    return pd.DataFrame(data)
+)
+PRIORITY_LABELS = np.array(["Baixa", "Média", "Alta"])
+# Sorteio do ruído: Alta tem o dobro de chance (modo apresentação).
+NOISE_CHOICES = np.array([2, 2, 1, 0], dtype=np.int8)
+
+
+def generate_task_arrays(
+    num_samples: int, rng: np.random.Generator, *, noise_rate: float = 0.20
+) -> pd.DataFrame:
+    """
+    Gera ``num_samples`` tarefas rotuladas de uma vez, com NumPy.
+
+    As regras são as mesmas da versão original em loop, avaliadas na mesma
+    ordem de precedência com ``np.select``.
+    """
+    days_until_due = rng.integers(0, 31, num_samples, dtype=np.int16)
+    estimated_minutes = rng.integers(15, 481, num_samples, dtype=np.int16)
+    category_index = rng.integers(0, len(CATEGORIES), num_samples, dtype=np.int8)
+    difficulty = rng.integers(1, 6, num_samples, dtype=np.int8)
+
+    category = CATEGORIES[category_index]
+    urgent_category = np.isin(category, ["Saúde", "Finanças"])
+    focus_category = np.isin(category, ["Trabalho", "Projetos", "Estudo"])
+
+    priority = np.select(
+        [
+            days_until_due <= 4,
+            urgent_category & (days_until_due <= 10),
+            focus_category & (difficulty >= 4) & (days_until_due <= 15),
+            focus_category & (days_until_due <= 20),
+            estimated_minutes <= 60,
+        ],
+        [2, 2, 2, 1, 1],
+        default=0,
+    ).astype(np.int8)
+
+    noisy = rng.random(num_samples) < noise_rate
+    priority[noisy] = rng.choice(NOISE_CHOICES, int(noisy.sum()))
+
+    return pd.DataFrame(
+        {
+            "days_until_due": days_until_due,
+            "estimated_minutes": estimated_minutes,
+            "category": category,
+            "difficulty": difficulty,
+            "priority_label": PRIORITY_LABELS[priority],
+        }
+    )
+
+
+def iter_task_chunks(
+    num_samples: int,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    seed: Optional[int] = None,
+    noise_rate: float = 0.20,
+) -> Iterator[pd.DataFrame]:
+    """Gera o dataset em blocos, com memória limitada a ``chunk_size`` linhas."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, num_samples, chunk_size):
+        size = min(chunk_size, num_samples - start)
+        yield generate_task_arrays(size, rng, noise_rate=noise_rate)
+
+
+def generate_task_data(
+    num_samples: int = NUM_SAMPLES, seed: Optional[int] = None
+) -> pd.DataFrame:
+    return pd.concat(
+        iter_task_chunks(num_samples, chunk_size=max(num_samples, 1), seed=seed),
+        ignore_index=True,
+    )
+
+
+def write_dataset(
+    path: Path,
+    num_samples: int,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    seed: Optional[int] = None,
+) -> Tuple[float, pd.Series]:
+    """
+    Grava o dataset em CSV ou Parquet (pela extensão) bloco a bloco.
+    Retorna o tempo gasto em segundos e a contagem de cada rótulo.
+    """
+    path = Path(path)
+    started = time.perf_counter()
+    label_counts = pd.Series(0, index=PRIORITY_LABELS[::-1], dtype="int64")
+
+    def chunks() -> Iterator[pd.DataFrame]:
+        nonlocal label_counts
+        for chunk in iter_task_chunks(num_samples, chunk_size=chunk_size, seed=seed):
+            label_counts = label_counts.add(
+                chunk["priority_label"].value_counts(), fill_value=0
+            )
+            yield chunk
+
+    if path.suffix == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in chunks():
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        for index, chunk in enumerate(chunks()):
+            chunk.to_csv(
+                path, mode="w" if index == 0 else "a", header=index == 0, index=False
+            )
+
+    return time.perf_counter() - started, label_counts.astype("int64")
 
 
 if __name__ == "__main__":
-    df = generate_task_data()
-    file_path = "src/ia/tasks_dataset.csv"
-    df.to_csv(file_path, index=False)
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=NUM_SAMPLES)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument(
+        "--output", type=Path, default=Path(DEFAULT_OUTPUT), help=".csv ou .parquet"
+    )
+    args = parser.parse_args()
 
-    print(f"\nDataset gerado: {file_path}")
+    print("Gerando dados MODO APRESENTAÇÃO (Mais Vermelho/Alta)...")
+    elapsed, label_counts = write_dataset(
+        args.output, args.rows, chunk_size=args.chunk_size, seed=args.seed
+    )
+
+    print(f"\nDataset gerado: {args.output}")
+    print(
+        f"{args.rows:,} linhas em {elapsed:.2f}s "
+        f"({args.rows / elapsed:,.0f} linhas/s)"
+    )
     print("\n--- Distribuição Ideal para Demo (Alta > 250) ---")
-    print(df["priority_label"].value_counts())
+    print(label_counts.sort_values(ascending=False))
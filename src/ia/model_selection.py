@@ -0,0 +1,257 @@
+"""
+Busca de hiperparâmetros com orçamento de latência e memória.
+
+Cada candidato é treinado num processo do pool (acurácia e tamanho
+serializado) e, com o pool já encerrado, medido um por vez no processo
+principal do jeito que a API vai usá-lo (``ModelBundle.predict``): latência
+p50/p99 de uma linha e de um lote. Medir dentro do pool mediria a disputa
+pelos núcleos com os outros treinos, não o modelo. O vencedor é o mais
+preciso entre os que cabem no orçamento.
+"""
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import (
+    ExtraTreesClassifier,
+    HistGradientBoostingClassifier,
+    RandomForestClassifier,
+)
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.tree import DecisionTreeClassifier
+
+from src.services.compiled_forest import CompiledForest
+from src.services.model_registry import ModelBundle
+
+MODEL_FAMILIES = {
+    "random_forest": RandomForestClassifier,
+    "extra_trees": ExtraTreesClassifier,
+    "decision_tree": DecisionTreeClassifier,
+    "hist_gradient_boosting": HistGradientBoostingClassifier,
+    "logistic_regression": LogisticRegression,
+}
+
+
+@dataclass(frozen=True)
+class Candidate:
+    family: str
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        params = ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"{self.family}({params})"
+
+    def build(self, random_state: int):
+        estimator = MODEL_FAMILIES[self.family](**self.params)
+        if "random_state" in estimator.get_params():
+            estimator.set_params(random_state=random_state)
+        return estimator
+
+
+@dataclass(frozen=True)
+class Budget:
+    max_single_p99_ms: Optional[float] = None
+    max_batch_p99_ms: Optional[float] = None
+    max_size_mb: Optional[float] = None
+    # Só aceita modelos que o CompiledForest exporta (exigido por --mmap).
+    require_compiled: bool = False
+
+
+@dataclass
+class CandidateResult:
+    name: str
+    family: str
+    params: Dict[str, Any]
+    accuracy: float
+    fit_seconds: float
+    single_p50_ms: float
+    single_p99_ms: float
+    batch_p50_ms: float
+    batch_p99_ms: float
+    size_mb: float
+    compiled: bool
+    within_budget: bool = False
+
+
+def default_candidates() -> List[Candidate]:
+    candidates = [
+        Candidate("random_forest", {"n_estimators": trees, "max_depth": depth})
+        for trees in (25, 50, 100, 200)
+        for depth in (None, 8, 12)
+    ]
+    candidates += [
+        Candidate("extra_trees", {"n_estimators": trees, "max_depth": depth})
+        for trees in (50, 100)
+        for depth in (None, 12)
+    ]
+    candidates += [
+        Candidate("decision_tree", {"max_depth": depth}) for depth in (8, 12)
+    ]
+    candidates += [
+        Candidate("hist_gradient_boosting", {"max_iter": iters, "max_depth": depth})
+        for iters in (50, 100)
+        for depth in (None, 6)
+    ]
+    candidates.append(Candidate("logistic_regression", {"max_iter": 1000}))
+    return candidates
+
+
+_worker_data: Dict[str, Any] = {}
+
+
+def _init_worker(X_train, y_train, X_test, y_test) -> None:
+    _worker_data.update(
+        X_train=X_train, y_train=y_train, X_test=X_test, y_test=y_test
+    )
+
+
+def _latencies_ms(fn, repeat: int) -> np.ndarray:
+    samples = np.empty(repeat)
+    for index in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples[index] = (time.perf_counter() - started) * 1000
+    return samples
+
+
+def _fit(candidate: Candidate, random_state: int) -> Tuple[float, float, bytes]:
+    """Treina no processo do pool; devolve acurácia, tempo de treino e o pickle."""
+    model = candidate.build(random_state)
+
+    started = time.perf_counter()
+    model.fit(_worker_data["X_train"], _worker_data["y_train"])
+    fit_seconds = time.perf_counter() - started
+    accuracy = accuracy_score(
+        _worker_data["y_test"], model.predict(_worker_data["X_test"])
+    )
+
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    return float(accuracy), fit_seconds, buffer.getvalue()
+
+
+def _measure(
+    candidate: Candidate,
+    fitted: Tuple[float, float, bytes],
+    X_test: pd.DataFrame,
+    batch_rows: int,
+) -> CandidateResult:
+    """Mede a latência de um candidato já treinado, no processo principal."""
+    accuracy, fit_seconds, payload = fitted
+    model = joblib.load(io.BytesIO(payload))
+    try:
+        forest = CompiledForest.from_sklearn(model)
+    except ValueError:
+        forest = None
+    bundle = ModelBundle(
+        version="candidate",
+        model=model,
+        encoder=None,
+        category_codes={},
+        forest=forest,
+    )
+    features = X_test.to_numpy(dtype=np.float64)
+    single = features[:1]
+    batch = features[:batch_rows]
+    bundle.predict(single)
+
+    single_ms = _latencies_ms(lambda: bundle.predict(single), 200)
+    batch_ms = _latencies_ms(lambda: bundle.predict(batch), 30)
+
+    return CandidateResult(
+        name=candidate.name,
+        family=candidate.family,
+        params=candidate.params,
+        accuracy=round(accuracy, 4),
+        fit_seconds=round(fit_seconds, 3),
+        single_p50_ms=round(float(np.percentile(single_ms, 50)), 4),
+        single_p99_ms=round(float(np.percentile(single_ms, 99)), 4),
+        batch_p50_ms=round(float(np.percentile(batch_ms, 50)), 4),
+        batch_p99_ms=round(float(np.percentile(batch_ms, 99)), 4),
+        size_mb=round(len(payload) / 1024**2, 3),
+        compiled=forest is not None,
+    )
+
+
+def _within_budget(result: CandidateResult, budget: Budget) -> bool:
+    limits = [
+        (result.single_p99_ms, budget.max_single_p99_ms),
+        (result.batch_p99_ms, budget.max_batch_p99_ms),
+        (result.size_mb, budget.max_size_mb),
+    ]
+    if budget.require_compiled and not result.compiled:
+        return False
+    return all(limit is None or value <= limit for value, limit in limits)
+
+
+def search(
+    X_train: pd.DataFrame,
+    y_train: np.ndarray,
+    X_test: pd.DataFrame,
+    y_test: np.ndarray,
+    *,
+    budget: Budget,
+    candidates: Optional[Sequence[Candidate]] = None,
+    workers: Optional[int] = None,
+    batch_rows: int = 500,
+    random_state: int = 42,
+) -> Dict[str, Any]:
+    """
+    Treina os candidatos em paralelo, mede a latência de cada um em
+    sequência e devolve o relatório da busca, com o candidato escolhido em
+    ``selected`` (``None`` se nenhum coube).
+    """
+    candidates = list(candidates or default_candidates())
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(X_train, y_train, X_test, y_test),
+    ) as pool:
+        fitted = list(pool.map(_fit, candidates, [random_state] * len(candidates)))
+    results = [
+        _measure(candidate, fit, X_test, batch_rows)
+        for candidate, fit in zip(candidates, fitted)
+    ]
+
+    for result in results:
+        result.within_budget = _within_budget(result, budget)
+    eligible = [result for result in results if result.within_budget]
+    selected = max(
+        eligible, key=lambda r: (r.accuracy, -r.single_p99_ms), default=None
+    )
+
+    return {
+        "budget": asdict(budget),
+        "batch_rows": batch_rows,
+        "search_seconds": round(time.perf_counter() - started, 3),
+        "selected": selected.name if selected else None,
+        "candidates": [
+            asdict(result)
+            for result in sorted(results, key=lambda r: r.accuracy, reverse=True)
+        ],
+    }
+
+
+def candidate_by_name(report: Dict[str, Any], name: str) -> Candidate:
+    for entry in report["candidates"]:
+        if entry["name"] == name:
+            return Candidate(entry["family"], entry["params"])
+    raise KeyError(name)
+
+
+__all__ = [
+    "Budget",
+    "Candidate",
+    "CandidateResult",
+    "candidate_by_name",
+    "default_candidates",
+    "search",
+]
@@ -1,36 +1,256 @@
-import pandas as pd
+"""
+Treina o modelo de prioridade e publica uma nova versão no registro.
+Execute: python src/ia/train_model.py --data src/ia/tasks_dataset.csv
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Tuple
+
 import joblib
-from sklearn.model_selection import train_test_split
+import numpy as np
+import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, classification_report
+from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
-from sklearn.metrics import classification_report, accuracy_score
 
-print("Carregando dataset modo apresentação...")
-df = pd.read_csv("src/ia/tasks_dataset.csv")
+root_dir = Path(__file__).resolve().parent.parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from src.core import config
+from src.ia import model_selection
+from src.models.schemas import TaskCategory
+from src.services.model_registry import ENCODER_FILENAME, MODEL_FILENAME, registry
+
+FEATURE_COLUMNS = [
+    "days_until_due",
+    "estimated_minutes",
+    "difficulty",
+    "category_encoded",
+]
+PRIORITY_MAP = {"Baixa": 0, "Média": 1, "Alta": 2}
+DEFAULT_DATA = "src/ia/tasks_dataset.csv"
+READ_CHUNK_ROWS = 1_000_000
+
+
+def build_category_encoder() -> LabelEncoder:
+    """Encoder ajustado sobre todas as categorias de TaskCategory."""
+    encoder = LabelEncoder()
+    encoder.fit([category.value for category in TaskCategory])
+    return encoder
+
+
+def _iter_frames(path: Path, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+
+
+def load_dataset(
+    paths: Iterable[Path], encoder: LabelEncoder, *, chunk_rows: int = READ_CHUNK_ROWS
+) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Lê um ou mais arquivos CSV/Parquet em blocos e devolve as features em
+    float32 e os rótulos em int8, sem manter as colunas de texto em memória.
+    """
+    features: List[np.ndarray] = []
+    labels: List[np.ndarray] = []
+    for path in paths:
+        for frame in _iter_frames(Path(path), chunk_rows):
+            block = np.empty((len(frame), len(FEATURE_COLUMNS)), dtype=np.float32)
+            block[:, 0] = frame["days_until_due"]
+            block[:, 1] = frame["estimated_minutes"]
+            block[:, 2] = frame["difficulty"]
+            block[:, 3] = encoder.transform(frame["category"])
+            features.append(block)
+
+            encoded = frame["priority_label"].map(PRIORITY_MAP)
+            if encoded.isna().any():
+                raise ValueError(f"Rótulo de prioridade desconhecido em {path}")
+            labels.append(encoded.to_numpy(dtype=np.int8))
+
+    X = pd.DataFrame(np.concatenate(features), columns=FEATURE_COLUMNS)
+    return X, np.concatenate(labels)
+
+
+def split(X: pd.DataFrame, y: np.ndarray, *, test_size: float, random_state: int):
+    return train_test_split(X, y, test_size=test_size, random_state=random_state)
+
+
+def train(
+    X: pd.DataFrame,
+    y: np.ndarray,
+    *,
+    model=None,
+    n_estimators: int = 100,
+    n_jobs: int = -1,
+    test_size: float = 0.2,
+    random_state: int = 42,
+) -> Tuple[Any, dict]:
+    """
+    Treina ``model`` (por padrão a floresta de ``n_estimators`` árvores)
+    usando ``n_jobs`` núcleos e mede a acurácia no conjunto de teste.
+    """
+    X_train, X_test, y_train, y_test = split(
+        X, y, test_size=test_size, random_state=random_state
+    )
+
+    if model is None:
+        model = RandomForestClassifier(
+            n_estimators=n_estimators, random_state=random_state
+        )
+    parallel = "n_jobs" in model.get_params()
+    if parallel:
+        model.set_params(n_jobs=n_jobs)
+    started = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - started
+
+    y_pred = model.predict(X_test)
+    # O modelo servido prediz uma requisição por vez; sem paralelismo interno.
+    if parallel:
+        model.set_params(n_jobs=None)
+    return model, {
+        "accuracy": round(float(accuracy_score(y_test, y_pred)), 4),
+        "train_rows": int(len(X_train)),
+        "fit_seconds": round(fit_seconds, 3),
+        "fit_rows_per_second": round(len(X_train) / fit_seconds, 1),
+        "classification_report": classification_report(
+            y_test,
+            y_pred,
+            labels=[0, 1, 2],
+            target_names=list(PRIORITY_MAP),
+            zero_division=0,
+        ),
+    }
+
+
+def _search(X: pd.DataFrame, y: np.ndarray, args) -> Tuple[Any, dict]:
+    X_train, X_test, y_train, y_test = split(
+        X, y, test_size=0.2, random_state=args.random_state
+    )
+    budget = model_selection.Budget(
+        max_single_p99_ms=args.max_p99_ms,
+        max_batch_p99_ms=args.max_batch_p99_ms,
+        max_size_mb=args.max_size_mb,
+        # --mmap exporta a floresta compilada: só florestas podem vencer.
+        require_compiled=args.mmap,
+    )
+    print("Buscando o melhor modelo dentro do orçamento...")
+    report = model_selection.search(
+        X_train,
+        y_train,
+        X_test,
+        y_test,
+        budget=budget,
+        workers=args.workers,
+        random_state=args.random_state,
+    )
+
+    print(
+        f"{'candidato':<58} {'acc':>6} {'p99 1 (ms)':>11} "
+        f"{'p99 lote (ms)':>14} {'MB':>8}"
+    )
+    for entry in report["candidates"]:
+        mark = "*" if entry["name"] == report["selected"] else " "
+        print(
+            f"{mark}{entry['name']:<57} {entry['accuracy']:>6.3f} "
+            f"{entry['single_p99_ms']:>11.3f} {entry['batch_p99_ms']:>14.3f} "
+            f"{entry['size_mb']:>8.2f}"
+        )
+
+    if report["selected"] is None:
+        raise SystemExit("Nenhum candidato cabe no orçamento de latência/memória")
+    candidate = model_selection.candidate_by_name(report, report["selected"])
+    return candidate.build(args.random_state), report
+
 
-le_category = LabelEncoder()
-df["category_encoded"] = le_category.fit_transform(df["category"])
+def main(argv=None) -> str:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--data",
+        type=Path,
+        nargs="+",
+        default=[Path(DEFAULT_DATA)],
+        help="Arquivos CSV ou Parquet com o dataset",
+    )
+    parser.add_argument("--n-estimators", type=int, default=100)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--chunk-rows", type=int, default=READ_CHUNK_ROWS)
+    parser.add_argument("--random-state", type=int, default=42)
+    parser.add_argument(
+        "--search",
+        action="store_true",
+        help="Escolhe o modelo por busca de hiperparâmetros dentro do orçamento",
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-p99-ms", type=float, default=None)
+    parser.add_argument("--max-batch-p99-ms", type=float, default=None)
+    parser.add_argument("--max-size-mb", type=float, default=None)
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="Também exporta a floresta em .npy para ser aberta com mmap",
+    )
+    parser.add_argument(
+        "--legacy",
+        action="store_true",
+        help="Também sobrescreve src/ia/kairos_model.pkl e category_encoder.pkl",
+    )
+    args = parser.parse_args(argv)
 
-priority_map = {"Baixa": 0, "Média": 1, "Alta": 2}
-df["priority_encoded"] = df["priority_label"].map(priority_map)
+    print("Carregando dataset...")
+    encoder = build_category_encoder()
+    started = time.perf_counter()
+    X, y = load_dataset(args.data, encoder, chunk_rows=args.chunk_rows)
+    load_seconds = time.perf_counter() - started
+    print(
+        f"{len(X):,} linhas em {load_seconds:.2f}s "
+        f"({len(X) / load_seconds:,.0f} linhas/s)"
+    )
 
-X = df[["days_until_due", "estimated_minutes", "difficulty", "category_encoded"]]
-y = df["priority_encoded"]
+    model = None
+    reports = {}
+    if args.search:
+        model, reports["selection_report.json"] = _search(X, y, args)
 
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
+    print("Treinando modelo...")
+    model, report = train(
+        X,
+        y,
+        model=model,
+        n_estimators=args.n_estimators,
+        n_jobs=args.n_jobs,
+        random_state=args.random_state,
+    )
+    print(f"\n--- Resultado Final ---")
+    print(f"Acurácia: {report['accuracy']:.2f}")
+    print(
+        f"Treino: {report['train_rows']:,} linhas em {report['fit_seconds']:.2f}s "
+        f"({report['fit_rows_per_second']:,.0f} linhas/s)"
+    )
+    print(report.pop("classification_report"))
 
-print("Treinando modelo...")
-model = RandomForestClassifier(n_estimators=100, random_state=42)
-model.fit(X_train, y_train)
+    if args.legacy:
+        joblib.dump(model, config.IA_DIR / MODEL_FILENAME)
+        joblib.dump(encoder, config.IA_DIR / ENCODER_FILENAME)
+    version = registry.publish(
+        model,
+        encoder,
+        metadata={**report, "model": repr(model), "rows": int(len(X))},
+        reports=reports,
+        arrays=args.mmap,
+    )
+    print(f"Modelo salvo! 🧠 (versão {version})")
+    return version
 
-y_pred = model.predict(X_test)
-accuracy = accuracy_score(y_test, y_pred)
-print(f"\n--- Resultado Final ---")
-print(f"Acurácia: {accuracy:.2f}")
-print(classification_report(y_test, y_pred, target_names=["Baixa", "Média", "Alta"]))
 
-joblib.dump(model, "src/ia/kairos_model.pkl")
-joblib.dump(le_category, "src/ia/category_encoder.pkl")
-print("Modelo de apresentação salvo! 🧠")
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,55 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import exc as sa_exc
 
 from src.api.task_router import router as task_router
-from src.api import auth_router
-from src.core.database import init_db
+from src.api import admin_router, auth_router
+from src.core import config
+from src.core.database import AsyncSessionLocal, async_engine, init_db
 from src.models import database  
+from src.services import auth_service, model_registry
+from src.services.password_hasher import PasswordHasherBusy
+from src.services.token_store import revocations
+
+logger = logging.getLogger(__name__)
+
+
+async def _sync_revocations() -> None:
+    """
+    Relê do banco, a cada ``KAIROS_REVOCATION_SYNC_SECONDS``, as revogações
+    de tokens gravadas por qualquer worker.
+    """
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                revocations.merge(
+                    *await auth_service.load_revocations_async(
+                        db, token_lifetime_seconds=revocations.token_lifetime_seconds
+                    )
+                )
+        except Exception:
+            logger.exception("Não foi possível sincronizar as revogações de tokens")
+        await asyncio.sleep(config.REVOCATION_SYNC_SECONDS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    sync_task = asyncio.create_task(_sync_revocations())
+    yield
+    sync_task.cancel()
+    try:
+        await sync_task
+    except asyncio.CancelledError:
+        pass
+    # As conexões do aiosqlite têm threads próprias que seguram o processo
+    # aberto até o pool ser fechado.
+    await async_engine.dispose()
 
 
 def create_app() -> FastAPI:
@@ -13,12 +57,36 @@ def create_app() -> FastAPI:
         title="Kairos API",
         version="0.1.0",
         description="Core endpoints for tasks and schedule optimization.",
+        lifespan=lifespan,
     )
     
     init_db()
+    model_registry.registry.load_active()
+    model_registry.install_reload_signal()
     
     app.include_router(task_router)
     app.include_router(auth_router.router)
+    app.include_router(admin_router.router)
+
+    @app.exception_handler(sa_exc.TimeoutError)
+    def pool_timeout_handler(request: Request, exc: sa_exc.TimeoutError) -> JSONResponse:
+        """Pool de conexões esgotado: 503 para o cliente tentar de novo."""
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "Database is busy, try again shortly"},
+            headers={"Retry-After": "1"},
+        )
+
+    @app.exception_handler(PasswordHasherBusy)
+    def password_hasher_busy_handler(
+        request: Request, exc: PasswordHasherBusy
+    ) -> JSONResponse:
+        """Fila do bcrypt cheia: recusa na hora em vez de enfileirar mais logins."""
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "Too many login attempts in progress, try again shortly"},
+            headers={"Retry-After": "1"},
+        )
 
     @app.get("/", tags=["health"])
     def root() -> dict[str, str]:
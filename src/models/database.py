@@ -6,6 +6,7 @@ from sqlalchemy import (
     Enum as SQLEnum,
     Text,
     ForeignKey,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -24,8 +25,14 @@ class User(Base):
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Tokens emitidos até este instante não valem mais (revogação de todos os
+    # tokens do usuário); cada worker relê o valor de tempos em tempos.
+    tokens_valid_after = Column(DateTime, nullable=True, index=True)
 
     tasks = relationship("Task", back_populates="owner", cascade="all, delete-orphan")
+    refresh_tokens = relationship(
+        "RefreshToken", back_populates="user", cascade="all, delete-orphan"
+    )
 
 
 class Task(Base):
@@ -60,4 +67,58 @@ class Task(Base):
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
 
+    # Último score da IA, usado para reotimizar só o que mudou.
+    ai_score = Column(Integer, nullable=True)
+    ai_scored_at = Column(DateTime, nullable=True)
+    ai_model_version = Column(String, nullable=True)
+
     owner = relationship("User", back_populates="tasks")
+
+    # Índices da listagem paginada por (due_date, id), com e sem filtros.
+    __table_args__ = (
+        Index("ix_tasks_owner_due_id", "owner_id", "due_date", "id"),
+        Index("ix_tasks_owner_status_due_id", "owner_id", "status", "due_date", "id"),
+        Index(
+            "ix_tasks_owner_category_due_id", "owner_id", "category", "due_date", "id"
+        ),
+        # Cobre o count/max(updated_at) do ETag das listagens.
+        Index("ix_tasks_owner_updated", "owner_id", "updated_at"),
+    )
+
+
+class RefreshToken(Base):
+    """
+    Refresh token de longa duração. Só o sha256 do token é guardado; cada uso
+    revoga a linha e emite outra da mesma família (rotação).
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    token_hash = Column(String(64), nullable=False, unique=True, index=True)
+    # Todos os tokens de uma mesma sessão; reusar um token já trocado revoga
+    # a família inteira.
+    family_id = Column(String, nullable=False, index=True)
+    user_id = Column(
+        String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    user = relationship("User", back_populates="refresh_tokens")
+
+
+class RevokedToken(Base):
+    """
+    Access token encerrado no logout, pelo ``jti``. A linha só é útil até o
+    token expirar; as vencidas são apagadas nos logouts seguintes.
+    """
+
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String, primary_key=True)
+    user_id = Column(
+        String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    expires_at = Column(DateTime, nullable=False, index=True)
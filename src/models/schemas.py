@@ -1,9 +1,17 @@
 from __future__ import annotations
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, time, timedelta, timezone
 from enum import Enum
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID, uuid4
-from pydantic import BaseModel, Field, EmailStr, field_validator, ConfigDict
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from pydantic import (
+    BaseModel,
+    Field,
+    EmailStr,
+    field_validator,
+    model_validator,
+    ConfigDict,
+)
 
 
 class UserCreate(BaseModel):
@@ -20,10 +28,20 @@ class UserPublic(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: str | None = None
+    expires_in: int | None = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str = Field(..., min_length=1, max_length=256)
 
 
 class TokenData(BaseModel):
     email: str | None = None
+    user_id: str | None = None
+    jti: str | None = None
+    issued_at: float | None = None
+    expires_at: float | None = None
 
 
 class TaskPriority(str, Enum):
@@ -77,18 +95,67 @@ class TaskBase(BaseModel):
     @classmethod
     def validate_due_date(cls, value: Optional[datetime]) -> Optional[datetime]:
         """Evita datas muito antigas."""
-        if value is not None:
-            if value.tzinfo is None:
-                value = value.replace(tzinfo=timezone.utc)
-            if value < datetime.now(timezone.utc) - timedelta(days=1):
-                raise ValueError("due_date cannot be in the distant past")
-        return value
+        return _check_due_date(value)
+
+
+def _check_due_date(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None:
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        if value < datetime.now(timezone.utc) - timedelta(days=1):
+            raise ValueError("due_date cannot be in the distant past")
+    return value
 
 
 class TaskCreate(TaskBase):
     pass
 
 
+class TaskUpdate(BaseModel):
+    """Alteração parcial: só os campos enviados são gravados."""
+
+    title: Optional[str] = Field(None, min_length=3, max_length=120)
+    description: Optional[str] = Field(None, max_length=1024)
+    due_date: Optional[datetime] = None
+    category: Optional[TaskCategory] = None
+    difficulty: Optional[int] = Field(None, ge=1, le=5)
+    estimated_minutes: Optional[int] = Field(None, ge=1)
+    priority: Optional[TaskPriority] = None
+    status: Optional[TaskStatus] = None
+
+    @field_validator("due_date")
+    @classmethod
+    def validate_due_date(cls, value: Optional[datetime]) -> Optional[datetime]:
+        return _check_due_date(value)
+
+    @model_validator(mode="after")
+    def validate_not_empty(self) -> "TaskUpdate":
+        if not self.model_fields_set:
+            raise ValueError("at least one field must be changed")
+        nullable = {"description", "due_date"}
+        for name in self.model_fields_set - nullable:
+            if getattr(self, name) is None:
+                raise ValueError(f"{name} cannot be null")
+        return self
+
+
+class TaskFilter(BaseModel):
+    """Seleção de tarefas por critérios; todos precisam ser atendidos."""
+
+    status: Optional[List[TaskStatus]] = None
+    category: Optional[List[TaskCategory]] = None
+    priority: Optional[List[TaskPriority]] = None
+    due_from: Optional[datetime] = None
+    due_to: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def validate_not_empty(self) -> "TaskFilter":
+        if not any(getattr(self, name) for name in type(self).model_fields):
+            raise ValueError("filter must set at least one criterion")
+        return self
+
+
 class TaskPublic(TaskBase):
     """Schema returned by the API and persisted in the task service."""
 
@@ -103,14 +170,108 @@ class TaskPublic(TaskBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ScheduledTask(TaskPublic):
+    """Tarefa retornada por /optimize-schedule, com o horário no modo slots."""
+
+    scheduled_start: Optional[datetime] = None
+    scheduled_end: Optional[datetime] = None
+    deadline_met: Optional[bool] = Field(
+        default=None, description="False quando o horário termina após o prazo"
+    )
+
+
+class TaskBulkError(BaseModel):
+    """Item rejeitado de uma criação em lote, pela posição no pedido."""
+
+    index: int
+    errors: List[Dict[str, Any]]
+
+
+class TaskBulkResult(BaseModel):
+    created: List[TaskPublic]
+    errors: List[TaskBulkError]
+
+
+class TaskImportError(BaseModel):
+    """Registro rejeitado de uma importação, pela linha onde começa."""
+
+    line: int
+    errors: List[Dict[str, Any]]
+
+
+class TaskImportResult(BaseModel):
+    records: int = 0
+    created: int = 0
+    failed: int = 0
+    errors: List[TaskImportError] = Field(default_factory=list)
+    errors_truncated: bool = False
+
+
+class TaskBulkDeleteResult(BaseModel):
+    deleted: int
+    ids: List[UUID]
+
+
+class WorkingHoursConfig(BaseModel):
+    start: time = Field(default=time(9, 0), description="Início do expediente")
+    end: time = Field(default=time(18, 0), description="Fim do expediente")
+    weekdays: List[int] = Field(
+        default_factory=lambda: [0, 1, 2, 3, 4],
+        description="Dias úteis, 0 = segunda-feira",
+    )
+    timezone: Optional[str] = Field(
+        default=None,
+        description="Fuso IANA do expediente (ex.: America/Sao_Paulo); "
+        "sem ele, vale o fuso de start (UTC por padrão)",
+    )
+
+    @field_validator("weekdays")
+    @classmethod
+    def validate_weekdays(cls, value: List[int]) -> List[int]:
+        if not value or any(day < 0 or day > 6 for day in value):
+            raise ValueError("weekdays must contain values between 0 and 6")
+        return value
+
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None:
+            try:
+                ZoneInfo(value)
+            except (ValueError, ZoneInfoNotFoundError):
+                raise ValueError("timezone must be an IANA time zone name")
+        return value
+
+    def tzinfo(self) -> Optional[ZoneInfo]:
+        return ZoneInfo(self.timezone) if self.timezone else None
+
+    @field_validator("end")
+    @classmethod
+    def validate_end(cls, value: time, info) -> time:
+        start = info.data.get("start")
+        if start is not None and value <= start:
+            raise ValueError("end must be after start")
+        return value
+
+
 __all__ = [
     "UserCreate",
     "UserPublic",
     "Token",
+    "RefreshRequest",
     "TokenData",
     "TaskPriority",
     "TaskStatus",
     "TaskCategory",
     "TaskCreate",
+    "TaskUpdate",
+    "TaskFilter",
     "TaskPublic",
+    "ScheduledTask",
+    "TaskBulkError",
+    "TaskBulkResult",
+    "TaskBulkDeleteResult",
+    "TaskImportError",
+    "TaskImportResult",
+    "WorkingHoursConfig",
 ]
@@ -1,8 +1,21 @@
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..models import schemas
-from ..models.database import User
-from ..core import security
+from ..models.database import RefreshToken, RevokedToken, User
+from ..core import config, security
+from .password_hasher import PasswordHasher
+
+password_hasher = PasswordHasher(
+    max_workers=config.PASSWORD_HASH_WORKERS,
+    max_queue=config.PASSWORD_HASH_MAX_QUEUE,
+)
 
 
 def _normalize_email(email: str) -> str:
@@ -10,54 +23,266 @@ def _normalize_email(email: str) -> str:
     return email.lower().strip()
 
 
-def get_user_by_email(db: Session, email: str) -> User | None:
+async def get_user_by_email_async(db: AsyncSession, email: str) -> User | None:
     """Busca um usuário no banco pelo email."""
     normalized_email = _normalize_email(email)
-    return db.query(User).filter(User.email == normalized_email).first()
+    return await db.scalar(select(User).where(User.email == normalized_email).limit(1))
+
+
+# Hash conferido quando o email não existe, para a resposta levar o mesmo
+# tempo de uma senha errada.
+DUMMY_HASH = "$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWrn3ILAWO.PzH12n.M9/1CV.b6M.u"
+
+
+def _invalid_credentials() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Email ou senha incorretos",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
 
 
-def register_user(user: schemas.UserCreate, db: Session) -> schemas.UserPublic:
+# O bcrypt é de CPU e leva centenas de milissegundos: roda no
+# password_hasher, com fila limitada, para não travar o loop nem disputar o
+# threadpool com as outras rotas.
+
+
+async def register_user_async(
+    user: schemas.UserCreate, db: AsyncSession
+) -> schemas.UserPublic:
     """Registra um novo usuário com senha hash."""
     normalized_email = _normalize_email(user.email)
 
-    existing_user = get_user_by_email(db, normalized_email)
-    if existing_user:
+    if await get_user_by_email_async(db, normalized_email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email já registrado."
         )
 
-    hashed_password = security.get_password_hash(user.password)
+    hashed_password = await password_hasher.hash(user.password)
 
     db_user = User(email=normalized_email, hashed_password=hashed_password)
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
 
     return schemas.UserPublic(id=db_user.id, email=db_user.email)
 
 
-def login_user(form_data: schemas.UserCreate, db: Session) -> schemas.Token:
+async def login_user_async(
+    form_data: schemas.UserCreate, db: AsyncSession
+) -> schemas.Token:
     """Autentica o usuário e retorna o token JWT."""
-    normalized_email = _normalize_email(form_data.email)
-    user_in_db = get_user_by_email(db, normalized_email)
+    user_in_db = await get_user_by_email_async(db, form_data.email)
+    hashed_password_to_check = user_in_db.hashed_password if user_in_db else DUMMY_HASH
 
-    dummy_hash = "$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWrn3ILAWO.PzH12n.M9/1CV.b6M.u"
+    if not await password_hasher.verify(form_data.password, hashed_password_to_check):
+        raise _invalid_credentials()
 
-    hashed_password_to_check = user_in_db.hashed_password if user_in_db else dummy_hash
+    if not user_in_db:
+        raise _invalid_credentials()
 
-    if not security.verify_password(form_data.password, hashed_password_to_check):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Email ou senha incorretos",
-            headers={"WWW-Authenticate": "Bearer"},
+    return await _issue_tokens(
+        db, user_id=user_in_db.id, email=user_in_db.email, family_id=str(uuid.uuid4())
+    )
+
+
+# Refresh tokens: segredos aleatórios guardados só como sha256. Validar um é
+# uma busca pelo hash no índice, sem bcrypt; a sessão do Streamlit renova o
+# access token por aqui em vez de refazer o login.
+
+
+def _hash_refresh_token(refresh_token: str) -> str:
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+
+def _invalid_refresh_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Refresh token inválido ou expirado",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def _issue_tokens(
+    db: AsyncSession, *, user_id: str, email: str, family_id: str
+) -> schemas.Token:
+    """Emite um access token e um refresh token novo da família ``family_id``."""
+    now = datetime.utcnow()
+    refresh_token = secrets.token_urlsafe(32)
+    # Aproveita para limpar os refresh tokens vencidos do usuário.
+    await db.execute(
+        delete(RefreshToken).where(
+            RefreshToken.user_id == user_id, RefreshToken.expires_at < now
+        )
+    )
+    db.add(
+        RefreshToken(
+            token_hash=_hash_refresh_token(refresh_token),
+            family_id=family_id,
+            user_id=user_id,
+            expires_at=now + timedelta(days=config.REFRESH_TOKEN_EXPIRE_DAYS),
         )
+    )
+    await db.commit()
 
-    if not user_in_db:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Email ou senha incorretos",
-            headers={"WWW-Authenticate": "Bearer"},
+    access_token = security.create_access_token(data={"sub": email, "uid": user_id})
+    return schemas.Token(
+        access_token=access_token,
+        token_type="bearer",
+        refresh_token=refresh_token,
+        expires_in=security.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    )
+
+
+async def refresh_tokens_async(refresh_token: str, db: AsyncSession) -> schemas.Token:
+    """
+    Troca um refresh token válido por um novo par de tokens (rotação).
+
+    A troca é um UPDATE condicional: de duas requisições com o mesmo token,
+    só uma consegue revogá-lo. Apresentar um token já trocado indica que ele
+    vazou, então a família inteira é revogada e a sessão exige novo login.
+    """
+    token_hash = _hash_refresh_token(refresh_token)
+    now = datetime.utcnow()
+    rotated = (
+        await db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now,
+            )
+            .values(revoked_at=now)
+            .returning(RefreshToken.user_id, RefreshToken.family_id)
+            .execution_options(synchronize_session=False)
         )
+    ).one_or_none()
+
+    if rotated is None:
+        reused_family = await db.scalar(
+            select(RefreshToken.family_id).where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.revoked_at.is_not(None),
+            )
+        )
+        if reused_family is not None:
+            await revoke_refresh_tokens_async(db, family_id=reused_family)
+        raise _invalid_refresh_token()
+
+    email = await db.scalar(select(User.email).where(User.id == rotated.user_id))
+    if email is None:
+        await db.rollback()
+        raise _invalid_refresh_token()
+    return await _issue_tokens(
+        db, user_id=rotated.user_id, email=email, family_id=rotated.family_id
+    )
+
+
+async def revoke_refresh_tokens_async(
+    db: AsyncSession,
+    *,
+    refresh_token: Optional[str] = None,
+    family_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+) -> None:
+    """
+    Revoga a família do ``refresh_token`` (só se for do ``user_id``, quando
+    informado), a família ``family_id`` ou todos os refresh tokens do
+    usuário ``user_id``.
+    """
+    if refresh_token is not None:
+        stmt = select(RefreshToken.family_id).where(
+            RefreshToken.token_hash == _hash_refresh_token(refresh_token)
+        )
+        if user_id is not None:
+            stmt = stmt.where(RefreshToken.user_id == user_id)
+        family_id = await db.scalar(stmt)
+        if family_id is None:
+            return
+    if family_id is not None:
+        condition = RefreshToken.family_id == family_id
+    elif user_id is not None:
+        condition = RefreshToken.user_id == user_id
+    else:
+        return
+    await db.execute(
+        update(RefreshToken)
+        .where(condition, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+def _to_db_time(timestamp: float) -> datetime:
+    """Epoch (como nos claims do JWT) para o datetime UTC ingênuo do banco."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
 
-    access_token = security.create_access_token(data={"sub": user_in_db.email})
-    return schemas.Token(access_token=access_token, token_type="bearer")
+
+def _to_timestamp(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+async def revoke_access_token_async(
+    db: AsyncSession, token_data: schemas.TokenData
+) -> None:
+    """
+    Grava o ``jti`` do access token encerrado no logout, para os outros
+    workers também o recusarem, e apaga as revogações de tokens já vencidos.
+    """
+    if not token_data.jti or not token_data.expires_at:
+        return
+    await db.execute(
+        delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow())
+    )
+    await db.merge(
+        RevokedToken(
+            jti=token_data.jti,
+            user_id=token_data.user_id,
+            expires_at=_to_db_time(token_data.expires_at),
+        )
+    )
+    await db.commit()
+
+
+async def revoke_user_tokens_async(db: AsyncSession, user_id: str) -> float:
+    """
+    Invalida todos os tokens já emitidos para o usuário: grava o instante em
+    ``tokens_valid_after`` e revoga os refresh tokens. Devolve o instante
+    (epoch) para o worker atual aplicar a revogação na hora.
+    """
+    revoked_at = datetime.utcnow()
+    await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(tokens_valid_after=revoked_at)
+        .execution_options(synchronize_session=False)
+    )
+    await revoke_refresh_tokens_async(db, user_id=user_id)
+    await db.commit()
+    return _to_timestamp(revoked_at)
+
+
+async def load_revocations_async(
+    db: AsyncSession, *, token_lifetime_seconds: float
+) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """
+    Lê as revogações que ainda podem afetar algum token válido: ``jti`` dos
+    logouts (com a expiração) e o ``tokens_valid_after`` dos usuários, em
+    epoch, no formato de ``RevocationList.merge``.
+    """
+    now = datetime.utcnow()
+    tokens = await db.execute(
+        select(RevokedToken.jti, RevokedToken.expires_at).where(
+            RevokedToken.expires_at > now
+        )
+    )
+    users = await db.execute(
+        select(User.id, User.tokens_valid_after).where(
+            User.tokens_valid_after
+            > now - timedelta(seconds=token_lifetime_seconds)
+        )
+    )
+    return (
+        {jti: _to_timestamp(expires_at) for jti, expires_at in tokens},
+        {user_id: _to_timestamp(revoked_at) for user_id, revoked_at in users},
+    )
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# Arrays por nó: podem ser grandes e são abertos com mmap.
+NODE_ARRAYS = ("feature", "threshold", "left", "right", "values")
+
+
+class CompiledForest:
+    """
+    Floresta de decisão exportada para arrays planos do NumPy.
+
+    Todos os nós de todas as árvores ficam concatenados em ``feature``,
+    ``threshold``, ``left`` e ``right``; ``roots`` guarda o índice da raiz de
+    cada árvore e as folhas apontam para si mesmas. A avaliação desce todas
+    as árvores para todas as linhas ao mesmo tempo, um nível por passo.
+    ``values`` guarda a distribuição de classes normalizada de cada nó.
+    A predição é idêntica à de ``model.predict`` do sklearn.
+    """
+
+    def __init__(
+        self,
+        *,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        values: np.ndarray,
+        roots: np.ndarray,
+        classes: np.ndarray,
+    ) -> None:
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.values = values
+        self.roots = roots
+        self.classes = classes
+        self._is_leaf = left == np.arange(len(left))
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @classmethod
+    def from_sklearn(cls, model: Any) -> "CompiledForest":
+        """
+        Exporta um RandomForestClassifier/ExtraTreesClassifier treinado.
+        Lança ValueError para modelos que não são florestas de classificação.
+        """
+        estimators = getattr(model, "estimators_", None)
+        classes = getattr(model, "classes_", None)
+        if not estimators or classes is None or getattr(model, "n_outputs_", 1) != 1:
+            raise ValueError("Modelo não é uma floresta de classificação suportada")
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        for estimator in estimators:
+            tree = getattr(estimator, "tree_", None)
+            if tree is None:
+                raise ValueError("Estimador sem árvore de decisão")
+
+            node_ids = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+
+            node_values = tree.value[:, 0, :].astype(np.float64)
+            totals = node_values.sum(axis=1, keepdims=True)
+            # Sem ``out`` as posições fora do ``where`` ficariam com lixo da
+            # memória; nós com total 0 precisam valer 0.
+            values.append(
+                np.divide(
+                    node_values,
+                    totals,
+                    out=np.zeros_like(node_values, dtype=np.float64),
+                    where=totals > 0,
+                )
+            )
+
+            roots.append(offset)
+            offset += tree.node_count
+
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.int32),
+            right=np.concatenate(rights).astype(np.int32),
+            values=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.int32),
+            classes=np.asarray(classes),
+        )
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            "feature": self.feature,
+            "threshold": self.threshold,
+            "left": self.left,
+            "right": self.right,
+            "values": self.values,
+            "roots": self.roots,
+            "classes": self.classes,
+        }
+
+    def save(self, directory: Path) -> Dict[str, Dict[str, Any]]:
+        """
+        Grava cada array num ``<nome>.npy`` em ``directory`` e devolve
+        dtype e shape de cada um, para o manifesto.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        layout = {}
+        for name, array in self.to_arrays().items():
+            array = np.ascontiguousarray(array)
+            np.save(directory / f"{name}.npy", array, allow_pickle=False)
+            layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape)}
+        return layout
+
+    @classmethod
+    def load(
+        cls, directory: Path, *, mmap_mode: Optional[str] = "r"
+    ) -> "CompiledForest":
+        """
+        Abre os arrays gravados por ``save``. Com ``mmap_mode="r"`` os nós
+        não são copiados para a memória do processo: todos os workers que
+        abrem os mesmos arquivos compartilham as páginas do cache do SO.
+        """
+        directory = Path(directory)
+        arrays = {
+            name: np.load(
+                directory / f"{name}.npy",
+                mmap_mode=mmap_mode if name in NODE_ARRAYS else None,
+                allow_pickle=False,
+            )
+            for name in (*NODE_ARRAYS, "roots", "classes")
+        }
+        return cls(**arrays)
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """Retorna o índice da folha alcançada em cada árvore, (n, n_trees)."""
+        # Mesmo critério do sklearn: a feature é comparada em float32.
+        X = np.asarray(X, dtype=np.float32)
+        n_rows, n_columns = X.shape
+        flat_x = X.ravel()
+        nodes = np.tile(self.roots, n_rows)
+        row_offsets = np.repeat(np.arange(n_rows) * n_columns, self.n_trees)
+
+        # Só os pares (linha, árvore) que ainda não chegaram numa folha
+        # continuam sendo avaliados a cada nível.
+        active = np.flatnonzero(~self._is_leaf[nodes])
+        while active.size:
+            current = nodes[active]
+            go_left = (
+                flat_x[row_offsets[active] + self.feature[current]]
+                <= self.threshold[current]
+            )
+            following = np.where(go_left, self.left[current], self.right[current])
+            nodes[active] = following
+            active = active[~self._is_leaf[following]]
+        return nodes.reshape(n_rows, self.n_trees)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        leaves = self.apply(X)
+        return self.values[leaves].sum(axis=1) / self.n_trees
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        if len(X) == 0:
+            return self.classes[:0]
+        return self.classes[np.argmax(self.predict_proba(X), axis=1)]
+
+
+__all__ = ["CompiledForest"]
@@ -1,85 +1,252 @@
-import joblib
-import pandas as pd
-import os
+import numpy as np
 from datetime import datetime, timezone
-from typing import Iterable, List
+from typing import Dict, Iterable, List, Optional, Sequence
+from sqlalchemy import Row, case, literal, select, update
 from sqlalchemy.orm import Session
 from src.models.schemas import TaskPublic, TaskPriority
 from src.models.database import Task
+from src.core import config
+from src.services.inference_batcher import InferenceBatcher
+from src.services.model_registry import ModelBundle, registry
 
-MODEL_PATH = "src/ia/kairos_model.pkl"
-ENCODER_PATH = "src/ia/category_encoder.pkl"
+FEATURE_COLUMNS = [
+    "days_until_due",
+    "estimated_minutes",
+    "difficulty",
+    "category_encoded",
+]
 
-_model = None
-_encoder = None
+batcher = InferenceBatcher(
+    max_batch_rows=config.INFERENCE_BATCH_MAX_ROWS,
+    max_wait_ms=config.INFERENCE_BATCH_MAX_WAIT_MS,
+)
 
 
-def _load_ai_assets():
-    global _model, _encoder
-    if _model is None:
-        if os.path.exists(MODEL_PATH) and os.path.exists(ENCODER_PATH):
-            try:
-                _model = joblib.load(MODEL_PATH)
-                _encoder = joblib.load(ENCODER_PATH)
-            except:
-                pass
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
 
 
-def _predict_priority_score(task: TaskPublic) -> int:
-    _load_ai_assets()
-    if _model is None or _encoder is None:
-        return 1
+def _days_until_due(due_date: Optional[datetime], now: datetime) -> int:
+    if not due_date:
+        return 30
+    delta = _as_utc(due_date) - _as_utc(now)
+    return max(0, delta.days)
+
+
+def predict_priority_scores(
+    tasks: Sequence[TaskPublic],
+    *,
+    now: Optional[datetime] = None,
+    bundle: Optional[ModelBundle] = None,
+) -> List[int]:
+    """
+    Calcula o score de prioridade de uma lista de tarefas em lote.
+
+    Monta uma única matriz de features, codifica as categorias de uma vez
+    e chama o modelo uma só vez. Linhas que falham recebem score 1.
+    """
+    scores = [1] * len(tasks)
+    bundle = bundle or registry.active
+    if bundle is None or not tasks:
+        return scores
+
+    now = now or datetime.now(timezone.utc)
+    category_codes = bundle.category_codes
+
+    features = np.empty((len(tasks), len(FEATURE_COLUMNS)), dtype=np.float64)
+    valid_indexes = []
+    for index, task in enumerate(tasks):
+        try:
+            features[len(valid_indexes)] = (
+                _days_until_due(task.due_date, now),
+                task.estimated_minutes,
+                task.difficulty,
+                category_codes[task.category.value],
+            )
+        except Exception:
+            continue
+        valid_indexes.append(index)
+
+    if not valid_indexes:
+        return scores
 
     try:
-        days_until = 30
-        if task.due_date:
-            if task.due_date.tzinfo:
-                now = datetime.now(timezone.utc)
-            else:
-                now = datetime.utcnow()
-            delta = task.due_date - now
-            days_until = max(0, delta.days)
-
-        cat_encoded = _encoder.transform([task.category.value])[0]
-
-        features = pd.DataFrame(
-            [
-                {
-                    "days_until_due": days_until,
-                    "estimated_minutes": task.estimated_minutes,
-                    "difficulty": task.difficulty,
-                    "category_encoded": cat_encoded,
-                }
-            ]
+        matrix = features[: len(valid_indexes)]
+        if config.INFERENCE_BATCHING:
+            predictions = batcher.predict(bundle, matrix)
+        else:
+            predictions = bundle.predict(matrix)
+    except Exception:
+        return scores
+
+    for index, prediction in zip(valid_indexes, predictions):
+        scores[index] = int(prediction)
+    return scores
+
+
+def score_to_priority(ai_score: int) -> TaskPriority:
+    if ai_score == 2:
+        return TaskPriority.high
+    if ai_score == 0:
+        return TaskPriority.low
+    return TaskPriority.medium
+
+
+def _load_score_state(
+    db: Session, task_ids: List[str], owner_id: Optional[str]
+) -> Dict[str, Row]:
+    """Lê prioridade e score salvo das tarefas numa única consulta."""
+    stmt = select(
+        Task.id,
+        Task.priority,
+        Task.updated_at,
+        Task.ai_score,
+        Task.ai_scored_at,
+        Task.ai_model_version,
+    )
+    if owner_id is not None:
+        stmt = stmt.where(Task.owner_id == owner_id)
+    else:
+        stmt = stmt.where(Task.id.in_(task_ids))
+    return {row.id: row for row in db.execute(stmt)}
+
+
+def needs_rescore(
+    task: TaskPublic, state: Optional[Row], version: str, now: datetime
+) -> bool:
+    """
+    Uma tarefa só é reavaliada se é nova, mudou desde o último score, foi
+    avaliada por outra versão do modelo ou teve ``days_until_due`` alterado.
+    """
+    if state is None or state.ai_score is None or state.ai_scored_at is None:
+        return True
+    if state.ai_model_version != version:
+        return True
+    if _as_utc(state.updated_at) > _as_utc(state.ai_scored_at):
+        return True
+    return _days_until_due(task.due_date, now) != _days_until_due(
+        task.due_date, state.ai_scored_at
+    )
+
+
+def write_back_scores(
+    db: Session,
+    *,
+    priorities: Dict[str, TaskPriority],
+    scores: Dict[str, int],
+    version: Optional[str],
+    now: datetime,
+    owner_id: Optional[str],
+) -> None:
+    """
+    Persiste prioridades e scores com um único UPDATE ... CASE.
+
+    ``updated_at`` recebe o mesmo instante de ``ai_scored_at`` quando a
+    prioridade muda e fica intacto no resto, para que a gravação do próprio
+    score não marque a tarefa como alterada depois de avaliada.
+    """
+    task_ids = set(priorities) | set(scores)
+    if not task_ids:
+        return
+
+    values = {}
+    if priorities:
+        values["priority"] = case(
+            {
+                task_id: literal(priority, Task.priority.type)
+                for task_id, priority in priorities.items()
+            },
+            value=Task.id,
+            else_=Task.priority,
+        )
+        values["updated_at"] = case(
+            (Task.id.in_(list(priorities)), now), else_=Task.updated_at
+        )
+    else:
+        values["updated_at"] = Task.updated_at
+    if scores and version is not None:
+        scored_ids = list(scores)
+        values["ai_score"] = case(scores, value=Task.id, else_=Task.ai_score)
+        values["ai_scored_at"] = case(
+            (Task.id.in_(scored_ids), now), else_=Task.ai_scored_at
+        )
+        values["ai_model_version"] = case(
+            (Task.id.in_(scored_ids), version), else_=Task.ai_model_version
         )
 
-        prediction = _model.predict(features)[0]
-        return int(prediction)
-    except:
-        return 1
+    stmt = (
+        update(Task)
+        .where(Task.id.in_(list(task_ids)))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if owner_id is not None:
+        stmt = stmt.where(Task.owner_id == owner_id)
+    db.execute(stmt)
 
 
-def optimize_schedule(tasks: Iterable[TaskPublic], db: Session) -> List[TaskPublic]:
-    tasks_with_scores = []
+def optimize_schedule(
+    tasks: Iterable[TaskPublic],
+    db: Session,
+    *,
+    owner_id: Optional[str] = None,
+    reuse_scores: bool = True,
+) -> List[TaskPublic]:
+    """
+    Reavalia as tarefas com o modelo e devolve a agenda ordenada.
 
-    for task_schema in tasks:
-        ai_score = _predict_priority_score(task_schema)
+    Com ``reuse_scores`` o score salvo de cada tarefa é reaproveitado quando
+    ainda é válido (ver ``needs_rescore``); use ``False`` quando as tarefas
+    não vêm do banco e seus campos podem divergir do que está salvo. Nesse
+    caso os scores calculados não são gravados: vieram de campos que o banco
+    não tem e não valem como score salvo das tarefas.
+    """
+    tasks = list(tasks)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    bundle = registry.active
+    version = bundle.version if bundle else None
+    states = _load_score_state(db, [str(task.id) for task in tasks], owner_id)
 
-        new_priority = TaskPriority.medium
-        if ai_score == 2:
-            new_priority = TaskPriority.high
-        elif ai_score == 0:
-            new_priority = TaskPriority.low
+    stale = [
+        task
+        for task in tasks
+        if not reuse_scores
+        or version is None
+        or needs_rescore(task, states.get(str(task.id)), version, now)
+    ]
+    new_scores = {
+        str(task.id): score
+        for task, score in zip(
+            stale, predict_priority_scores(stale, now=now, bundle=bundle)
+        )
+    }
 
-        task_schema.priority = new_priority
+    tasks_with_scores = []
+    priorities: Dict[str, TaskPriority] = {}
+    for task_schema in tasks:
+        task_id = str(task_schema.id)
+        state = states.get(task_id)
+        ai_score = new_scores[task_id] if task_id in new_scores else state.ai_score
+        new_priority = score_to_priority(ai_score)
 
-        db_task = db.query(Task).filter(Task.id == str(task_schema.id)).first()
-        if db_task:
-            db_task.priority = new_priority
-            db.add(db_task)
+        current_priority = state.priority if state else task_schema.priority
+        if current_priority != new_priority:
+            priorities[task_id] = new_priority
 
+        # Cópia: as tarefas recebidas continuam intactas para o chamador.
+        task_schema = task_schema.model_copy(update={"priority": new_priority})
         tasks_with_scores.append((task_schema, ai_score))
 
+    write_back_scores(
+        db,
+        priorities=priorities,
+        scores=new_scores if reuse_scores else {},
+        version=version,
+        now=now,
+        owner_id=owner_id,
+    )
     db.commit()
 
     ordered = sorted(
@@ -91,4 +258,4 @@ def optimize_schedule(tasks: Iterable[TaskPublic], db: Session) -> List[TaskPubl
         ),
     )
 
-    return [t[0].model_copy() for t in ordered]
+    return [t[0] for t in ordered]
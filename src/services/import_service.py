@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from src.models.schemas import TaskCreate, TaskImportError, TaskImportResult
+from src.services import task_service
+
+IMPORT_CHUNK_ROWS = 500
+MAX_REPORTED_ERRORS = 1000
+# Limite de uma linha (ou de um registro CSV com quebras de linha): folga
+# larga sobre a maior tarefa válida (descrição de 1024 caracteres escapados).
+# Sem ele, um corpo sem '\n' seria acumulado inteiro em memória.
+MAX_LINE_CHARS = 16 * 1024
+
+Record = Tuple[int, Any]
+
+
+def _error(line: int, message: str, error_type: str) -> TaskImportError:
+    return TaskImportError(
+        line=line, errors=[{"type": error_type, "loc": [], "msg": message}]
+    )
+
+
+def _line_too_long(line: int) -> TaskImportError:
+    return _error(
+        line, f"line longer than {MAX_LINE_CHARS} characters", "line_too_long"
+    )
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Optional[str]]:
+    """
+    Decodifica o corpo em UTF-8 e entrega uma linha por vez, sem o '\\n'.
+
+    Uma linha com mais de ``MAX_LINE_CHARS`` caracteres é entregue como
+    ``None`` e o resto dela é descartado sem ser guardado.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    skipping = False
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            if skipping:
+                # Fim da linha longa já entregue como None.
+                skipping = False
+                continue
+            yield line.rstrip("\r") if len(line) <= MAX_LINE_CHARS else None
+        if len(pending) > MAX_LINE_CHARS:
+            if not skipping:
+                yield None
+                skipping = True
+            pending = ""
+    pending += decoder.decode(b"", final=True)
+    if skipping:
+        return
+    if len(pending) > MAX_LINE_CHARS:
+        yield None
+    elif pending:
+        yield pending.rstrip("\r")
+
+
+async def _ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    line_number = 0
+    async for line in _iter_lines(chunks):
+        line_number += 1
+        if line is None:
+            yield line_number, _line_too_long(line_number)
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield line_number, _error(line_number, str(exc), "json_invalid")
+
+
+async def _csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    """
+    Agrupa as linhas físicas em registros CSV (campos entre aspas podem ter
+    quebras de linha) e converte cada um num dict pelo cabeçalho. Campos
+    vazios são omitidos para que os valores padrão de TaskCreate valham.
+    """
+    header: Optional[List[str]] = None
+    pending: List[str] = []
+    start = line_number = 0
+    async for line in _iter_lines(chunks):
+        line_number += 1
+        if not pending:
+            start = line_number
+        if line is None or sum(map(len, pending)) + len(line) > MAX_LINE_CHARS:
+            # Descarta o registro inteiro, inclusive as linhas já juntadas.
+            yield start, _line_too_long(start)
+            pending = []
+            continue
+        pending.append(line)
+        if sum(part.count('"') for part in pending) % 2:
+            continue
+        text, pending = "\n".join(pending), []
+        if not text.strip():
+            continue
+
+        values = next(csv.reader(io.StringIO(text)))
+        if header is None:
+            header = [name.strip() for name in values]
+        elif len(values) != len(header):
+            yield start, _error(
+                start,
+                f"expected {len(header)} columns, got {len(values)}",
+                "csv_columns",
+            )
+        else:
+            yield start, {
+                name: value for name, value in zip(header, values) if value != ""
+            }
+    if pending:
+        yield start, _error(start, "unterminated quoted field", "csv_quote")
+
+
+def _validate_chunk(
+    chunk: List[Record],
+) -> Tuple[List[TaskCreate], List[TaskImportError]]:
+    """Valida um bloco de registros, separando os válidos dos erros."""
+    payloads, errors = [], []
+    for line, item in chunk:
+        if isinstance(item, TaskImportError):
+            errors.append(item)
+            continue
+        try:
+            payloads.append(TaskCreate.model_validate(item))
+        except ValidationError as exc:
+            errors.append(
+                TaskImportError(
+                    line=line,
+                    errors=exc.errors(include_url=False, include_context=False),
+                )
+            )
+    return payloads, errors
+
+
+async def import_tasks(
+    chunks: AsyncIterator[bytes],
+    db: AsyncSession,
+    *,
+    owner_id: Optional[str],
+    import_format: str = "ndjson",
+    chunk_rows: int = IMPORT_CHUNK_ROWS,
+) -> TaskImportResult:
+    """
+    Importa tarefas de um corpo NDJSON ou CSV lido em fluxo.
+
+    Os registros são validados em blocos de ``chunk_rows``, numa thread para
+    não travar o loop, e cada bloco é inserido num único INSERT com seu
+    commit; a memória usada depende do tamanho do bloco, não do arquivo. Só os primeiros
+    ``MAX_REPORTED_ERRORS`` erros são listados no resumo.
+    """
+    if import_format == "csv":
+        records = _csv_records(chunks)
+    else:
+        records = _ndjson_records(chunks)
+    result = TaskImportResult()
+    chunk: List[Record] = []
+
+    async def flush() -> None:
+        payloads, errors = await run_in_threadpool(_validate_chunk, chunk)
+        created = len(
+            await task_service.create_tasks_async(payloads, db, owner_id=owner_id)
+        )
+        result.records += len(chunk)
+        result.created += created
+        result.failed += len(errors)
+        room = MAX_REPORTED_ERRORS - len(result.errors)
+        result.errors.extend(errors[:room])
+        result.errors_truncated = result.errors_truncated or len(errors) > room
+        chunk.clear()
+
+    async for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_rows:
+            await flush()
+    if chunk:
+        await flush()
+    return result
+
+
+__all__ = ["import_tasks", "IMPORT_CHUNK_ROWS"]
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import numpy as np
+
+BATCH_SIZE_BUCKETS = (1, 8, 32, 128, 512, 2048)
+
+
+@dataclass
+class _PendingRequest:
+    bundle: Any
+    features: np.ndarray
+    future: Future
+
+
+class InferenceBatcher:
+    """
+    Junta pedidos de predição de requisições concorrentes num só ``predict``.
+
+    Cada chamada de ``predict`` entra numa fila; uma thread de trabalho pega
+    o primeiro pedido, espera até ``max_wait_ms`` por outros (ou até somar
+    ``max_batch_rows`` linhas), roda uma predição por versão de modelo e
+    devolve a fatia de cada pedido pelo seu ``Future``.
+    """
+
+    def __init__(self, *, max_batch_rows: int = 512, max_wait_ms: float = 2.0) -> None:
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue[_PendingRequest]" = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._requests = 0
+        self._rows = 0
+        self._batches = 0
+        self._largest_batch = 0
+        self._batch_sizes: Counter = Counter()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._start_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="kairos-inference-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def submit(self, bundle: Any, features: np.ndarray) -> Future:
+        future: Future = Future()
+        self._ensure_worker()
+        self._queue.put(_PendingRequest(bundle, features, future))
+        return future
+
+    def predict(self, bundle: Any, features: np.ndarray) -> np.ndarray:
+        return self.submit(bundle, features).result()
+
+    def _collect(self) -> List[_PendingRequest]:
+        pending = [self._queue.get()]
+        rows = len(pending[0].features)
+        deadline = time.monotonic() + self.max_wait
+        while rows < self.max_batch_rows:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    item = self._queue.get(timeout=timeout)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            pending.append(item)
+            rows += len(item.features)
+        return pending
+
+    def _run(self) -> None:
+        while True:
+            pending = self._collect()
+            groups: Dict[int, List[_PendingRequest]] = {}
+            for item in pending:
+                groups.setdefault(id(item.bundle), []).append(item)
+            for group in groups.values():
+                self._run_batch(group)
+
+    def _run_batch(self, group: List[_PendingRequest]) -> None:
+        features = np.concatenate([item.features for item in group])
+        try:
+            predictions = group[0].bundle.predict(features)
+        except Exception as exc:
+            for item in group:
+                item.future.set_exception(exc)
+            return
+        self._record(len(group), len(features))
+
+        offset = 0
+        for item in group:
+            size = len(item.features)
+            item.future.set_result(predictions[offset : offset + size])
+            offset += size
+
+    def _record(self, requests: int, rows: int) -> None:
+        bucket = next(
+            (limit for limit in BATCH_SIZE_BUCKETS if rows <= limit), "inf"
+        )
+        with self._stats_lock:
+            self._requests += requests
+            self._rows += rows
+            self._batches += 1
+            self._largest_batch = max(self._largest_batch, rows)
+            self._batch_sizes[bucket] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "requests": self._requests,
+                "batches": self._batches,
+                "rows": self._rows,
+                "avg_requests_per_batch": (
+                    self._requests / self._batches if self._batches else 0.0
+                ),
+                "avg_batch_rows": self._rows / self._batches if self._batches else 0.0,
+                "max_batch_rows": self._largest_batch,
+                "batch_rows_histogram": {
+                    f"le_{bucket}": self._batch_sizes[bucket]
+                    for bucket in (*BATCH_SIZE_BUCKETS, "inf")
+                },
+            }
+
+
+__all__ = ["InferenceBatcher"]
@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+import os
+import shutil
+import signal
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.core import config
+from src.services.compiled_forest import CompiledForest
+from src.services.priority_lookup import LookupValidationError, PriorityLookupTable
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILENAME = "kairos_model.pkl"
+ENCODER_FILENAME = "category_encoder.pkl"
+METADATA_FILENAME = "metadata.json"
+MANIFEST_FILENAME = "manifest.json"
+ARRAYS_DIRNAME = "arrays"
+ARRAYS_FORMAT = "kairos-compiled-forest"
+ARRAYS_FORMAT_VERSION = 1
+LEGACY_VERSION = "legacy"
+
+
+class ModelLoadError(RuntimeError):
+    """Erro ao carregar uma versão do modelo do registro."""
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """Modelo, encoder e dados derivados de uma versão carregada."""
+
+    version: str
+    model: Any
+    encoder: Any
+    category_codes: Dict[str, int]
+    forest: Optional[CompiledForest] = None
+    lookup: Optional[PriorityLookupTable] = None
+    n_features: Optional[int] = None
+    loaded_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """Prediz as classes de uma matriz (n, 4) de features numéricas."""
+        if self.lookup is not None:
+            return self.lookup.predict(features)
+        if self.forest is not None and (
+            self.model is None or len(features) <= config.COMPILED_FOREST_MAX_BATCH
+        ):
+            return self.forest.predict(features)
+        columns = getattr(self.model, "feature_names_in_", None)
+        return self.model.predict(pd.DataFrame(features, columns=columns))
+
+
+class ModelRegistry:
+    """
+    Registro de artefatos versionados do modelo de IA.
+
+    Cada versão fica em ``<root>/<versão>/`` com o modelo e o encoder em
+    pickle e, opcionalmente, a floresta exportada em ``arrays/*.npy`` com um
+    ``manifest.json``; esse formato é preferido quando existe, pois é aberto
+    com mmap. Os arquivos soltos em ``legacy_dir`` são expostos como a
+    versão ``legacy``.
+    O modelo ativo é trocado por atribuição de referência: a nova versão é
+    carregada por completo antes da troca, e quem já pegou o bundle antigo
+    continua usando-o até o fim da requisição.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        legacy_dir: Optional[Path] = None,
+        pinned_version: Optional[str] = None,
+    ) -> None:
+        self.root = Path(root)
+        self.legacy_dir = Path(legacy_dir) if legacy_dir else None
+        self.pinned_version = pinned_version
+        self._active: Optional[ModelBundle] = None
+        self._attempted = False
+        self._reload_lock = threading.Lock()
+
+    def _artifact_dir(self, version: str) -> Path:
+        if version == LEGACY_VERSION and self.legacy_dir is not None:
+            return self.legacy_dir
+        return self.root / version
+
+    def _has_pickles(self, directory: Path) -> bool:
+        return (directory / MODEL_FILENAME).is_file() and (
+            directory / ENCODER_FILENAME
+        ).is_file()
+
+    def _has_artifacts(self, directory: Path) -> bool:
+        return self._has_pickles(directory) or (directory / MANIFEST_FILENAME).is_file()
+
+    def list_versions(self) -> List[str]:
+        """Lista as versões disponíveis, da mais antiga para a mais nova."""
+        versions = []
+        if self.legacy_dir is not None and self._has_artifacts(self.legacy_dir):
+            versions.append(LEGACY_VERSION)
+        if self.root.is_dir():
+            versions.extend(
+                sorted(
+                    entry.name
+                    for entry in self.root.iterdir()
+                    if not entry.name.startswith(".") and self._has_artifacts(entry)
+                )
+            )
+        return versions
+
+    def latest_version(self) -> Optional[str]:
+        versions = self.list_versions()
+        return versions[-1] if versions else None
+
+    def load_bundle(self, version: str) -> ModelBundle:
+        """Carrega uma versão sem alterar o modelo ativo."""
+        directory = self._artifact_dir(version)
+        if config.MODEL_MMAP and (directory / MANIFEST_FILENAME).is_file():
+            bundle = self._load_arrays(version, directory)
+        elif self._has_pickles(directory):
+            bundle = self._load_pickles(version, directory)
+        else:
+            raise ModelLoadError(f"Versão do modelo não encontrada: {version}")
+        if config.PRIORITY_LOOKUP and bundle.forest is not None:
+            bundle = self._with_lookup(bundle)
+        return bundle
+
+    def _load_pickles(self, version: str, directory: Path) -> ModelBundle:
+        try:
+            model = joblib.load(directory / MODEL_FILENAME)
+            encoder = joblib.load(directory / ENCODER_FILENAME)
+            category_codes = {
+                str(category): code for code, category in enumerate(encoder.classes_)
+            }
+        except Exception as exc:
+            raise ModelLoadError(
+                f"Falha ao carregar a versão {version}: {exc}"
+            ) from exc
+        forest = None
+        try:
+            forest = CompiledForest.from_sklearn(model)
+        except ValueError as exc:
+            logger.info("Avaliador compilado indisponível (%s): %s", version, exc)
+        return ModelBundle(
+            version=version,
+            model=model,
+            encoder=encoder,
+            category_codes=category_codes,
+            forest=forest,
+            n_features=getattr(model, "n_features_in_", None),
+        )
+
+    def _load_arrays(self, version: str, directory: Path) -> ModelBundle:
+        """
+        Abre a floresta exportada com mmap, sem desserializar o sklearn.
+        O bundle não tem ``model`` nem ``encoder``; as categorias vêm do
+        manifesto.
+        """
+        try:
+            with open(directory / MANIFEST_FILENAME, encoding="utf-8") as fp:
+                manifest = json.load(fp)
+            if (
+                manifest.get("format") != ARRAYS_FORMAT
+                or manifest.get("format_version") != ARRAYS_FORMAT_VERSION
+            ):
+                raise ValueError("formato de manifesto não suportado")
+            forest = CompiledForest.load(directory / ARRAYS_DIRNAME)
+        except Exception as exc:
+            raise ModelLoadError(
+                f"Falha ao carregar a versão {version}: {exc}"
+            ) from exc
+        return ModelBundle(
+            version=version,
+            model=None,
+            encoder=None,
+            category_codes={
+                category: code for code, category in enumerate(manifest["categories"])
+            },
+            forest=forest,
+            n_features=manifest["n_features"],
+        )
+
+    def _with_lookup(self, bundle: ModelBundle) -> ModelBundle:
+        try:
+            lookup = PriorityLookupTable.build(
+                bundle.forest, bundle.predict, n_features=bundle.n_features
+            )
+        except LookupValidationError as exc:
+            logger.warning(
+                "Tabela de prioridades descartada (%s): %s", bundle.version, exc
+            )
+            return bundle
+        return dataclasses.replace(bundle, lookup=lookup)
+
+    @property
+    def active(self) -> Optional[ModelBundle]:
+        """Bundle em uso; carrega uma única vez se ainda não foi carregado."""
+        if self._active is None and not self._attempted:
+            self.load_active()
+        return self._active
+
+    def load_active(self) -> Optional[ModelBundle]:
+        """Carregamento da inicialização: falhas são registradas, não lançadas."""
+        try:
+            return self.reload()
+        except ModelLoadError as exc:
+            logger.warning("Modelo de IA indisponível: %s", exc)
+            return None
+
+    def reload(self, version: Optional[str] = None) -> ModelBundle:
+        """
+        Carrega uma versão (a fixada ou a mais recente, por padrão) e a torna
+        ativa. Em caso de erro o modelo anterior continua ativo.
+        """
+        with self._reload_lock:
+            self._attempted = True
+            target = version or self.pinned_version or self.latest_version()
+            if target is None:
+                raise ModelLoadError("Nenhuma versão do modelo disponível")
+            bundle = self.load_bundle(target)
+            self._active = bundle
+            logger.info("Modelo de IA ativo: versão %s", bundle.version)
+            return bundle
+
+    def publish(
+        self,
+        model: Any,
+        encoder: Any,
+        *,
+        version: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        reports: Optional[Dict[str, Any]] = None,
+        arrays: bool = False,
+    ) -> str:
+        """
+        Grava uma nova versão no registro; ``reports`` são documentos JSON
+        extras salvos ao lado do artefato (nome do arquivo -> conteúdo) e
+        ``arrays`` também exporta a floresta no formato aberto com mmap.
+
+        Os arquivos são escritos num diretório temporário e renomeados no
+        final, então uma versão nunca aparece pela metade para o ``reload``.
+        """
+        version = version or datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+        target = self.root / version
+        if target.exists():
+            raise ValueError(f"Versão já existe no registro: {version}")
+        forest = CompiledForest.from_sklearn(model) if arrays else None
+
+        staging = self.root / f".{version}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        joblib.dump(model, staging / MODEL_FILENAME)
+        joblib.dump(encoder, staging / ENCODER_FILENAME)
+        with open(staging / METADATA_FILENAME, "w", encoding="utf-8") as fp:
+            json.dump(
+                {
+                    "version": version,
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    **(metadata or {}),
+                },
+                fp,
+                indent=2,
+                default=str,
+            )
+        for filename, content in (reports or {}).items():
+            with open(staging / filename, "w", encoding="utf-8") as fp:
+                json.dump(content, fp, indent=2, default=str)
+        if forest is not None:
+            _export_arrays(staging, forest, model, encoder)
+        os.replace(staging, target)
+        return version
+
+    def convert(self, version: str) -> Path:
+        """
+        Exporta os pickles de uma versão para ``arrays/`` + ``manifest.json``
+        no mesmo diretório. Lança ValueError se o modelo não é uma floresta.
+        """
+        directory = self._artifact_dir(version)
+        if not self._has_pickles(directory):
+            raise ModelLoadError(f"Versão sem pickles para converter: {version}")
+        model = joblib.load(directory / MODEL_FILENAME)
+        encoder = joblib.load(directory / ENCODER_FILENAME)
+        _export_arrays(directory, CompiledForest.from_sklearn(model), model, encoder)
+        return directory / MANIFEST_FILENAME
+
+
+def _export_arrays(
+    directory: Path, forest: CompiledForest, model: Any, encoder: Any
+) -> None:
+    """
+    Grava os arrays e, por último, o manifesto: sem manifesto a versão é
+    lida dos pickles, então um ``reload`` concorrente nunca vê arrays pela
+    metade.
+    """
+    staging = directory / f".{ARRAYS_DIRNAME}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    layout = forest.save(staging)
+    manifest = {
+        "format": ARRAYS_FORMAT,
+        "format_version": ARRAYS_FORMAT_VERSION,
+        "n_features": int(model.n_features_in_),
+        "feature_names": [
+            str(name) for name in getattr(model, "feature_names_in_", [])
+        ],
+        "categories": [str(category) for category in encoder.classes_],
+        "arrays": layout,
+    }
+
+    (directory / MANIFEST_FILENAME).unlink(missing_ok=True)
+    shutil.rmtree(directory / ARRAYS_DIRNAME, ignore_errors=True)
+    os.replace(staging, directory / ARRAYS_DIRNAME)
+    partial = directory / f".{MANIFEST_FILENAME}.tmp"
+    with open(partial, "w", encoding="utf-8") as fp:
+        json.dump(manifest, fp, indent=2)
+    os.replace(partial, directory / MANIFEST_FILENAME)
+
+
+registry = ModelRegistry(
+    config.MODEL_REGISTRY_DIR,
+    legacy_dir=config.IA_DIR,
+    pinned_version=config.MODEL_VERSION,
+)
+
+
+def install_reload_signal(sig: int = getattr(signal, "SIGHUP", 0)) -> bool:
+    """
+    Registra um handler que recarrega o modelo ao receber ``sig`` (SIGHUP).
+    O carregamento roda numa thread para não travar o loop do servidor.
+    """
+    if not sig or threading.current_thread() is not threading.main_thread():
+        return False
+
+    def _handler(signum, frame):
+        threading.Thread(
+            target=registry.load_active, name="kairos-model-reload", daemon=True
+        ).start()
+
+    signal.signal(sig, _handler)
+    return True
+
+
+__all__ = [
+    "ModelBundle",
+    "ModelLoadError",
+    "ModelRegistry",
+    "registry",
+    "install_reload_signal",
+]
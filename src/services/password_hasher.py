@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from src.core import security
+
+WAIT_MS_BUCKETS = (1, 10, 50, 250, 1000, 5000)
+
+
+class PasswordHasherBusy(RuntimeError):
+    """A fila do bcrypt está cheia; o pedido foi recusado sem esperar."""
+
+
+class PasswordHasher:
+    """
+    Roda o bcrypt num pool de threads próprio, fora do loop de eventos e do
+    threadpool das rotas síncronas.
+
+    O bcrypt solta o GIL enquanto calcula o hash, então ``max_workers``
+    threads usam até ``max_workers`` núcleos. Além das que estão rodando,
+    até ``max_queue`` chamadas podem esperar na fila; a partir daí
+    ``hash``/``verify`` levantam PasswordHasherBusy na hora, em vez de
+    acumular logins que estourariam o timeout do cliente de qualquer forma.
+    """
+
+    def __init__(self, *, max_workers: int = 2, max_queue: int = 32) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="kairos-bcrypt"
+        )
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._started = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total_ms = 0.0
+        self._wait_max_ms = 0.0
+        self._wait_histogram = {bucket: 0 for bucket in (*WAIT_MS_BUCKETS, "inf")}
+
+    def _release(self, future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if not future.cancelled():
+                self._completed += 1
+
+    def _timed(self, fn: Callable[..., Any], queued_at: float, *args: Any) -> Any:
+        wait_ms = (time.perf_counter() - queued_at) * 1000
+        bucket = next((limit for limit in WAIT_MS_BUCKETS if wait_ms <= limit), "inf")
+        with self._lock:
+            self._started += 1
+            self._wait_total_ms += wait_ms
+            self._wait_max_ms = max(self._wait_max_ms, wait_ms)
+            self._wait_histogram[bucket] += 1
+        return fn(*args)
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise PasswordHasherBusy("password hashing queue is full")
+            self._in_flight += 1
+        # A vaga só é devolvida quando a thread termina (ou o pedido sai da
+        # fila cancelado), mesmo que quem esperava tenha desistido antes.
+        future = self._executor.submit(self._timed, fn, time.perf_counter(), *args)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(security.get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(security.verify_password, plain_password, hashed_password)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "queued": max(0, self._in_flight - self.max_workers),
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": (
+                    self._wait_total_ms / self._started if self._started else 0.0
+                ),
+                "max_wait_ms": self._wait_max_ms,
+                "wait_ms_histogram": {
+                    f"le_{bucket}": self._wait_histogram[bucket]
+                    for bucket in (*WAIT_MS_BUCKETS, "inf")
+                },
+            }
+
+
+__all__ = ["PasswordHasher", "PasswordHasherBusy"]
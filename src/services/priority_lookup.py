@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import Callable, List
+
+import numpy as np
+
+from src.services.compiled_forest import CompiledForest
+
+PredictFn = Callable[[np.ndarray], np.ndarray]
+
+_BUILD_CHUNK_ROWS = 50_000
+
+
+class LookupValidationError(ValueError):
+    """A tabela pré-calculada não concorda com o modelo."""
+
+
+class PriorityLookupTable:
+    """
+    Predições pré-calculadas sobre o espaço discreto de features.
+
+    Todas as features do modelo são inteiras, e para um inteiro ``x`` vale
+    ``x <= t`` se e só se ``x <= floor(t)``. Cada feature é dividida em
+    faixas pelos ``floor`` dos limiares usados pela floresta; dentro de uma
+    faixa todas as árvores tomam as mesmas decisões, então uma predição por
+    célula reproduz o modelo exatamente. A consulta é um ``searchsorted`` por
+    coluna seguido de um acesso indexado ao array denso.
+    """
+
+    def __init__(
+        self, edges: List[np.ndarray], table: np.ndarray, classes: np.ndarray
+    ) -> None:
+        self.edges = edges
+        self.table = table
+        self.classes = classes
+
+    @property
+    def shape(self) -> tuple:
+        return self.table.shape
+
+    @staticmethod
+    def _feature_edges(forest: CompiledForest, feature: int) -> np.ndarray:
+        split_nodes = (forest.feature == feature) & ~forest._is_leaf
+        return np.unique(np.floor(forest.threshold[split_nodes]))
+
+    @staticmethod
+    def _representatives(edges: np.ndarray) -> np.ndarray:
+        # Faixa i cobre (edges[i-1], edges[i]]; a última é (edges[-1], inf).
+        if not len(edges):
+            return np.zeros(1)
+        return np.append(edges, edges[-1] + 1)
+
+    @classmethod
+    def build(
+        cls,
+        forest: CompiledForest,
+        predict: PredictFn,
+        *,
+        n_features: int,
+        validation_rows: int = 2_000,
+        seed: int = 0,
+    ) -> "PriorityLookupTable":
+        """
+        Monta a tabela chamando ``predict`` uma vez por célula e a valida
+        contra ``predict`` numa amostra aleatória de linhas inteiras.
+        """
+        edges = [cls._feature_edges(forest, feature) for feature in range(n_features)]
+        axes = [cls._representatives(feature_edges) for feature_edges in edges]
+        grid = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(
+            -1, n_features
+        )
+
+        class_index = {label: index for index, label in enumerate(forest.classes)}
+        cells = np.empty(len(grid), dtype=np.int8)
+        for start in range(0, len(grid), _BUILD_CHUNK_ROWS):
+            chunk = grid[start : start + _BUILD_CHUNK_ROWS]
+            cells[start : start + len(chunk)] = [
+                class_index[label] for label in predict(chunk)
+            ]
+
+        table = cls(
+            edges, cells.reshape([len(axis) for axis in axes]), forest.classes
+        )
+        table.validate(predict, axes, rows=validation_rows, seed=seed)
+        return table
+
+    def validate(
+        self, predict: PredictFn, axes: List[np.ndarray], *, rows: int, seed: int
+    ) -> None:
+        """Confere a tabela contra o modelo e lança LookupValidationError."""
+        for feature, axis in enumerate(axes):
+            buckets = np.searchsorted(self.edges[feature], axis, side="left")
+            if not np.array_equal(buckets, np.arange(len(axis))):
+                raise LookupValidationError(
+                    f"Representantes fora da própria faixa na feature {feature}"
+                )
+
+        rng = np.random.default_rng(seed)
+        sample = np.column_stack(
+            [rng.integers(axis[0] - 1, axis[-1] + 2, rows) for axis in axes]
+        ).astype(np.float64)
+        if not np.array_equal(self.predict(sample), predict(sample)):
+            raise LookupValidationError("Tabela diverge do modelo na amostra")
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        features = np.asarray(features)
+        index = tuple(
+            np.searchsorted(feature_edges, features[:, column], side="left")
+            for column, feature_edges in enumerate(self.edges)
+        )
+        return self.classes[self.table[index]]
+
+
+__all__ = ["LookupValidationError", "PriorityLookupTable"]
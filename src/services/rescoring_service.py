@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from sqlalchemy import and_, bindparam, or_, select, update
+from sqlalchemy.engine import Connection, Engine
+
+from src.models.database import Task
+from src.models.schemas import TaskStatus
+from src.services import ia_service
+from src.services.model_registry import ModelBundle, registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+
+_tasks = Task.__table__
+
+# Só grava se a tarefa não mudou desde a leitura: uma edição concorrente
+# (que sempre avança ``updated_at``) vence, e a tarefa é reavaliada na
+# próxima execução.
+_UNCHANGED_SINCE_READ = and_(
+    _tasks.c.id == bindparam("b_id"),
+    _tasks.c.updated_at == bindparam("b_read_updated_at"),
+)
+
+# Prioridade intacta: só o score. ``updated_at`` recebe o próprio valor para
+# que o onupdate da coluna não marque a tarefa como alterada.
+_WRITE_SCORE_STMT = (
+    update(_tasks)
+    .where(_UNCHANGED_SINCE_READ)
+    .values(
+        updated_at=_tasks.c.updated_at,
+        ai_score=bindparam("b_ai_score"),
+        ai_scored_at=bindparam("b_ai_scored_at"),
+        ai_model_version=bindparam("b_ai_model_version"),
+    )
+)
+
+_WRITE_PRIORITY_STMT = (
+    update(_tasks)
+    .where(_UNCHANGED_SINCE_READ)
+    .values(
+        priority=bindparam("b_priority"),
+        updated_at=bindparam("b_ai_scored_at"),
+        ai_score=bindparam("b_ai_score"),
+        ai_scored_at=bindparam("b_ai_scored_at"),
+        ai_model_version=bindparam("b_ai_model_version"),
+    )
+)
+
+
+@dataclass
+class RescoreStats:
+    """Resumo de uma execução do job de reavaliação."""
+
+    rows: int = 0
+    rescored: int = 0
+    priority_changes: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _read_checkpoint(path: Optional[Path]) -> Optional[dict]:
+    if path is None or not path.is_file():
+        return None
+    with open(path, encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def _write_checkpoint(path: Path, data: dict) -> None:
+    staging = path.with_name(f".{path.name}.tmp")
+    with open(staging, "w", encoding="utf-8") as fp:
+        json.dump(data, fp)
+    os.replace(staging, path)
+
+
+def _write_scores(
+    conn: Connection, rows: list, scores: List[int], *, version: str, now: datetime
+) -> int:
+    """
+    Grava os scores de um bloco com no máximo dois executemany: um para as
+    tarefas cuja prioridade mudou e outro para as demais.
+
+    Diferente do UPDATE ... CASE de ``optimize_schedule``, os statements são
+    sempre os mesmos e ficam no cache de compilação, o que importa quando o
+    job passa por milhões de linhas. Retorna quantas prioridades mudaram.
+    """
+    unchanged, changed = [], []
+    for row, score in zip(rows, scores):
+        priority = ia_service.score_to_priority(score)
+        params = {
+            "b_id": row.id,
+            "b_read_updated_at": row.updated_at,
+            "b_ai_score": score,
+            "b_ai_scored_at": now,
+            "b_ai_model_version": version,
+        }
+        if priority == row.priority:
+            unchanged.append(params)
+        else:
+            changed.append({**params, "b_priority": priority})
+    if unchanged:
+        conn.execute(_WRITE_SCORE_STMT, unchanged)
+    if changed:
+        conn.execute(_WRITE_PRIORITY_STMT, changed)
+    return len(changed)
+
+
+def _pending_tasks_stmt(checkpoint: Optional[dict]):
+    stmt = (
+        select(
+            Task.id,
+            Task.owner_id,
+            Task.due_date,
+            Task.estimated_minutes,
+            Task.difficulty,
+            Task.category,
+            Task.priority,
+            Task.updated_at,
+            Task.ai_score,
+            Task.ai_scored_at,
+            Task.ai_model_version,
+        )
+        .where(Task.status != TaskStatus.done, Task.owner_id.is_not(None))
+        .order_by(Task.owner_id, Task.id)
+    )
+    if checkpoint:
+        owner_id, task_id = checkpoint["owner_id"], checkpoint["task_id"]
+        stmt = stmt.where(
+            or_(
+                Task.owner_id > owner_id,
+                and_(Task.owner_id == owner_id, Task.id > task_id),
+            )
+        )
+    return stmt
+
+
+def rescore_pending_tasks(
+    bind: Engine,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    checkpoint_path: Optional[Path] = None,
+    on_chunk: Optional[Callable[[RescoreStats], None]] = None,
+) -> RescoreStats:
+    """
+    Reavalia todas as tarefas não concluídas, em ordem de (owner_id, id).
+
+    As linhas são lidas com um cursor do lado do servidor (``yield_per``),
+    então a memória fica limitada a um bloco de ``chunk_size`` linhas. Cada
+    bloco é avaliado com um único predict, gravado num executemany e
+    confirmado; em seguida a última chave é salva em ``checkpoint_path``, de
+    onde uma execução interrompida continua. O checkpoint é apagado ao final.
+    """
+    bundle = registry.active
+    if bundle is None:
+        raise RuntimeError("Nenhum modelo de IA carregado")
+
+    checkpoint = _read_checkpoint(checkpoint_path)
+    if checkpoint:
+        logger.info(
+            "Retomando a partir de owner=%s task=%s",
+            checkpoint["owner_id"],
+            checkpoint["task_id"],
+        )
+    started = time.perf_counter()
+
+    # No SQLite o cursor de leitura segura um lock que bloqueia escritas de
+    # outra conexão, então leitura e escrita usam a mesma conexão. Nos
+    # demais bancos o cursor do servidor não sobrevive ao commit, então a
+    # leitura fica numa conexão separada.
+    with bind.connect() as write_conn, (
+        nullcontext(write_conn) if bind.dialect.name == "sqlite" else bind.connect()
+    ) as read_conn:
+        stats = _rescore_stream(
+            read_conn,
+            write_conn,
+            bundle=bundle,
+            checkpoint=checkpoint,
+            checkpoint_path=checkpoint_path,
+            chunk_size=chunk_size,
+            on_chunk=on_chunk,
+            started=started,
+        )
+
+    stats.seconds = time.perf_counter() - started
+    if checkpoint_path is not None and checkpoint_path.is_file():
+        checkpoint_path.unlink()
+    return stats
+
+
+def _rescore_stream(
+    read_conn: Connection,
+    write_conn: Connection,
+    *,
+    bundle: ModelBundle,
+    checkpoint: Optional[dict],
+    checkpoint_path: Optional[Path],
+    chunk_size: int,
+    on_chunk: Optional[Callable[[RescoreStats], None]],
+    started: float,
+) -> RescoreStats:
+    stats = RescoreStats()
+    result = read_conn.execute(
+        _pending_tasks_stmt(checkpoint).execution_options(yield_per=chunk_size)
+    )
+    for rows in result.partitions():
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        stale = [
+            row
+            for row in rows
+            if ia_service.needs_rescore(row, row, bundle.version, now)
+        ]
+        scores = ia_service.predict_priority_scores(
+            stale, now=now, bundle=bundle
+        )
+
+        stats.priority_changes += _write_scores(
+            write_conn, stale, scores, version=bundle.version, now=now
+        )
+        write_conn.commit()
+
+        stats.rows += len(rows)
+        stats.rescored += len(stale)
+        stats.chunks += 1
+        stats.seconds = time.perf_counter() - started
+        if checkpoint_path is not None:
+            _write_checkpoint(
+                checkpoint_path,
+                {
+                    "owner_id": rows[-1].owner_id,
+                    "task_id": rows[-1].id,
+                    "model_version": bundle.version,
+                },
+            )
+        if on_chunk is not None:
+            on_chunk(stats)
+    return stats
+
+
+__all__ = ["RescoreStats", "rescore_pending_tasks"]
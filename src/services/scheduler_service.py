@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta, timezone, tzinfo
+from typing import Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from src.models.schemas import TaskPriority, TaskPublic, TaskStatus
+
+_PRIORITY_RANK = {TaskPriority.high: 0, TaskPriority.medium: 1, TaskPriority.low: 2}
+_NO_DEADLINE = datetime.max.replace(tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class WorkingHours:
+    """
+    Janela de trabalho diária, no fuso ``tz`` (o do instante inicial da
+    agenda quando ``None``).
+    """
+
+    start: time = time(9, 0)
+    end: time = time(18, 0)
+    weekdays: FrozenSet[int] = field(default_factory=lambda: frozenset(range(5)))
+    tz: Optional[tzinfo] = None
+
+
+@dataclass(frozen=True)
+class Slot:
+    """Horário reservado para uma tarefa (``start``/``end`` vazios se não coube)."""
+
+    start: Optional[datetime]
+    end: Optional[datetime]
+    deadline_met: bool
+
+
+def _working_windows(
+    start: datetime, hours: WorkingHours, horizon_end: datetime
+) -> Iterator[Tuple[datetime, datetime]]:
+    """
+    Gera as janelas de trabalho entre ``start`` e ``horizon_end``.
+
+    Dias e horários são os do fuso do expediente; as janelas saem no fuso
+    de ``start``, em que a conta do tempo livre é feita.
+    """
+    tz = hours.tz or start.tzinfo
+    day = start.astimezone(tz).date()
+    while True:
+        window_start = datetime.combine(day, hours.start, tzinfo=tz)
+        if window_start >= horizon_end:
+            return
+        if day.weekday() in hours.weekdays:
+            window_end = min(
+                datetime.combine(day, hours.end, tzinfo=tz).astimezone(start.tzinfo),
+                horizon_end,
+            )
+            window_start = max(window_start.astimezone(start.tzinfo), start)
+            if window_start < window_end:
+                yield window_start, window_end
+        day += timedelta(days=1)
+
+
+def _deadline(task: TaskPublic) -> datetime:
+    if task.due_date is None:
+        return _NO_DEADLINE
+    if task.due_date.tzinfo is None:
+        return task.due_date.replace(tzinfo=timezone.utc)
+    return task.due_date
+
+
+def schedule_tasks(
+    tasks: Sequence[TaskPublic],
+    *,
+    start: datetime,
+    working_hours: WorkingHours = WorkingHours(),
+    horizon_days: int = 14,
+) -> Dict[UUID, Slot]:
+    """
+    Encaixa as tarefas em horários concretos dentro do expediente.
+
+    As tarefas saem de um heap na ordem (prazo, prioridade, duração): o
+    prazo mais cedo primeiro minimiza o atraso máximo numa agenda sequencial,
+    e a prioridade da IA desempata tarefas com o mesmo prazo; tarefas sem
+    prazo vão por último, por prioridade. Cada tarefa ocupa o próximo tempo
+    livre e pode continuar na janela seguinte. Tarefas concluídas são
+    ignoradas; as que não cabem no horizonte ficam sem horário. Custo
+    O(n log n) para ordenar mais uma varredura linear das janelas.
+    """
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    horizon_end = start + timedelta(days=horizon_days)
+
+    heap = [
+        (
+            _deadline(task),
+            _PRIORITY_RANK.get(task.priority, 1),
+            task.estimated_minutes,
+            index,
+        )
+        for index, task in enumerate(tasks)
+        if task.status != TaskStatus.done
+    ]
+    heapq.heapify(heap)
+
+    windows: List[Tuple[datetime, datetime]] = []
+    window_iter = _working_windows(start, working_hours, horizon_end)
+    window_index = 0
+    cursor: Optional[datetime] = None
+
+    def window_at(index: int) -> Optional[Tuple[datetime, datetime]]:
+        while len(windows) <= index:
+            next_window = next(window_iter, None)
+            if next_window is None:
+                return None
+            windows.append(next_window)
+        return windows[index]
+
+    slots: Dict[UUID, Slot] = {}
+    while heap:
+        deadline, _, minutes, index = heapq.heappop(heap)
+        task = tasks[index]
+
+        remaining = timedelta(minutes=minutes)
+        position, at = window_index, cursor
+        task_start = None
+        while remaining > timedelta(0):
+            window = window_at(position)
+            if window is None:
+                break
+            at = max(at or window[0], window[0])
+            available = window[1] - at
+            if available <= timedelta(0):
+                position, at = position + 1, None
+                continue
+            task_start = task_start or at
+            used = min(available, remaining)
+            at += used
+            remaining -= used
+            if remaining > timedelta(0):
+                position, at = position + 1, None
+
+        if remaining > timedelta(0):
+            # Não cabe até o fim do horizonte: não consome tempo da agenda.
+            slots[task.id] = Slot(start=None, end=None, deadline_met=False)
+            continue
+
+        window_index, cursor = position, at
+        slots[task.id] = Slot(start=task_start, end=at, deadline_met=at <= deadline)
+    return slots
+
+
+__all__ = ["Slot", "WorkingHours", "schedule_tasks"]
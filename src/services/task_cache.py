@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from src.core import config
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class MemoryBackend:
+    """LRU com TTL em memória, local ao processo."""
+
+    # Acesso em memória: pode ser feito direto no loop de eventos.
+    blocking = False
+
+    def __init__(self, *, max_entries: int = 1024, ttl_seconds: float = 30.0) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """
+    Backend em qualquer cliente compatível com Redis (``get`` e ``set`` com
+    ``ex``), compartilhado entre os processos. Os valores são serializados
+    com pickle.
+    """
+
+    # Cada acesso é uma ida à rede: nas rotas async, vai para uma thread.
+    blocking = True
+
+    def __init__(
+        self, client: Any, *, ttl_seconds: float = 30.0, prefix: str = "kairos:tasks"
+    ) -> None:
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def get(self, key: str) -> Any:
+        raw = self.client.get(f"{self.prefix}:{key}")
+        return _MISSING if raw is None else pickle.loads(raw)
+
+    def set(self, key: str, value: Any) -> None:
+        self.client.set(
+            f"{self.prefix}:{key}",
+            pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+            ex=max(1, int(self.ttl_seconds)),
+        )
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class TaskListCache:
+    """
+    Cache das listagens de tarefas, por dono, estado e parâmetros da consulta.
+
+    O estado é o ETag das tarefas do dono (número de tarefas e maior
+    ``updated_at``), lido do banco a cada requisição. Qualquer escrita que
+    mude o ETag, inclusive de outro processo ou fora da API, muda a chave, e
+    as entradas antigas deixam de ser alcançadas (e expiram pelo TTL/LRU);
+    o corpo servido do cache é sempre o do ETag enviado junto. Não há
+    invalidação explícita. Falhas do backend contam como miss e não
+    derrubam a requisição.
+    """
+
+    def __init__(self, backend: Any = None) -> None:
+        self.backend = backend
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "errors": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def key(
+        self, owner_id: Optional[str], state: Optional[str], **params: Any
+    ) -> Optional[str]:
+        """Chave da consulta, ou None quando o cache está desligado ou sem estado."""
+        if self.backend is None or state is None:
+            return None
+        digest = hashlib.sha1(
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return f"{owner_id}:{state}:{digest}"
+
+    def get(self, key: Optional[str]) -> Any:
+        if key is None:
+            return None
+        try:
+            value = self.backend.get(key)
+        except Exception:
+            logger.exception("Cache de tarefas indisponível")
+            self._count("errors")
+            value = _MISSING
+        if value is _MISSING:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return value
+
+    def set(self, key: Optional[str], value: Any) -> None:
+        if key is None:
+            return
+        try:
+            self.backend.set(key, value)
+        except Exception:
+            logger.exception("Cache de tarefas indisponível")
+            self._count("errors")
+
+    async def get_async(self, key: Optional[str]) -> Any:
+        """``get`` para o loop de eventos, sem bloqueá-lo em backends de rede."""
+        if key is not None and self.backend.blocking:
+            return await asyncio.to_thread(self.get, key)
+        return self.get(key)
+
+    async def set_async(self, key: Optional[str], value: Any) -> None:
+        if key is not None and self.backend.blocking:
+            await asyncio.to_thread(self.set, key, value)
+        else:
+            self.set(key, value)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        stats["backend"] = type(self.backend).__name__ if self.backend else None
+        stats["entries"] = self.backend.size() if self.backend else 0
+        return stats
+
+
+def build_backend(kind: str = config.TASK_CACHE) -> Any:
+    """Backend configurado em KAIROS_TASK_CACHE: memory, redis ou off."""
+    if kind == "memory":
+        return MemoryBackend(
+            max_entries=config.TASK_CACHE_MAX_ENTRIES,
+            ttl_seconds=config.TASK_CACHE_TTL_SECONDS,
+        )
+    if kind == "redis":
+        # Dependência opcional: só é necessária com KAIROS_TASK_CACHE=redis.
+        import redis
+
+        return RedisBackend(
+            redis.Redis.from_url(config.REDIS_URL),
+            ttl_seconds=config.TASK_CACHE_TTL_SECONDS,
+        )
+    return None
+
+
+cache = TaskListCache(build_backend())
+
+
+__all__ = ["MemoryBackend", "RedisBackend", "TaskListCache", "build_backend", "cache"]
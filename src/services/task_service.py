@@ -1,12 +1,104 @@
 from __future__ import annotations
+import base64
+import binascii
+import csv
+import hashlib
+import io
+import json
 from datetime import datetime, timezone
-from typing import List, Optional
+from enum import Enum
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 from uuid import UUID
+from pydantic import ValidationError
+from sqlalchemy import Row, delete, func, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
-from src.models.schemas import TaskCreate, TaskPublic, TaskStatus
+from src.models.schemas import (
+    TaskBulkError,
+    TaskCategory,
+    TaskCreate,
+    TaskFilter,
+    TaskPriority,
+    TaskPublic,
+    TaskStatus,
+    TaskUpdate,
+)
 from src.models.database import Task
+from src.services.task_cache import cache
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+MAX_BULK_TASKS = 1000
+EXPORT_CHUNK_ROWS = 1000
+
+
+TASK_COLUMNS = {
+    "title",
+    "description",
+    "due_date",
+    "priority",
+    "status",
+    "category",
+    "difficulty",
+    "estimated_minutes",
+}
+
+
+# Colunas de TaskPublic, lidas como tuplas nos caminhos de leitura.
+PUBLIC_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "due_date",
+    "priority",
+    "status",
+    "category",
+    "difficulty",
+    "estimated_minutes",
+    "owner_id",
+    "created_at",
+    "updated_at",
+)
+
+
+def _public_columns():
+    return [getattr(Task, column) for column in PUBLIC_COLUMNS]
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # O banco guarda due_date sem fuso; TaskPublic sempre o expôs em UTC.
+    return value.replace(tzinfo=timezone.utc) if value is not None else None
+
+
+def _task_row_to_dict(row: Tuple) -> Dict[str, Any]:
+    """Linha do banco já no formato JSON de TaskPublic, sem validação."""
+    task = dict(zip(PUBLIC_COLUMNS, row))
+    task["due_date"] = _as_utc(task["due_date"])
+    return task
+
+
+def _task_row_to_schema(row: Tuple) -> TaskPublic:
+    """
+    Monta o TaskPublic de uma linha confiável do banco sem validar: os
+    validadores servem para a entrada do usuário (e o de ``due_date``
+    rejeitaria tarefas atrasadas).
+    """
+    task = dict(zip(PUBLIC_COLUMNS, row))
+    task["id"] = UUID(task["id"])
+    task["owner_id"] = UUID(task["owner_id"]) if task["owner_id"] else None
+    task["due_date"] = _as_utc(task["due_date"])
+    return TaskPublic.model_construct(**task)
 
 
 def _task_db_to_schema(db_task: Task) -> TaskPublic:
@@ -48,21 +140,294 @@ def create_task(
     return _task_db_to_schema(db_task)
 
 
+def validate_task_items(
+    items: Sequence[Any], *, start_index: int = 0
+) -> Tuple[List[TaskCreate], List[TaskBulkError]]:
+    """Valida cada item como TaskCreate, separando os válidos dos erros."""
+    valid, errors = [], []
+    for index, item in enumerate(items, start=start_index):
+        try:
+            valid.append(TaskCreate.model_validate(item))
+        except ValidationError as exc:
+            errors.append(
+                TaskBulkError(
+                    index=index,
+                    errors=exc.errors(include_url=False, include_context=False),
+                )
+            )
+    return valid, errors
+
+
+def insert_tasks(
+    payloads: Sequence[TaskCreate], db: Session, *, owner_id: Optional[str] = None
+) -> List[TaskPublic]:
+    """
+    Insere várias tarefas num único INSERT ... RETURNING de várias linhas,
+    na ordem recebida. Não faz commit.
+    """
+    if not payloads:
+        return []
+    rows = [
+        {**payload.model_dump(include=TASK_COLUMNS), "owner_id": owner_id}
+        for payload in payloads
+    ]
+    created = db.scalars(
+        insert(Task).returning(Task, sort_by_parameter_order=True), rows
+    )
+    return [_task_db_to_schema(task) for task in created]
+
+
+def create_tasks(
+    payloads: Sequence[TaskCreate], db: Session, *, owner_id: Optional[str] = None
+) -> List[TaskPublic]:
+    """Cria várias tarefas com uma ida ao banco e um único commit."""
+    created = insert_tasks(payloads, db, owner_id=owner_id)
+    db.commit()
+    return created
+
+
 def list_tasks(db: Session, *, owner_id: Optional[str] = None) -> List[TaskPublic]:
     """Lista tarefas, opcionalmente filtradas por owner_id."""
-    query = db.query(Task)
+    stmt = select(*_public_columns())
+    if owner_id is not None:
+        stmt = stmt.where(Task.owner_id == owner_id)
+    return [_task_row_to_schema(row) for row in db.execute(stmt)]
+
+
+def tasks_etag(
+    db: Session, *, owner_id: Optional[str], extra: Sequence[str] = ()
+) -> str:
+    """
+    ETag do estado das tarefas do dono: número de tarefas e maior
+    ``updated_at``, lidos do índice (owner_id, updated_at) sem carregar
+    nenhuma tarefa. ``extra`` entra no hash (parâmetros da consulta, versão
+    do modelo...). Criar, alterar ou apagar uma tarefa sempre muda o par.
+    """
+    stmt = select(func.count(), func.max(Task.updated_at))
+    if owner_id is not None:
+        stmt = stmt.where(Task.owner_id == owner_id)
+    count, last_update = db.execute(stmt).one()
+    state = [str(count), last_update.isoformat() if last_update else "", *extra]
+    return '"' + hashlib.sha1("|".join(state).encode()).hexdigest() + '"'
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _filter_conditions(
+    *,
+    status_in: Optional[Sequence[TaskStatus]] = None,
+    category_in: Optional[Sequence[TaskCategory]] = None,
+    priority_in: Optional[Sequence[TaskPriority]] = None,
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None,
+    updated_before: Optional[datetime] = None,
+) -> list:
+    conditions = []
+    if status_in:
+        conditions.append(Task.status.in_(status_in))
+    if category_in:
+        conditions.append(Task.category.in_(category_in))
+    if priority_in:
+        conditions.append(Task.priority.in_(priority_in))
+    if due_from is not None:
+        conditions.append(Task.due_date >= _naive_utc(due_from))
+    if due_to is not None:
+        conditions.append(Task.due_date <= _naive_utc(due_to))
+    if updated_before is not None:
+        conditions.append(Task.updated_at < _naive_utc(updated_before))
+    return conditions
+
+
+def _selection_conditions(
+    owner_id: Optional[str],
+    task_ids: Optional[Sequence[UUID]],
+    filters: Optional[TaskFilter],
+) -> list:
+    """Condições de uma mutação em lote: sempre do dono, por ids e/ou filtro."""
+    conditions = []
     if owner_id is not None:
-        query = query.filter(Task.owner_id == owner_id)
-    db_tasks = query.all()
-    return [_task_db_to_schema(task) for task in db_tasks]
+        conditions.append(Task.owner_id == owner_id)
+    if task_ids is not None:
+        conditions.append(Task.id.in_([str(task_id) for task_id in task_ids]))
+    if filters is not None:
+        conditions.extend(
+            _filter_conditions(
+                status_in=filters.status,
+                category_in=filters.category,
+                priority_in=filters.priority,
+                due_from=filters.due_from,
+                due_to=filters.due_to,
+                updated_before=filters.updated_before,
+            )
+        )
+    return conditions
+
+
+def encode_cursor(task: Any) -> str:
+    """Cursor opaco com a chave de ordenação (due_date, id) da tarefa."""
+    key = [task.due_date.isoformat() if task.due_date else None, task.id]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], str]:
+    try:
+        due_date, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (
+            datetime.fromisoformat(due_date) if due_date else None,
+            str(task_id),
+        )
+    except (binascii.Error, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def list_tasks_page(
+    db: Session,
+    *,
+    owner_id: Optional[str],
+    status_in: Optional[Sequence[TaskStatus]] = None,
+    category_in: Optional[Sequence[TaskCategory]] = None,
+    priority_in: Optional[Sequence[TaskPriority]] = None,
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Lista uma página de tarefas ordenada por (due_date, id), sem prazo por
+    último, e devolve o cursor da próxima página (None na última).
+
+    As tarefas vêm como dicts prontos para serializar (colunas de
+    TaskPublic lidas como tuplas), sem passar por validação do pydantic.
+
+    A paginação é por chave (keyset): cada página parte da última chave vista
+    e lê no máximo ``limit + 1`` linhas do índice, independente de quantas
+    tarefas o usuário tem. As tarefas com prazo e as sem prazo são lidas em
+    duas consultas para que cada uma seja um intervalo contínuo do índice.
+    """
+    base = select(*_public_columns()).where(
+        *_filter_conditions(
+            status_in=status_in,
+            category_in=category_in,
+            priority_in=priority_in,
+            due_from=due_from,
+            due_to=due_to,
+        )
+    )
+    if owner_id is not None:
+        base = base.where(Task.owner_id == owner_id)
+
+    after_due, after_id = decode_cursor(cursor) if cursor else (None, None)
+    rows: List[Row] = []
+    if after_id is None or after_due is not None:
+        stmt = base.where(Task.due_date.is_not(None))
+        if after_due is not None:
+            stmt = stmt.where(tuple_(Task.due_date, Task.id) > (after_due, after_id))
+        rows = db.execute(stmt.order_by(Task.due_date, Task.id).limit(limit + 1)).all()
+    if len(rows) <= limit and due_from is None and due_to is None:
+        stmt = base.where(Task.due_date.is_(None))
+        if after_id is not None and after_due is None:
+            stmt = stmt.where(Task.id > after_id)
+        rows.extend(db.execute(stmt.order_by(Task.id).limit(limit + 1 - len(rows))))
+
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return [_task_row_to_dict(row) for row in rows[:limit]], next_cursor
+
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        # Mesmo formato do GET /tasks (orjson com OPT_UTC_Z): UTC com "Z".
+        if value.tzinfo is timezone.utc:
+            return value.replace(tzinfo=None).isoformat() + "Z"
+        return value.isoformat()
+    return value
+
+
+def _export_row(row: Tuple) -> Dict[str, Any]:
+    """Linha do banco como na listagem (``due_date`` em UTC), pronta para texto."""
+    return {
+        column: _export_value(value)
+        for column, value in _task_row_to_dict(row).items()
+    }
+
+
+def _encode_ndjson(rows: Sequence[Tuple]) -> str:
+    return "".join(
+        json.dumps(_export_row(row), ensure_ascii=False) + "\n" for row in rows
+    )
+
+
+def _csv_text(rows: Iterable[Sequence[Any]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def _encode_csv(rows: Sequence[Tuple]) -> str:
+    return _csv_text(
+        ["" if value is None else value for value in _export_row(row).values()]
+        for row in rows
+    )
+
+
+def _export_statement(
+    owner_id: Optional[str],
+    *,
+    status_in: Optional[Sequence[TaskStatus]] = None,
+    category_in: Optional[Sequence[TaskCategory]] = None,
+    priority_in: Optional[Sequence[TaskPriority]] = None,
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None,
+):
+    stmt = (
+        select(*_public_columns())
+        .where(
+            *_filter_conditions(
+                status_in=status_in,
+                category_in=category_in,
+                priority_in=priority_in,
+                due_from=due_from,
+                due_to=due_to,
+            )
+        )
+        .order_by(Task.due_date, Task.id)
+    )
+    if owner_id is not None:
+        stmt = stmt.where(Task.owner_id == owner_id)
+    return stmt
 
 
 def get_task(db: Session, task_id: UUID) -> Optional[TaskPublic]:
     """Busca uma tarefa pelo ID."""
-    db_task = db.query(Task).filter(Task.id == str(task_id)).first()
-    if db_task is None:
-        return None
-    return _task_db_to_schema(db_task)
+    row = db.execute(
+        select(*_public_columns()).where(Task.id == str(task_id))
+    ).first()
+    return _task_row_to_schema(row) if row is not None else None
+
+
+def _update_returning(
+    db: Session, conditions: list, values: dict
+) -> List[TaskPublic]:
+    """
+    UPDATE ... RETURNING das colunas públicas, convertidas como linhas
+    confiáveis: a validação de TaskPublic recusaria tarefas atrasadas, que são
+    justamente as mais fechadas em lote.
+    """
+    stmt = (
+        update(Task)
+        .where(*conditions)
+        .values(**values, updated_at=datetime.now(timezone.utc))
+        .returning(*_public_columns())
+        .execution_options(synchronize_session=False)
+    )
+    return [_task_row_to_schema(row) for row in db.execute(stmt)]
 
 
 def update_task(
@@ -71,42 +436,166 @@ def update_task(
     data: TaskCreate,
     *,
     status: Optional[TaskStatus] = None,
+    owner_id: Optional[str] = None,
 ) -> Optional[TaskPublic]:
-    """Atualiza uma tarefa existente."""
-    db_task = db.query(Task).filter(Task.id == str(task_id)).first()
-    if db_task is None:
-        return None
-
-    if data.title is not None:
-        db_task.title = data.title
-    if data.description is not None:
-        db_task.description = data.description
-    if data.due_date is not None:
-        db_task.due_date = data.due_date
-    if data.priority is not None:
-        db_task.priority = data.priority
-
-    if data.category is not None:
-        db_task.category = data.category
-    if data.difficulty is not None:
-        db_task.difficulty = data.difficulty
-    if data.estimated_minutes is not None:
-        db_task.estimated_minutes = data.estimated_minutes
-
+    """Atualiza uma tarefa existente com um único UPDATE ... RETURNING."""
+    values = {
+        name: value
+        for name, value in data.model_dump(include=TASK_COLUMNS).items()
+        if value is not None and name != "status"
+    }
     if status is not None:
-        db_task.status = status
+        values["status"] = status
+    conditions = [Task.id == str(task_id)]
+    if owner_id is not None:
+        conditions.append(Task.owner_id == owner_id)
+    updated = _update_returning(db, conditions, values)
+    db.commit()
+    return updated[0] if updated else None
 
-    db_task.updated_at = datetime.now(timezone.utc)
+
+def update_tasks(
+    db: Session,
+    changes: TaskUpdate,
+    *,
+    owner_id: Optional[str],
+    task_ids: Optional[Sequence[UUID]] = None,
+    filters: Optional[TaskFilter] = None,
+) -> List[TaskPublic]:
+    """
+    Aplica ``changes`` às tarefas do dono selecionadas por ids e/ou filtro,
+    num único UPDATE ... RETURNING.
+    """
+    updated = _update_returning(
+        db,
+        _selection_conditions(owner_id, task_ids, filters),
+        changes.model_dump(include=changes.model_fields_set),
+    )
     db.commit()
-    db.refresh(db_task)
-    return _task_db_to_schema(db_task)
+    return updated
 
 
-def delete_task(db: Session, task_id: UUID) -> bool:
+def delete_task(
+    db: Session, task_id: UUID, *, owner_id: Optional[str] = None
+) -> bool:
     """Deleta uma tarefa do banco de dados."""
-    db_task = db.query(Task).filter(Task.id == str(task_id)).first()
-    if db_task is None:
-        return False
-    db.delete(db_task)
+    return bool(delete_tasks(db, owner_id=owner_id, task_ids=[task_id]))
+
+
+def delete_tasks(
+    db: Session,
+    *,
+    owner_id: Optional[str],
+    task_ids: Optional[Sequence[UUID]] = None,
+    filters: Optional[TaskFilter] = None,
+) -> List[str]:
+    """
+    Remove as tarefas do dono selecionadas por ids e/ou filtro num único
+    DELETE ... RETURNING e devolve os ids removidos.
+    """
+    stmt = (
+        delete(Task)
+        .where(*_selection_conditions(owner_id, task_ids, filters))
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = db.scalars(stmt).all()
     db.commit()
-    return True
+    return list(deleted)
+
+
+# Versões assíncronas, para as rotas com AsyncSession. Cada uma roda a versão
+# síncrona com ``run_sync``: o SQL vai pelo driver assíncrono (o loop fica
+# livre enquanto o banco responde) e as consultas continuam definidas num
+# lugar só.
+
+
+async def create_task_async(
+    payload: TaskCreate, db: AsyncSession, *, owner_id: Optional[str] = None
+) -> TaskPublic:
+    return await db.run_sync(
+        lambda session: create_task(payload, session, owner_id=owner_id)
+    )
+
+
+async def create_tasks_async(
+    payloads: Sequence[TaskCreate], db: AsyncSession, *, owner_id: Optional[str] = None
+) -> List[TaskPublic]:
+    return await db.run_sync(
+        lambda session: create_tasks(payloads, session, owner_id=owner_id)
+    )
+
+
+async def tasks_etag_async(
+    db: AsyncSession, *, owner_id: Optional[str], extra: Sequence[str] = ()
+) -> str:
+    return await db.run_sync(tasks_etag, owner_id=owner_id, extra=extra)
+
+
+async def list_tasks_page_async(
+    db: AsyncSession,
+    *,
+    owner_id: Optional[str],
+    state: Optional[str] = None,
+    **params: Any,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    ``list_tasks_page`` com o cache de listagens. ``state`` é o ETag das
+    tarefas do dono lido antes da consulta: a página fica no cache sob esse
+    estado (sem ele, não há cache). O cache é acessado fora do ``run_sync``,
+    que roda no loop: com o backend Redis, cada acesso vai para uma thread.
+    """
+    cache_key = cache.key(owner_id, state, **params)
+    cached = await cache.get_async(cache_key)
+    if cached is not None:
+        tasks, next_cursor = cached
+        return list(tasks), next_cursor
+
+    tasks, next_cursor = await db.run_sync(
+        list_tasks_page, owner_id=owner_id, **params
+    )
+    await cache.set_async(cache_key, (tasks, next_cursor))
+    return list(tasks), next_cursor
+
+
+async def export_tasks_async(
+    bind: AsyncEngine,
+    *,
+    owner_id: Optional[str],
+    export_format: str = "ndjson",
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+    **filters: Any,
+) -> AsyncIterator[str]:
+    """
+    Gera a exportação em NDJSON ou CSV, um bloco de ``chunk_rows`` linhas
+    por vez, lendo as tuplas das colunas com um cursor no servidor.
+
+    Abre a própria conexão em ``bind``: o gerador é consumido pela
+    StreamingResponse depois que a sessão da requisição já foi fechada.
+    """
+    stmt = _export_statement(owner_id, **filters)
+    encode = _encode_csv if export_format == "csv" else _encode_ndjson
+    if export_format == "csv":
+        yield _csv_text([PUBLIC_COLUMNS])
+    async with bind.connect() as connection:
+        result = await connection.stream(
+            stmt.execution_options(yield_per=chunk_rows)
+        )
+        async for rows in result.partitions():
+            yield encode(rows)
+
+
+async def update_tasks_async(
+    db: AsyncSession, changes: TaskUpdate, **selection: Any
+) -> List[TaskPublic]:
+    return await db.run_sync(update_tasks, changes, **selection)
+
+
+async def delete_task_async(
+    db: AsyncSession, task_id: UUID, *, owner_id: Optional[str] = None
+) -> bool:
+    return await db.run_sync(delete_task, task_id, owner_id=owner_id)
+
+
+async def delete_tasks_async(db: AsyncSession, **selection: Any) -> List[str]:
+    return await db.run_sync(delete_tasks, **selection)
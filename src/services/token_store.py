@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from src.core import config, security
+from src.models.schemas import TokenData
+from src.services.task_cache import MemoryBackend
+
+
+class TokenCache:
+    """
+    Tokens já validados (assinatura e expiração), por alguns segundos, para
+    não decodificar o JWT a cada requisição. Uma entrada nunca sobrevive à
+    expiração do próprio token.
+    """
+
+    def __init__(self, *, max_entries: int = 10_000, ttl_seconds: float = 60.0) -> None:
+        self._entries = MemoryBackend(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, token: str) -> Optional[TokenData]:
+        token_data = self._entries.get(token)
+        if isinstance(token_data, TokenData) and token_data.expires_at > time.time():
+            with self._stats_lock:
+                self._hits += 1
+            return token_data
+        with self._stats_lock:
+            self._misses += 1
+        return None
+
+    def set(self, token: str, token_data: TokenData) -> None:
+        self._entries.set(token, token_data)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": self._entries.size(),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
+
+
+class RevocationList:
+    """
+    Revogações em memória: tokens encerrados no logout (pelo ``jti``) e
+    usuários cujos tokens emitidos até um instante não valem mais (conta
+    removida, senha trocada...). Cada entrada só é guardada enquanto algum
+    token afetado ainda poderia estar dentro da validade.
+
+    As revogações também são gravadas no banco; ``merge`` junta as lidas de
+    lá, para cada worker ver as que os outros receberam (com o atraso da
+    sincronização, ``KAIROS_REVOCATION_SYNC_SECONDS``).
+    """
+
+    def __init__(
+        self,
+        *,
+        token_lifetime_seconds: float = security.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    ) -> None:
+        self.token_lifetime_seconds = token_lifetime_seconds
+        self._lock = threading.Lock()
+        self._tokens: Dict[str, float] = {}
+        self._users: Dict[str, float] = {}
+
+    def _prune(self, now: float) -> None:
+        self._tokens = {
+            jti: expires_at
+            for jti, expires_at in self._tokens.items()
+            if expires_at > now
+        }
+        self._users = {
+            user_id: revoked_at
+            for user_id, revoked_at in self._users.items()
+            if revoked_at + self.token_lifetime_seconds > now
+        }
+
+    def revoke_token(self, token_data: TokenData) -> None:
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            if token_data.jti and token_data.expires_at and token_data.expires_at > now:
+                self._tokens[token_data.jti] = token_data.expires_at
+
+    def revoke_user(self, user_id: str, revoked_at: Optional[float] = None) -> None:
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            self._users[str(user_id)] = now if revoked_at is None else revoked_at
+
+    def merge(self, tokens: Dict[str, float], users: Dict[str, float]) -> None:
+        """Junta as revogações lidas do banco às que o worker já conhece."""
+        with self._lock:
+            self._tokens.update(tokens)
+            for user_id, revoked_at in users.items():
+                if revoked_at > self._users.get(user_id, float("-inf")):
+                    self._users[user_id] = revoked_at
+            self._prune(time.time())
+
+    def is_revoked(self, token_data: TokenData) -> bool:
+        if token_data.jti in self._tokens:
+            return True
+        revoked_at = self._users.get(token_data.user_id)
+        return revoked_at is not None and (token_data.issued_at or 0) <= revoked_at
+
+    def metrics(self) -> Dict[str, int]:
+        return {"revoked_tokens": len(self._tokens), "revoked_users": len(self._users)}
+
+
+token_cache = TokenCache(
+    max_entries=config.TOKEN_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.TOKEN_CACHE_TTL_SECONDS,
+)
+revocations = RevocationList()
+
+
+__all__ = ["RevocationList", "TokenCache", "revocations", "token_cache"]
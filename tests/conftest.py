@@ -1,20 +1,64 @@
+import tempfile
+from pathlib import Path
+
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
-from src.core.database import Base, get_db
+from src.core.database import Base, get_async_db, get_db
 from src.main import app
 
-SQLALCHEMY_DATABASE_URL = "sqlite://"
+# As rotas usam o engine síncrono e o assíncrono ao mesmo tempo, então o banco
+# de teste é um arquivo que os dois enxergam (um SQLite em memória existe só
+# dentro da própria conexão).
+DATABASE_PATH = Path(tempfile.mkdtemp(prefix="kairos-tests-")) / "test.db"
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# NullPool: cada TestClient roda num event loop próprio, e conexões do
+# aiosqlite não podem passar de um loop para outro.
+async_engine = create_async_engine(
+    f"sqlite+aiosqlite:///{DATABASE_PATH}", poolclass=NullPool
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+@event.listens_for(engine, "connect")
+@event.listens_for(async_engine.sync_engine, "connect")
+def _skip_fsync(dbapi_connection, connection_record):
+    # O banco de teste é descartável: sem fsync a cada commit.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.close()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def sklearn_model():
+    """
+    Os testes de IA comparam as predições com o sklearn: o modelo é sempre
+    carregado dos pickles (inclusive a cada startup do app), mesmo que
+    scripts/convert_model.py já tenha gerado os arrays, que abrem sem
+    ``model`` nem ``encoder``. Os testes do formato mmap o ligam à parte.
+    """
+    from src.core import config
+    from src.services.model_registry import registry
+
+    mmap, config.MODEL_MMAP = config.MODEL_MMAP, False
+    active = registry.active
+    if active is not None:
+        registry.reload(active.version)
+    yield
+    config.MODEL_MMAP = mmap
+
 
 @pytest.fixture(scope="function")
 def db_session():
@@ -31,8 +75,8 @@ def db_session():
 @pytest.fixture(scope="function")
 def client(db_session):
     """
-    Sobrescreve a dependência get_db da API para usar o banco de teste.
-    Isso engana a API para ela usar o SQLite em memória durante o teste.
+    Sobrescreve as dependências de banco da API para usar o banco de teste.
+    Isso engana a API para ela usar o SQLite temporário durante o teste.
     """
 
     def override_get_db():
@@ -41,7 +85,12 @@ def client(db_session):
         finally:
             db_session.close()
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     from fastapi.testclient import TestClient
 
     with TestClient(app) as c:
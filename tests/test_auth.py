@@ -1,4 +1,8 @@
 from __future__ import annotations
+import threading
+import time
+
+import anyio
 import pytest
 from fastapi.testclient import TestClient
 
@@ -104,3 +108,254 @@ def test_login_user_not_found(client: TestClient):
 
     assert response.status_code == 401
     assert response.json()["detail"] == "Email ou senha incorretos"
+
+
+def test_login_rejected_fast_when_hash_queue_is_full(client: TestClient, monkeypatch):
+    """
+    Testa se, com todas as threads do bcrypt ocupadas e a fila cheia, o
+    login responde 503 na hora em vez de esperar a vez.
+    """
+    from src.services import auth_service
+    from src.services.password_hasher import PasswordHasher
+
+    client.post(
+        "/auth/register",
+        json={"email": "fila@example.com", "password": "senhaforte123"},
+    )
+
+    hasher = PasswordHasher(max_workers=1, max_queue=0)
+    monkeypatch.setattr(auth_service, "password_hasher", hasher)
+    release = threading.Event()
+    busy = threading.Thread(
+        target=anyio.run, args=(hasher._run, release.wait, 5), daemon=True
+    )
+    busy.start()
+    for _ in range(100):
+        if hasher.metrics()["in_flight"]:
+            break
+        time.sleep(0.01)
+
+    response = client.post(
+        "/auth/login", json={"email": "fila@example.com", "password": "senhaforte123"}
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+    release.set()
+    busy.join(timeout=5)
+    response = client.post(
+        "/auth/login", json={"email": "fila@example.com", "password": "senhaforte123"}
+    )
+    assert response.status_code == 200
+    metrics = hasher.metrics()
+    assert metrics["rejected"] == 1
+    assert metrics["completed"] == 2
+    assert metrics["in_flight"] == 0
+
+
+def _token(client: TestClient, email: str) -> str:
+    client.post("/auth/register", json={"email": email, "password": "senhaforte123"})
+    return client.post(
+        "/auth/login", json={"email": email, "password": "senhaforte123"}
+    ).json()["access_token"]
+
+
+def test_authenticated_requests_do_not_query_users_and_logout_revokes(
+    client: TestClient,
+):
+    """
+    Testa se a autenticação usa só o token (nenhuma consulta à tabela de
+    usuários), se o logout revoga o token e se tokens sem o claim uid são
+    recusados.
+    """
+    from sqlalchemy import event
+
+    from src.core import security
+    from tests.conftest import async_engine
+
+    token = _token(client, "stateless@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        for _ in range(3):
+            assert client.get("/tasks", headers=headers).status_code == 200
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    assert statements
+    assert not [statement for statement in statements if "users" in statement]
+
+    assert client.post("/auth/logout", headers=headers).status_code == 204
+    assert client.get("/tasks", headers=headers).status_code == 401
+
+    new_headers = {"Authorization": f"Bearer {_token(client, 'stateless@example.com')}"}
+    assert client.get("/tasks", headers=new_headers).status_code == 200
+
+    legacy = security.create_access_token(data={"sub": "stateless@example.com"})
+    legacy_headers = {"Authorization": f"Bearer {legacy}"}
+    assert client.get("/tasks", headers=legacy_headers).status_code == 401
+
+
+def test_admin_can_revoke_all_tokens_of_a_user(client: TestClient, monkeypatch):
+    """
+    Testa se revogar os tokens de um usuário derruba os já emitidos (access e
+    refresh), mas não os de um login feito depois.
+    """
+    from src.core import config, security
+
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "segredo")
+    client.post(
+        "/auth/register",
+        json={"email": "revogado@example.com", "password": "senhaforte123"},
+    )
+    old_login = client.post(
+        "/auth/login",
+        json={"email": "revogado@example.com", "password": "senhaforte123"},
+    ).json()
+    old_token = old_login["access_token"]
+    old_headers = {"Authorization": f"Bearer {old_token}"}
+    assert client.get("/tasks", headers=old_headers).status_code == 200
+    user_id = security.verify_token(old_token, Exception()).user_id
+
+    response = client.post(
+        f"/admin/users/{user_id}/revoke-tokens", headers={"X-Admin-Token": "segredo"}
+    )
+    assert response.status_code == 204
+    assert client.get("/tasks", headers=old_headers).status_code == 401
+    response = client.post(
+        "/auth/refresh", json={"refresh_token": old_login["refresh_token"]}
+    )
+    assert response.status_code == 401
+
+    new_headers = {"Authorization": f"Bearer {_token(client, 'revogado@example.com')}"}
+    assert client.get("/tasks", headers=new_headers).status_code == 200
+
+
+def test_refresh_rotates_tokens_without_bcrypt_and_detects_reuse(
+    client: TestClient, db_session, monkeypatch
+):
+    """
+    Testa o /auth/refresh: devolve um par novo sem passar pelo bcrypt, guarda
+    só o hash do refresh token e, se um token já trocado for reapresentado,
+    revoga a família inteira.
+    """
+    from src.core import security
+    from src.models.database import RefreshToken
+
+    client.post(
+        "/auth/register",
+        json={"email": "refresh@example.com", "password": "senhaforte123"},
+    )
+    login = client.post(
+        "/auth/login",
+        json={"email": "refresh@example.com", "password": "senhaforte123"},
+    ).json()
+    assert login["refresh_token"]
+    assert login["expires_in"] == security.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    stored = [row.token_hash for row in db_session.query(RefreshToken)]
+    assert len(stored) == 1 and login["refresh_token"] not in stored[0]
+
+    def no_bcrypt(*args, **kwargs):
+        raise AssertionError("refresh must not verify passwords")
+
+    monkeypatch.setattr(security, "verify_password", no_bcrypt)
+    monkeypatch.setattr(security, "get_password_hash", no_bcrypt)
+
+    response = client.post(
+        "/auth/refresh", json={"refresh_token": login["refresh_token"]}
+    )
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != login["refresh_token"]
+    headers = {"Authorization": f"Bearer {rotated['access_token']}"}
+    assert client.get("/tasks", headers=headers).status_code == 200
+
+    # O token antigo já foi trocado: reusá-lo derruba também o novo.
+    reused = client.post(
+        "/auth/refresh", json={"refresh_token": login["refresh_token"]}
+    )
+    assert reused.status_code == 401
+    response = client.post(
+        "/auth/refresh", json={"refresh_token": rotated["refresh_token"]}
+    )
+    assert response.status_code == 401
+
+    assert (
+        client.post("/auth/refresh", json={"refresh_token": "desconhecido"}).status_code
+        == 401
+    )
+
+
+def test_logout_with_refresh_token_ends_the_session(client: TestClient):
+    """Testa se o logout com o refresh token impede renovar a sessão."""
+    client.post(
+        "/auth/register",
+        json={"email": "sair@example.com", "password": "senhaforte123"},
+    )
+    login = client.post(
+        "/auth/login", json={"email": "sair@example.com", "password": "senhaforte123"}
+    ).json()
+    headers = {"Authorization": f"Bearer {login['access_token']}"}
+
+    response = client.post(
+        "/auth/logout", json={"refresh_token": login["refresh_token"]}, headers=headers
+    )
+    assert response.status_code == 204
+    assert client.get("/tasks", headers=headers).status_code == 401
+    response = client.post(
+        "/auth/refresh", json={"refresh_token": login["refresh_token"]}
+    )
+    assert response.status_code == 401
+
+
+def test_revocations_reach_other_workers(client: TestClient, monkeypatch):
+    """
+    Testa se o logout e a revogação de todos os tokens ficam gravados no
+    banco, de onde outro worker (outra RevocationList) passa a recusá-los.
+    """
+    from src.core import config, security
+    from src.services import auth_service
+    from src.services.token_store import RevocationList
+    from tests.conftest import TestingAsyncSessionLocal
+
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "segredo")
+    logged_out = _token(client, "workers@example.com")
+    kept = _token(client, "workers@example.com")
+    assert (
+        client.post(
+            "/auth/logout", headers={"Authorization": f"Bearer {logged_out}"}
+        ).status_code
+        == 204
+    )
+
+    other_worker = RevocationList()
+
+    async def sync():
+        async with TestingAsyncSessionLocal() as db:
+            other_worker.merge(
+                *await auth_service.load_revocations_async(
+                    db, token_lifetime_seconds=other_worker.token_lifetime_seconds
+                )
+            )
+
+    logged_out_data = security.verify_token(logged_out, Exception())
+    kept_data = security.verify_token(kept, Exception())
+    assert not other_worker.is_revoked(logged_out_data)
+    anyio.run(sync)
+    assert other_worker.is_revoked(logged_out_data)
+    assert not other_worker.is_revoked(kept_data)
+
+    response = client.post(
+        f"/admin/users/{kept_data.user_id}/revoke-tokens",
+        headers={"X-Admin-Token": "segredo"},
+    )
+    assert response.status_code == 204
+    anyio.run(sync)
+    assert other_worker.is_revoked(kept_data)
+    newer = security.verify_token(_token(client, "workers@example.com"), Exception())
+    assert not other_worker.is_revoked(newer)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, exc, inspect, text
+
+from src.core.database import (
+    Base,
+    InstrumentedQueuePool,
+    get_async_db,
+    pool_metrics,
+    upgrade_db,
+)
+from src.main import app
+
+
+@pytest.fixture
+def small_pool_engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        connect_args={"check_same_thread": False},
+        poolclass=InstrumentedQueuePool,
+        pool_size=2,
+        max_overflow=1,
+        pool_timeout=0.2,
+        pool_pre_ping=True,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_pool_saturation_times_out_and_is_measured(small_pool_engine):
+    """
+    Testa o pool saturado: com 2 conexões fixas + 1 de overflow, seis
+    threads segurando conexões ao mesmo tempo deixam três esperando até o
+    timeout, e as métricas mostram o overflow, os timeouts e as esperas.
+    """
+    holding = threading.Barrier(4)
+    release = threading.Event()
+    outcomes = []
+    lock = threading.Lock()
+
+    def worker() -> None:
+        try:
+            with small_pool_engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                with lock:
+                    outcomes.append("ok")
+                holding.wait(timeout=5)
+                release.wait(timeout=5)
+        except exc.TimeoutError:
+            with lock:
+                outcomes.append("timeout")
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    holding.wait(timeout=5)
+
+    saturated = pool_metrics(small_pool_engine)
+    assert saturated["pool"] == "InstrumentedQueuePool"
+    assert saturated["checked_out"] == 3
+    assert saturated["overflow"] == 1
+
+    # Os que não conseguiram conexão desistem depois do pool_timeout.
+    deadline = time.monotonic() + 5
+    while outcomes.count("timeout") < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(outcomes) == ["ok"] * 3 + ["timeout"] * 3
+    metrics = pool_metrics(small_pool_engine)
+    assert metrics["checked_out"] == 0
+    assert metrics["timeouts"] == 3
+    assert metrics["max_wait_ms"] >= 200
+    assert sum(metrics["wait_ms_histogram"].values()) == 6
+
+
+def test_pool_timeout_returns_503(client):
+    """Testa se o pool esgotado vira 503 com Retry-After, e não um 500."""
+
+    async def exhausted_db():
+        raise exc.TimeoutError("QueuePool limit reached")
+        yield
+
+    app.dependency_overrides[get_async_db] = exhausted_db
+    response = client.post(
+        "/auth/register", json={"email": "pool@test.com", "password": "senhaforte123"}
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_upgrade_db_brings_old_schema_up_to_date(tmp_path):
+    """
+    Testa a atualização de um banco criado pela versão original: as colunas
+    ai_* e os índices de listagem entram, os dados ficam e rodar de novo não
+    muda nada.
+    """
+    import src.models.database  # noqa: F401 (registra as tabelas)
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE users (id VARCHAR PRIMARY KEY, email VARCHAR NOT NULL, "
+                "hashed_password VARCHAR NOT NULL, created_at DATETIME NOT NULL)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE TABLE tasks (id VARCHAR PRIMARY KEY, title VARCHAR(120) "
+                "NOT NULL, description TEXT, due_date DATETIME, category VARCHAR "
+                "NOT NULL, difficulty INTEGER NOT NULL, estimated_minutes INTEGER "
+                "NOT NULL, priority VARCHAR NOT NULL, status VARCHAR NOT NULL, "
+                "owner_id VARCHAR, created_at DATETIME NOT NULL, "
+                "updated_at DATETIME NOT NULL)"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO tasks VALUES ('t1', 'Antiga', NULL, NULL, 'TRABALHO', "
+                "3, 60, 'medium', 'pending', NULL, '2024-01-01', '2024-01-01')"
+            )
+        )
+
+    Base.metadata.create_all(bind=engine)
+    applied = upgrade_db(engine)
+    assert {"tasks.ai_score", "ix_tasks_owner_updated"} <= set(applied)
+
+    inspector = inspect(engine)
+    columns = {column["name"] for column in inspector.get_columns("tasks")}
+    assert {"ai_score", "ai_scored_at", "ai_model_version"} <= columns
+    indexes = {index["name"] for index in inspector.get_indexes("tasks")}
+    assert "ix_tasks_owner_due_id" in indexes
+    assert "refresh_tokens" in inspector.get_table_names()
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT title FROM tasks")).scalar_one() == "Antiga"
+
+    assert upgrade_db(engine) == []
+    engine.dispose()
@@ -0,0 +1,646 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.models.schemas import TaskCategory, TaskPublic
+from src.services import ia_service
+
+
+def build_task(**overrides) -> TaskPublic:
+    """Helper auxiliar para criar tarefas em memória."""
+    base = {
+        "title": "Tarefa IA",
+        "due_date": datetime.now(timezone.utc) + timedelta(days=3),
+        "category": TaskCategory.TRABALHO,
+        "difficulty": 3,
+        "estimated_minutes": 60,
+    }
+    base.update(overrides)
+    return TaskPublic(**base)
+
+
+def reference_score(task: TaskPublic, now: datetime) -> int:
+    """
+    Predição de uma tarefa como na versão original: um DataFrame de uma
+    linha, categoria pelo LabelEncoder e ``predict`` direto no sklearn.
+    """
+    import pandas as pd
+
+    from src.services.model_registry import registry
+
+    bundle = registry.active
+    days_until = 30
+    if task.due_date:
+        days_until = max(0, (task.due_date - now).days)
+    features = pd.DataFrame(
+        [
+            {
+                "days_until_due": days_until,
+                "estimated_minutes": task.estimated_minutes,
+                "difficulty": task.difficulty,
+                "category_encoded": bundle.encoder.transform([task.category.value])[0],
+            }
+        ]
+    )
+    return int(bundle.model.predict(features)[0])
+
+
+def test_batch_scores_match_single_predictions():
+    """
+    Testa se o caminho em lote (matriz única, categorias pré-codificadas,
+    floresta compilada) devolve o mesmo score da predição unitária original.
+    """
+    tasks = [
+        build_task(
+            due_date=datetime.now(timezone.utc) + timedelta(days=days),
+            category=category,
+            difficulty=(days % 5) + 1,
+            estimated_minutes=15 + days * 17,
+        )
+        for days, category in zip(range(0, 28, 2), list(TaskCategory) * 2)
+    ]
+    tasks.append(build_task(due_date=None))
+    now = datetime.now(timezone.utc)
+
+    scores = ia_service.predict_priority_scores(tasks, now=now)
+
+    assert scores == [reference_score(t, now) for t in tasks]
+    assert len(set(scores)) > 1
+
+
+def test_batch_scores_fallback_for_failing_rows():
+    """
+    Testa se uma linha inválida recebe score 1 sem derrubar o lote.
+    """
+    good = build_task(due_date=datetime.now(timezone.utc))
+    broken = build_task()
+    object.__setattr__(broken, "category", None)
+    now = datetime.now(timezone.utc)
+
+    scores = ia_service.predict_priority_scores([good, broken], now=now)
+
+    assert scores[0] == reference_score(good, now)
+    assert scores[1] == 1
+
+
+def test_optimize_schedule_writes_back_in_one_statement(db_session):
+    """
+    Testa se a gravação das prioridades é um único UPDATE, restrito ao dono
+    e apenas para as tarefas cuja prioridade mudou.
+    """
+    from sqlalchemy import event
+
+    from src.models.database import Task, User
+    from src.services import task_service
+    from src.models.schemas import TaskCreate
+
+    owner = User(email="ia@example.com", hashed_password="x")
+    db_session.add(owner)
+    db_session.commit()
+
+    for days in (0, 1, 2, 20, 25):
+        task_service.create_task(
+            TaskCreate(
+                title=f"Tarefa {days}",
+                due_date=datetime.now(timezone.utc) + timedelta(days=days),
+                category=TaskCategory.LAZER,
+                estimated_minutes=300,
+                priority="low",
+            ),
+            db_session,
+            owner_id=owner.id,
+        )
+    tasks = task_service.list_tasks(db_session, owner_id=owner.id)
+    expected = ia_service.predict_priority_scores(tasks)
+
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db_session.get_bind(), "before_cursor_execute", capture)
+    try:
+        ia_service.optimize_schedule(tasks, db_session, owner_id=owner.id)
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", capture)
+
+    updates = [s for s in statements if s.startswith("UPDATE")]
+    assert len(updates) == 1
+    assert len([s for s in statements if s.startswith("SELECT")]) == 1
+
+    db_session.expire_all()
+    stored = {
+        t.title: t.priority.value for t in db_session.query(Task).all()
+    }
+    for task, score in zip(tasks, expected):
+        assert stored[task.title] == ia_service.score_to_priority(score).value
+
+
+def test_registry_reload_swaps_atomically(tmp_path):
+    """
+    Testa se o registro publica versões, troca o modelo ativo e mantém a
+    versão anterior quando o carregamento da nova falha.
+    """
+    from src.services.model_registry import (
+        ModelLoadError,
+        ModelRegistry,
+        registry,
+    )
+
+    current = registry.active
+    local = ModelRegistry(tmp_path)
+    assert local.active is None
+
+    first = local.publish(current.model, current.encoder, version="001")
+    local.reload()
+    bundle = local.active
+    assert bundle.version == first
+
+    local.publish(current.model, current.encoder, version="002")
+    (tmp_path / "002" / "kairos_model.pkl").write_bytes(b"corrompido")
+
+    with pytest.raises(ModelLoadError):
+        local.reload()
+    assert local.active is bundle
+    assert local.list_versions() == ["001", "002"]
+
+
+def test_admin_reload_requires_token(client, monkeypatch):
+    """
+    Testa se as rotas de administração exigem o X-Admin-Token configurado.
+    """
+    from src.core import config
+
+    monkeypatch.setattr(config, "ADMIN_TOKEN", None)
+    assert client.post("/admin/model/reload").status_code == 403
+
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "segredo")
+    assert (
+        client.get("/admin/model", headers={"X-Admin-Token": "errado"}).status_code
+        == 403
+    )
+
+    response = client.post(
+        "/admin/model/reload",
+        json={"version": "legacy"},
+        headers={"X-Admin-Token": "segredo"},
+    )
+    assert response.status_code == 200
+    assert response.json()["active_version"] == "legacy"
+
+    response = client.post(
+        "/admin/model/reload",
+        json={"version": "inexistente"},
+        headers={"X-Admin-Token": "segredo"},
+    )
+    assert response.status_code == 409
+
+
+def test_compiled_forest_matches_sklearn():
+    """
+    Testa se o avaliador compilado reproduz exatamente model.predict.
+    """
+    import numpy as np
+    import pandas as pd
+
+    from src.services.compiled_forest import CompiledForest
+    from src.services.model_registry import registry
+
+    model = registry.active.model
+    forest = CompiledForest.from_sklearn(model)
+
+    rng = np.random.default_rng(42)
+    size = 5000
+    features = np.column_stack(
+        [
+            rng.integers(0, 45, size),
+            rng.integers(1, 600, size),
+            rng.integers(1, 6, size),
+            rng.integers(0, 7, size),
+        ]
+    ).astype(np.float64)
+    frame = pd.DataFrame(features, columns=model.feature_names_in_)
+
+    np.testing.assert_array_equal(forest.predict(features), model.predict(frame))
+    np.testing.assert_allclose(
+        forest.predict_proba(features), model.predict_proba(frame)
+    )
+    assert forest.predict(features[:0]).shape == (0,)
+
+
+def test_compiled_forest_zero_weight_nodes_are_zero():
+    """Testa se nós sem amostras viram probabilidade 0, não lixo de memória."""
+    from types import SimpleNamespace
+
+    import numpy as np
+
+    from src.services.compiled_forest import CompiledForest
+
+    tree = SimpleNamespace(
+        node_count=3,
+        children_left=np.array([1, -1, -1]),
+        children_right=np.array([2, -1, -1]),
+        feature=np.array([0, -2, -2]),
+        threshold=np.array([0.5, -2.0, -2.0]),
+        value=np.array([[[4.0, 0.0]], [[0.0, 0.0]], [[4.0, 0.0]]]),
+    )
+    model = SimpleNamespace(
+        estimators_=[SimpleNamespace(tree_=tree)], classes_=np.array([0, 1])
+    )
+
+    forest = CompiledForest.from_sklearn(model)
+
+    np.testing.assert_array_equal(forest.values[1], [0.0, 0.0])
+    np.testing.assert_array_equal(forest.values[2], [1.0, 0.0])
+
+
+def test_priority_lookup_matches_model_and_rebuilds_on_reload(tmp_path, monkeypatch):
+    """
+    Testa se a tabela pré-calculada concorda com o modelo e se é montada
+    novamente a cada reload.
+    """
+    import numpy as np
+
+    from src.core import config
+    from src.services.model_registry import ModelRegistry
+
+    monkeypatch.setattr(config, "PRIORITY_LOOKUP", True)
+    local = ModelRegistry(tmp_path, legacy_dir=config.IA_DIR)
+    bundle = local.reload()
+    assert bundle.lookup is not None
+
+    rng = np.random.default_rng(7)
+    size = 20_000
+    features = np.column_stack(
+        [
+            rng.integers(0, 60, size),
+            rng.integers(1, 900, size),
+            rng.integers(1, 6, size),
+            rng.integers(0, 7, size),
+        ]
+    ).astype(np.float64)
+    np.testing.assert_array_equal(
+        bundle.lookup.predict(features), bundle.forest.predict(features)
+    )
+
+    reloaded = local.reload()
+    assert reloaded.lookup is not None
+    assert reloaded.lookup is not bundle.lookup
+
+
+def test_inference_batcher_merges_concurrent_requests():
+    """
+    Testa se pedidos concorrentes viram um só predict e se cada um recebe
+    a sua fatia do resultado.
+    """
+    import threading
+
+    import numpy as np
+
+    from src.services.inference_batcher import InferenceBatcher
+    from src.services.model_registry import registry
+
+    bundle = registry.active
+    batcher = InferenceBatcher(max_batch_rows=10_000, max_wait_ms=200)
+    rng = np.random.default_rng(3)
+    requests = [
+        np.column_stack(
+            [
+                rng.integers(0, 31, size),
+                rng.integers(15, 481, size),
+                rng.integers(1, 6, size),
+                rng.integers(0, 7, size),
+            ]
+        ).astype(np.float64)
+        for size in (1, 5, 20, 3, 8, 13)
+    ]
+    results = [None] * len(requests)
+
+    def worker(index):
+        results[index] = batcher.predict(bundle, requests[index])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(requests))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for features, result in zip(requests, results):
+        np.testing.assert_array_equal(result, bundle.predict(features))
+
+    metrics = batcher.metrics()
+    assert metrics["requests"] == len(requests)
+    assert metrics["rows"] == sum(len(r) for r in requests)
+    assert metrics["batches"] < len(requests)
+    assert metrics["queue_depth"] == 0
+
+
+def test_optimize_schedule_only_rescores_stale_tasks(db_session, monkeypatch):
+    """
+    Testa se a reotimização reaproveita o score salvo e só reavalia tarefas
+    novas, alteradas ou avaliadas por outra versão do modelo.
+    """
+    from src.models.database import Task, User
+    from src.models.schemas import TaskCreate
+    from src.services import task_service
+    from src.services.model_registry import registry
+
+    owner = User(email="incremental@example.com", hashed_password="x")
+    db_session.add(owner)
+    db_session.commit()
+
+    def create(title, days):
+        return task_service.create_task(
+            TaskCreate(
+                title=title,
+                due_date=datetime.now(timezone.utc) + timedelta(days=days, hours=12),
+            ),
+            db_session,
+            owner_id=owner.id,
+        )
+
+    first = create("Primeira", 1)
+    create("Segunda", 12)
+
+    scored = []
+    original = ia_service.predict_priority_scores
+
+    def counting(tasks, **kwargs):
+        scored.append(sorted(t.title for t in tasks))
+        return original(tasks, **kwargs)
+
+    monkeypatch.setattr(ia_service, "predict_priority_scores", counting)
+
+    def optimize():
+        tasks = task_service.list_tasks(db_session, owner_id=owner.id)
+        return ia_service.optimize_schedule(tasks, db_session, owner_id=owner.id)
+
+    initial = optimize()
+    assert scored.pop() == ["Primeira", "Segunda"]
+
+    again = optimize()
+    assert scored.pop() == []
+    assert [t.id for t in again] == [t.id for t in initial]
+    assert [t.priority for t in again] == [t.priority for t in initial]
+
+    create("Terceira", 3)
+    task_service.update_task(
+        db_session, first.id, TaskCreate(title="Primeira editada", difficulty=5)
+    )
+    optimize()
+    assert scored.pop() == ["Primeira editada", "Terceira"]
+
+    stored = db_session.query(Task).filter(Task.title == "Terceira").one()
+    assert stored.ai_model_version == registry.active.version
+    assert stored.ai_scored_at is not None
+
+    def saved_scores():
+        db_session.expire_all()
+        return {
+            t.id: (t.ai_score, t.ai_scored_at, t.ai_model_version)
+            for t in db_session.query(Task)
+        }
+
+    before = saved_scores()
+    client_tasks = [
+        t.model_copy(update={"due_date": None, "difficulty": 1})
+        for t in task_service.list_tasks(db_session, owner_id=owner.id)
+    ]
+    ia_service.optimize_schedule(
+        client_tasks, db_session, owner_id=owner.id, reuse_scores=False
+    )
+    assert scored.pop() == ["Primeira editada", "Segunda", "Terceira"]
+    assert saved_scores() == before
+
+    db_session.query(Task).update(
+        {Task.ai_model_version: "antiga", Task.updated_at: Task.updated_at}
+    )
+    db_session.commit()
+    optimize()
+    assert scored.pop() == ["Primeira editada", "Segunda", "Terceira"]
+
+
+def test_rescore_job_streams_chunks_and_resumes(db_session, tmp_path):
+    """
+    Testa o job noturno: blocos em ordem de dono, checkpoint após cada bloco
+    e retomada de onde uma execução interrompida parou.
+    """
+    from src.models.database import Task, User
+    from src.models.schemas import TaskStatus
+    from src.services.rescoring_service import rescore_pending_tasks
+
+    owners = [User(email=f"job{i}@example.com", hashed_password="x") for i in range(3)]
+    db_session.add_all(owners)
+    db_session.commit()
+    for index in range(12):
+        db_session.add(
+            Task(
+                title=f"Tarefa {index}",
+                due_date=datetime.utcnow() + timedelta(days=index),
+                owner_id=owners[index % 3].id,
+                status=TaskStatus.done if index == 0 else TaskStatus.pending,
+            )
+        )
+    db_session.commit()
+
+    checkpoint = tmp_path / "rescore.json"
+
+    class Interrupted(Exception):
+        pass
+
+    def stop_after_first_chunk(stats):
+        raise Interrupted
+
+    with pytest.raises(Interrupted):
+        rescore_pending_tasks(
+            db_session.get_bind(),
+            chunk_size=4,
+            checkpoint_path=checkpoint,
+            on_chunk=stop_after_first_chunk,
+        )
+    assert checkpoint.is_file()
+
+    stats = rescore_pending_tasks(
+        db_session.get_bind(), chunk_size=4, checkpoint_path=checkpoint
+    )
+    assert stats.rows == 7
+    assert stats.chunks == 2
+    assert not checkpoint.exists()
+
+    db_session.expire_all()
+    tasks = db_session.query(Task).all()
+    assert all(t.ai_score is not None for t in tasks if t.status != TaskStatus.done)
+    assert all(t.ai_score is None for t in tasks if t.status == TaskStatus.done)
+    for task in tasks:
+        if task.ai_score is not None:
+            assert task.priority == ia_service.score_to_priority(task.ai_score)
+
+    assert rescore_pending_tasks(db_session.get_bind()).rescored == 0
+
+    # Uma edição entre a leitura e a gravação do job vence a gravação.
+    from sqlalchemy import select
+
+    from src.services.rescoring_service import _write_scores
+
+    engine = db_session.get_bind()
+    edited = next(t for t in tasks if t.ai_score is not None)
+    with engine.connect() as conn:
+        row = conn.execute(
+            select(Task.id, Task.priority, Task.updated_at).where(
+                Task.id == edited.id
+            )
+        ).one()
+    edited.title = "Editada durante o job"
+    db_session.commit()
+    with engine.connect() as conn:
+        _write_scores(conn, [row], [0], version="concorrente", now=datetime.utcnow())
+        conn.commit()
+    db_session.expire_all()
+    assert edited.ai_model_version != "concorrente"
+    assert edited.title == "Editada durante o job"
+
+
+def _reference_label(days, minutes, category, difficulty):
+    """Regras de rotulagem da versão original do gerador, em Python puro."""
+    if days <= 4:
+        return "Alta"
+    if category in ["Saúde", "Finanças"] and days <= 10:
+        return "Alta"
+    focus = category in ["Trabalho", "Projetos", "Estudo"]
+    if focus and difficulty >= 4 and days <= 15:
+        return "Alta"
+    if category in ["Trabalho", "Estudo", "Projetos"] and days <= 20:
+        return "Média"
+    if minutes <= 60:
+        return "Média"
+    return "Baixa"
+
+
+def test_vectorized_generator_keeps_labelling_rules(tmp_path):
+    """
+    Testa se o gerador vetorizado segue as regras originais, é reprodutível
+    pela seed e se o treino lê o arquivo gerado em blocos.
+    """
+    import numpy as np
+
+    from src.ia import dataset_generator, train_model
+
+    frame = dataset_generator.generate_task_arrays(
+        5000, np.random.default_rng(1), noise_rate=0.0
+    )
+    expected = [
+        _reference_label(
+            row.days_until_due, row.estimated_minutes, row.category, row.difficulty
+        )
+        for row in frame.itertuples()
+    ]
+    assert frame.priority_label.tolist() == expected
+
+    first = dataset_generator.generate_task_data(300, seed=9)
+    assert first.equals(dataset_generator.generate_task_data(300, seed=9))
+
+    path = tmp_path / "tasks.csv"
+    elapsed, counts = dataset_generator.write_dataset(
+        path, 2500, chunk_size=1000, seed=3
+    )
+    assert counts.sum() == 2500
+
+    encoder = train_model.build_category_encoder()
+    X, y = train_model.load_dataset([path], encoder, chunk_rows=700)
+    assert X.shape == (2500, 4) and y.shape == (2500,)
+
+    model, report = train_model.train(X, y, n_estimators=5, n_jobs=2)
+    assert model.n_jobs is None
+    assert 0.0 <= report["accuracy"] <= 1.0
+
+
+def test_model_search_respects_latency_and_size_budget():
+    """
+    Testa se a busca descarta candidatos fora do orçamento de memória e, com
+    ``require_compiled``, os que o CompiledForest não exporta.
+    """
+    from src.ia import dataset_generator, model_selection, train_model
+
+    frame = dataset_generator.generate_task_data(600, seed=5)
+    encoder = train_model.build_category_encoder()
+    frame["category_encoded"] = encoder.transform(frame["category"])
+    X = frame[train_model.FEATURE_COLUMNS]
+    y = frame["priority_label"].map(train_model.PRIORITY_MAP).to_numpy()
+    X_train, X_test, y_train, y_test = train_model.split(
+        X, y, test_size=0.25, random_state=0
+    )
+
+    small = model_selection.Candidate("decision_tree", {"max_depth": 4})
+    large = model_selection.Candidate(
+        "random_forest", {"n_estimators": 60, "max_depth": None}
+    )
+    report = model_selection.search(
+        X_train,
+        y_train,
+        X_test,
+        y_test,
+        budget=model_selection.Budget(max_size_mb=0.05),
+        candidates=[small, large],
+        workers=1,
+        batch_rows=50,
+    )
+
+    by_name = {entry["name"]: entry for entry in report["candidates"]}
+    assert by_name[large.name]["size_mb"] > 0.05
+    assert not by_name[large.name]["within_budget"]
+    assert report["selected"] == small.name
+    assert model_selection.candidate_by_name(report, small.name) == small
+
+    compiled_only = model_selection.search(
+        X_train,
+        y_train,
+        X_test,
+        y_test,
+        budget=model_selection.Budget(require_compiled=True),
+        candidates=[small, large],
+        workers=1,
+        batch_rows=50,
+    )
+    assert compiled_only["selected"] == large.name
+
+
+def test_mmap_artifact_matches_pickle_and_converts(tmp_path, monkeypatch):
+    """
+    Testa se a floresta exportada em .npy é aberta com mmap, prediz igual ao
+    pickle e se o conversor gera o mesmo formato para versões antigas.
+    """
+    import numpy as np
+
+    from src.core import config
+    from src.services.model_registry import ModelRegistry, registry
+
+    monkeypatch.setattr(config, "MODEL_MMAP", True)
+    current = registry.active
+    local = ModelRegistry(tmp_path)
+    local.publish(current.model, current.encoder, version="001", arrays=True)
+    local.publish(current.model, current.encoder, version="002")
+
+    bundle = local.reload("001")
+    assert bundle.model is None and bundle.encoder is None
+    assert isinstance(bundle.forest.threshold, np.memmap)
+    assert bundle.category_codes == current.category_codes
+
+    rng = np.random.default_rng(3)
+    features = np.column_stack(
+        [
+            rng.integers(0, 45, 2000),
+            rng.integers(1, 600, 2000),
+            rng.integers(1, 6, 2000),
+            rng.integers(0, 7, 2000),
+        ]
+    ).astype(np.float64)
+    np.testing.assert_array_equal(
+        bundle.predict(features), current.forest.predict(features)
+    )
+
+    assert local.load_bundle("002").model is not None
+    local.convert("002")
+    assert local.load_bundle("002").model is None
+
+    monkeypatch.setattr(config, "MODEL_MMAP", False)
+    assert local.load_bundle("001").model is not None
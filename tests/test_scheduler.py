@@ -0,0 +1,150 @@
+from datetime import datetime, time, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from src.models.schemas import TaskPriority, TaskPublic, TaskStatus
+from src.services.scheduler_service import WorkingHours, schedule_tasks
+
+MONDAY = datetime(2030, 1, 7, 8, 0, tzinfo=timezone.utc)
+MORNINGS = WorkingHours(start=time(9, 0), end=time(12, 0))
+
+
+def build_task(title: str, minutes: int, due: datetime | None = None, **extra):
+    """Helper auxiliar para criar tarefas com prazo relativo à segunda-feira."""
+    return TaskPublic(title=title, estimated_minutes=minutes, due_date=due, **extra)
+
+
+def test_tasks_are_packed_into_working_windows():
+    """
+    Testa o encaixe sequencial: prazo mais cedo primeiro e continuação da
+    tarefa na janela do dia seguinte.
+    """
+    later = build_task("Depois", 120, MONDAY + timedelta(days=3))
+    first = build_task("Primeiro", 150, MONDAY + timedelta(days=1))
+    loose = build_task("Sem prazo", 30)
+
+    slots = schedule_tasks(
+        [later, first, loose], start=MONDAY, working_hours=MORNINGS
+    )
+
+    assert slots[first.id].start == MONDAY.replace(hour=9)
+    assert slots[first.id].end == MONDAY.replace(hour=11, minute=30)
+    assert slots[later.id].start == MONDAY.replace(hour=11, minute=30)
+    assert slots[later.id].end == MONDAY.replace(day=8, hour=10, minute=30)
+    assert slots[loose.id].start == MONDAY.replace(day=8, hour=10, minute=30)
+    assert all(slot.deadline_met for slot in slots.values())
+
+
+def test_weekends_skipped_and_infeasible_deadlines_flagged():
+    """
+    Testa se fins de semana são pulados, se prazos estourados são marcados e
+    se tarefas fora do horizonte ficam sem horário.
+    """
+    friday = MONDAY + timedelta(days=4)
+    urgent = build_task("Urgente", 240, friday.replace(hour=12))
+    tied = build_task(
+        "Empate", 60, friday.replace(hour=12), priority=TaskPriority.high
+    )
+    huge = build_task("Enorme", 60 * 40)
+    done = build_task("Feita", 60, status=TaskStatus.done)
+
+    slots = schedule_tasks(
+        [urgent, tied, huge, done],
+        start=friday,
+        working_hours=MORNINGS,
+        horizon_days=7,
+    )
+
+    assert slots[tied.id].start == friday.replace(hour=9)
+    assert slots[tied.id].deadline_met
+    assert slots[urgent.id].start == friday.replace(hour=10)
+    assert slots[urgent.id].end == friday.replace(day=14, hour=11)
+    assert not slots[urgent.id].deadline_met
+    assert slots[huge.id].start is None and not slots[huge.id].deadline_met
+    assert done.id not in slots
+
+
+def test_working_hours_follow_their_timezone():
+    """
+    Testa se o expediente é lido no fuso configurado: 01:00 UTC de segunda
+    ainda é domingo em São Paulo, e 09:00 local são 12:00 UTC.
+    """
+    from zoneinfo import ZoneInfo
+
+    task = build_task("Relatório", 60)
+    start = MONDAY.replace(hour=1)
+
+    in_utc = schedule_tasks([task], start=start, working_hours=MORNINGS)
+    assert in_utc[task.id].start == MONDAY.replace(hour=9)
+
+    local = WorkingHours(
+        start=time(9, 0), end=time(12, 0), tz=ZoneInfo("America/Sao_Paulo")
+    )
+    slots = schedule_tasks([task], start=start, working_hours=local)
+    assert slots[task.id].start == MONDAY.replace(hour=12)
+    assert slots[task.id].start.tzinfo == timezone.utc
+
+
+def test_optimize_schedule_slots_mode(client: TestClient):
+    """
+    Testa o modo slots do endpoint /optimize-schedule.
+    """
+    client.post(
+        "/auth/register", json={"email": "slots@test.com", "password": "senhaforte123"}
+    )
+    token = client.post(
+        "/auth/login", json={"email": "slots@test.com", "password": "senhaforte123"}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    for title in ("Relatório", "Reunião"):
+        client.post(
+            "/tasks",
+            json={
+                "title": title,
+                "estimated_minutes": 90,
+                "due_date": (datetime.now(timezone.utc) + timedelta(days=10)).isoformat(),
+            },
+            headers=headers,
+        )
+
+    response = client.post(
+        "/optimize-schedule",
+        json={
+            "mode": "slots",
+            "start": MONDAY.isoformat(),
+            "working_hours": {"start": "09:00", "end": "12:00"},
+        },
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 2
+    assert data[0]["scheduled_start"].startswith("2030-01-07T09:00")
+    assert data[0]["scheduled_end"] == data[1]["scheduled_start"]
+    assert all(item["deadline_met"] is False for item in data)
+
+    local = client.post(
+        "/optimize-schedule",
+        json={
+            "mode": "slots",
+            "start": MONDAY.isoformat(),
+            "working_hours": {
+                "start": "09:00",
+                "end": "12:00",
+                "timezone": "America/Sao_Paulo",
+            },
+        },
+        headers=headers,
+    ).json()
+    assert local[0]["scheduled_start"].startswith("2030-01-07T12:00")
+
+    invalid = client.post(
+        "/optimize-schedule",
+        json={"mode": "slots", "working_hours": {"timezone": "Lua/Base"}},
+        headers=headers,
+    )
+    assert invalid.status_code == 422
+
+    rank = client.post("/optimize-schedule", headers=headers).json()
+    assert all(item["scheduled_start"] is None for item in rank)
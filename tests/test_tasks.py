@@ -92,3 +92,539 @@ def test_optimize_schedule(client: TestClient):
     res_json = optimize_resp.json()
     assert isinstance(res_json, list)
     assert len(res_json) == 2
+
+
+def test_list_tasks_keyset_pagination_and_filters(client: TestClient):
+    """
+    Testa se a listagem pagina por cursor em ordem de prazo, sem repetir nem
+    perder tarefas, e se os filtros são aplicados no servidor.
+    """
+    client.post(
+        "/auth/register", json={"email": "page@test.com", "password": "senhaforte123"}
+    )
+    token = client.post(
+        "/auth/login", json={"email": "page@test.com", "password": "senhaforte123"}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    now = datetime.now(timezone.utc)
+    for index in range(7):
+        client.post(
+            "/tasks",
+            json=build_payload(
+                title=f"Tarefa {index}",
+                due_date=(now + timedelta(days=index % 3 + 1)).isoformat(),
+                status="done" if index % 2 else "pending",
+            ),
+            headers=headers,
+        )
+    for index in range(2):
+        client.post(
+            "/tasks",
+            json=build_payload(title=f"Sem prazo {index}", due_date=None),
+            headers=headers,
+        )
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        resp = client.get("/tasks", params=params, headers=headers)
+        assert resp.status_code == 200
+        assert len(resp.json()) <= 2
+        seen.extend(resp.json())
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert len({task["id"] for task in seen}) == len(seen) == 9
+    due_dates = [task["due_date"] for task in seen]
+    assert due_dates[-2:] == [None, None]
+    assert due_dates[:-2] == sorted(due_dates[:-2])
+
+    pending = client.get("/tasks", params={"status": "pending"}, headers=headers)
+    assert {task["status"] for task in pending.json()} == {"pending"}
+    assert len(pending.json()) == 6
+
+    window = client.get(
+        "/tasks",
+        params={"due_to": (now + timedelta(days=1, hours=1)).isoformat()},
+        headers=headers,
+    )
+    assert len(window.json()) == 3
+
+    invalid = client.get("/tasks", params={"cursor": "???"}, headers=headers)
+    assert invalid.status_code == 400
+
+
+def test_bulk_create_reports_invalid_items(client: TestClient):
+    """
+    Testa se a criação em lote insere os itens válidos e devolve os erros
+    de cada item inválido pela posição.
+    """
+    client.post(
+        "/auth/register", json={"email": "bulk@test.com", "password": "senhaforte123"}
+    )
+    token = client.post(
+        "/auth/login", json={"email": "bulk@test.com", "password": "senhaforte123"}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    items = [build_payload(title=f"Lote {index}") for index in range(5)]
+    items[1]["difficulty"] = 9
+    items[3] = "não é uma tarefa"
+
+    resp = client.post("/tasks/bulk", json={"tasks": items}, headers=headers)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [task["title"] for task in body["created"]] == ["Lote 0", "Lote 2", "Lote 4"]
+    assert [error["index"] for error in body["errors"]] == [1, 3]
+    assert body["errors"][0]["errors"][0]["loc"] == ["difficulty"]
+
+    listed = client.get("/tasks", headers=headers).json()
+    assert {task["id"] for task in listed} == {task["id"] for task in body["created"]}
+
+    too_many = {"tasks": [build_payload()] * 1001}
+    assert client.post("/tasks/bulk", json=too_many, headers=headers).status_code == 422
+
+
+def _login(client: TestClient, email: str) -> Dict[str, str]:
+    client.post("/auth/register", json={"email": email, "password": "senhaforte123"})
+    token = client.post(
+        "/auth/login", json={"email": email, "password": "senhaforte123"}
+    ).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_bulk_update_and_delete_are_owner_scoped(client: TestClient):
+    """
+    Testa PATCH/DELETE em lote por ids e por filtro, e se nenhum deles (nem o
+    DELETE individual) alcança tarefas de outro usuário.
+    """
+    headers = _login(client, "dono@test.com")
+    other = _login(client, "outro@test.com")
+
+    created = client.post(
+        "/tasks/bulk",
+        json={"tasks": [build_payload(title=f"Minha {i}") for i in range(4)]},
+        headers=headers,
+    ).json()["created"]
+    foreign = client.post(
+        "/tasks", json=build_payload(title="Alheia"), headers=other
+    ).json()
+    ids = [task["id"] for task in created]
+
+    resp = client.patch(
+        "/tasks",
+        json={"ids": ids[:2] + [foreign["id"]], "changes": {"status": "done"}},
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    assert sorted(task["id"] for task in resp.json()) == sorted(ids[:2])
+    assert {task["status"] for task in resp.json()} == {"done"}
+
+    resp = client.request(
+        "DELETE", "/tasks", json={"filter": {"status": ["done"]}}, headers=headers
+    )
+    assert resp.json()["deleted"] == 2
+    assert sorted(resp.json()["ids"]) == sorted(ids[:2])
+
+    assert client.delete(f"/tasks/{foreign['id']}", headers=headers).status_code == 404
+    assert client.delete(f"/tasks/{ids[2]}", headers=headers).status_code == 204
+
+    remaining = client.get("/tasks", headers=headers).json()
+    assert [task["id"] for task in remaining] == [ids[3]]
+    assert len(client.get("/tasks", headers=other).json()) == 1
+
+    assert client.request("DELETE", "/tasks", json={}, headers=headers).status_code == 422
+    assert (
+        client.patch(
+            "/tasks", json={"ids": ids, "changes": {"title": None}}, headers=headers
+        ).status_code
+        == 422
+    )
+
+
+def test_bulk_update_closes_overdue_tasks(client: TestClient, db_session):
+    """
+    Testa se o PATCH em lote aceita tarefas já atrasadas: o validador de
+    due_date é da entrada do usuário, não das linhas devolvidas pelo banco.
+    """
+    from src.models.database import Task
+
+    headers = _login(client, "atrasada@test.com")
+    created = client.post("/tasks", json=build_payload(), headers=headers).json()
+    db_session.query(Task).filter(Task.id == created["id"]).update(
+        {"due_date": datetime.utcnow() - timedelta(days=5)}
+    )
+    db_session.commit()
+
+    resp = client.patch(
+        "/tasks",
+        json={"ids": [created["id"]], "changes": {"status": "done"}},
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    (updated,) = resp.json()
+    assert updated["status"] == "done"
+    assert updated["due_date"].endswith("Z")
+
+    (listed,) = client.get("/tasks", headers=headers).json()
+    assert listed["status"] == "done"
+
+
+def test_export_streams_ndjson_and_csv(client: TestClient):
+    """Testa se a exportação devolve todas as tarefas do usuário nos dois formatos."""
+    import csv
+    import io
+    import json
+
+    headers = _login(client, "export@test.com")
+    other = _login(client, "alheio@test.com")
+    client.post(
+        "/tasks/bulk",
+        json={"tasks": [build_payload(title=f"Exportar {i}") for i in range(5)]},
+        headers=headers,
+    )
+    client.post("/tasks", json=build_payload(title="Não exportar"), headers=other)
+
+    resp = client.get("/tasks/export", headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert sorted(row["title"] for row in lines) == [f"Exportar {i}" for i in range(5)]
+    assert lines[0]["category"] == "Trabalho"
+    listed = {task["id"]: task for task in client.get("/tasks", headers=headers).json()}
+    for row in lines:
+        assert row["due_date"].endswith("Z")
+        assert row["due_date"] == listed[row["id"]]["due_date"]
+
+    resp = client.get("/tasks/export", params={"format": "csv"}, headers=headers)
+    assert resp.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert len(rows) == 5
+    assert {row["status"] for row in rows} == {"pending"}
+    assert all(row["due_date"].endswith("Z") for row in rows)
+
+
+def test_import_ndjson_and_csv_report_line_errors(client: TestClient):
+    """
+    Testa se a importação lê NDJSON e CSV em fluxo, insere os registros
+    válidos em blocos e aponta a linha de cada registro inválido.
+    """
+    import json
+
+    from src.services import import_service
+
+    headers = _login(client, "import@test.com")
+
+    lines = [json.dumps(build_payload(title=f"Importada {i}")) for i in range(5)]
+    lines.insert(2, "{quebrado")
+    lines.insert(4, "")
+    lines.append(json.dumps(build_payload(title="Ok", difficulty=0)))
+    body = "\n".join(lines).encode()
+
+    def chunked():
+        for start in range(0, len(body), 7):
+            yield body[start : start + 7]
+
+    resp = client.post(
+        "/tasks/import",
+        content=chunked(),
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert resp.status_code == 200
+    summary = resp.json()
+    assert (summary["records"], summary["created"], summary["failed"]) == (7, 5, 2)
+    assert [error["line"] for error in summary["errors"]] == [3, 8]
+
+    csv_body = (
+        "title,description,category,difficulty\n"
+        'Ler livro,"linha 1\nlinha 2",Estudo,2\n'
+        "Sem dificuldade,,Casa,\n"
+        "Curta demais é,ok,Casa,9\n"
+        "X,faltou coluna\n"
+    )
+    resp = client.post(
+        "/tasks/import",
+        content=csv_body.encode(),
+        headers={**headers, "Content-Type": "text/csv"},
+    )
+    summary = resp.json()
+    assert (summary["records"], summary["created"], summary["failed"]) == (4, 2, 2)
+    assert [error["line"] for error in summary["errors"]] == [5, 6]
+
+    titles = {task["title"]: task for task in client.get("/tasks", headers=headers).json()}
+    assert titles["Ler livro"]["description"] == "linha 1\nlinha 2"
+    assert titles["Sem dificuldade"]["difficulty"] == 3
+    assert len(titles) == 7
+
+
+def test_import_rejects_overlong_lines_without_buffering_them(client: TestClient):
+    """
+    Testa se uma linha acima de MAX_LINE_CHARS vira erro da própria linha,
+    sem derrubar a importação nem deslocar a numeração das seguintes.
+    """
+    import json
+
+    from src.services import import_service
+
+    headers = _login(client, "import-long@test.com")
+    huge = "x" * (import_service.MAX_LINE_CHARS * 3)
+    body = "\n".join(
+        [
+            json.dumps(build_payload(title="Antes")),
+            json.dumps(build_payload(title="Longa", description=huge)),
+            json.dumps(build_payload(title="Depois")),
+            huge,
+        ]
+    ).encode()
+
+    def chunked():
+        for start in range(0, len(body), 1000):
+            yield body[start : start + 1000]
+
+    summary = client.post(
+        "/tasks/import",
+        content=chunked(),
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    ).json()
+    assert (summary["records"], summary["created"], summary["failed"]) == (4, 2, 2)
+    assert [error["line"] for error in summary["errors"]] == [2, 4]
+    assert summary["errors"][0]["errors"][0]["type"] == "line_too_long"
+
+    csv_body = f'title,description\n"Longa","{huge}"\nDepois CSV,ok\n'
+    summary = client.post(
+        "/tasks/import",
+        content=csv_body.encode(),
+        headers={**headers, "Content-Type": "text/csv"},
+    ).json()
+    assert (summary["created"], summary["failed"]) == (1, 1)
+    assert summary["errors"][0]["line"] == 2
+
+
+def test_conditional_get_returns_304_until_tasks_change(client: TestClient):
+    """
+    Testa se GET /tasks e /optimize-schedule devolvem 304 para um ETag
+    ainda válido e um novo ETag depois de qualquer alteração.
+    """
+    headers = _login(client, "etag@test.com")
+    created = client.post("/tasks", json=build_payload(), headers=headers).json()
+
+    first = client.get("/tasks", headers=headers)
+    etag = first.headers["ETag"]
+    again = client.get("/tasks", headers={**headers, "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+
+    other_page = client.get(
+        "/tasks", params={"limit": 1}, headers={**headers, "If-None-Match": etag}
+    )
+    assert other_page.status_code == 200
+
+    client.patch(
+        "/tasks",
+        json={"ids": [created["id"]], "changes": {"difficulty": 5}},
+        headers=headers,
+    )
+    changed = client.get("/tasks", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+    optimized = client.post("/optimize-schedule", headers=headers)
+    assert optimized.status_code == 200
+    optimize_etag = optimized.headers["ETag"]
+    cached = client.post(
+        "/optimize-schedule", headers={**headers, "If-None-Match": optimize_etag}
+    )
+    assert cached.status_code == 304
+
+    client.post("/tasks", json=build_payload(title="Outra"), headers=headers)
+    fresh = client.post(
+        "/optimize-schedule", headers={**headers, "If-None-Match": optimize_etag}
+    )
+    assert fresh.status_code == 200
+    assert len(fresh.json()) == 2
+
+
+class _FakeRedis:
+    """
+    Substituto local de um cliente Redis: get e set com ex. Registra se cada
+    chamada bloqueante foi feita de dentro do loop de eventos.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.calls_on_loop = []
+
+    def _record(self):
+        import asyncio
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self.calls_on_loop.append(False)
+        else:
+            self.calls_on_loop.append(True)
+
+    def get(self, key):
+        self._record()
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self._record()
+        self.data[key] = value
+
+
+@pytest.mark.parametrize("backend", ["memory", "redis"])
+def test_task_list_cache_hits_until_the_etag_changes(
+    client: TestClient, db_session, monkeypatch, backend
+):
+    """
+    Testa se as listagens são servidas do cache até a próxima mudança do
+    ETag do dono, inclusive por escritas feitas fora da API e pela gravação
+    de prioridades do /optimize-schedule.
+    """
+    from src.models.database import Task
+    from src.services import task_cache
+
+    redis = _FakeRedis()
+    if backend == "redis":
+        store = task_cache.RedisBackend(redis)
+    else:
+        store = task_cache.MemoryBackend(max_entries=8, ttl_seconds=60)
+    monkeypatch.setattr(task_cache.cache, "backend", store)
+    before = task_cache.cache.metrics()
+
+    def delta(name):
+        return task_cache.cache.metrics()[name] - before[name]
+
+    headers = _login(client, f"cache-{backend}@test.com")
+    created = client.post(
+        "/tasks", json=build_payload(title="Primeira"), headers=headers
+    ).json()
+
+    assert len(client.get("/tasks", headers=headers).json()) == 1
+    assert len(client.get("/tasks", headers=headers).json()) == 1
+    assert (delta("misses"), delta("hits")) == (1, 1)
+
+    client.post("/tasks", json=build_payload(title="Segunda"), headers=headers)
+    assert len(client.get("/tasks", headers=headers).json()) == 2
+
+    client.patch(
+        "/tasks",
+        json={"ids": [created["id"]], "changes": {"title": "Renomeada"}},
+        headers=headers,
+    )
+    titles = {task["title"] for task in client.get("/tasks", headers=headers).json()}
+    assert titles == {"Renomeada", "Segunda"}
+
+    optimized = {
+        task["id"]: task["priority"]
+        for task in client.post("/optimize-schedule", headers=headers).json()
+    }
+    listed = {
+        task["id"]: task["priority"]
+        for task in client.get("/tasks", headers=headers).json()
+    }
+    assert listed == optimized
+
+    db_session.query(Task).filter(Task.id == created["id"]).update(
+        {"title": "Fora da API"}
+    )
+    db_session.commit()
+    resp = client.get("/tasks", headers=headers)
+    assert {task["title"] for task in resp.json()} == {"Fora da API", "Segunda"}
+
+    client.delete(f"/tasks/{created['id']}", headers=headers)
+    assert len(client.get("/tasks", headers=headers).json()) == 1
+    assert delta("hits") == 1
+    if backend == "redis":
+        assert redis.calls_on_loop and not any(redis.calls_on_loop)
+
+
+def test_memory_cache_evicts_lru_and_expires():
+    """Testa a expulsão por LRU e a expiração por TTL do backend em memória."""
+    import time
+
+    from src.services.task_cache import MemoryBackend, TaskListCache
+
+    cache = TaskListCache(MemoryBackend(max_entries=2, ttl_seconds=0.05))
+    keys = [cache.key("dono", "etag", page=index) for index in range(3)]
+    cache.set(keys[0], "a")
+    cache.set(keys[1], "b")
+    assert cache.get(keys[0]) == "a"
+    cache.set(keys[2], "c")
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == "a"
+
+    time.sleep(0.06)
+    assert cache.get(keys[0]) is None
+
+    cache.set(keys[2], "c")
+    assert cache.get(cache.key("dono", "outro-etag", page=2)) is None
+    assert cache.key("dono", None, page=2) is None
+    assert cache.metrics()["hits"] == 2
+
+
+def test_list_lean_path_matches_schema_and_allows_overdue(client, db_session):
+    """
+    Testa se a listagem sem validação devolve os mesmos campos de
+    TaskPublic e não quebra com tarefas atrasadas já salvas no banco.
+    """
+    from src.models.database import Task
+
+    headers = _login(client, "lean@test.com")
+    created = client.post("/tasks", json=build_payload(), headers=headers).json()
+
+    db_session.query(Task).filter(Task.id == created["id"]).update(
+        {"due_date": datetime.utcnow() - timedelta(days=10)}
+    )
+    db_session.commit()
+
+    resp = client.get("/tasks", headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    (listed,) = resp.json()
+    assert listed.keys() == created.keys()
+    assert {key: listed[key] for key in ("id", "owner_id", "category", "priority")} == {
+        key: created[key] for key in ("id", "owner_id", "category", "priority")
+    }
+    assert listed["due_date"].endswith("Z") and created["due_date"].endswith("Z")
+
+    optimized = client.post("/optimize-schedule", headers=headers)
+    assert optimized.status_code == 200
+
+
+def test_async_routes_serve_concurrent_requests_without_threadpool(client: TestClient):
+    """
+    Testa se as rotas async atendem várias requisições simultâneas no mesmo
+    loop com o threadpool inteiro ocupado: nenhuma delas precisa de thread.
+    """
+    import anyio
+    import httpx
+
+    headers = _login(client, "async@test.com")
+    client.post("/tasks", json=build_payload(), headers=headers)
+
+    async def burst():
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        limiter.total_tokens = 1
+        async with limiter:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as async_client:
+                responses = []
+
+                async def fetch(path: str) -> None:
+                    responses.append(await async_client.get(path, headers=headers))
+
+                with anyio.fail_after(10):
+                    async with anyio.create_task_group() as group:
+                        for index in range(20):
+                            group.start_soon(fetch, f"/tasks?limit={index + 1}")
+        return responses
+
+    responses = anyio.run(burst)
+    assert [response.status_code for response in responses] == [200] * 20
+    assert all(len(response.json()) == 1 for response in responses)